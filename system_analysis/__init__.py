@@ -0,0 +1,39 @@
+"""
+Системный анализ: задачи task1–task4 как один пакет.
+
+Задачи — подпакеты system_analysis.task1–task4 с относительными импортами.
+Пакет не импортирует ничего тяжелее стандартной библиотеки: модули задач
+загружаются только при обращении к ним (load или подкоманда CLI), а
+matplotlib и pandas — только при построении графиков.
+
+    python -m system_analysis task3 --no-plot
+    python -m system_analysis task3 inventory_dp --horizon 52
+    python -m system_analysis importtime
+    system-analysis task4 --no-plot        # после pip install -e .
+"""
+import importlib
+from pathlib import Path
+
+PACKAGE = Path(__file__).resolve().parent
+ROOT = PACKAGE.parent
+
+# Задача -> (папка подпакета, описание)
+TASKS = {
+    'task1': (PACKAGE / 'task1', "Минимизация стоимости добавок в топливо (ЛП)"),
+    'task2': (PACKAGE / 'task2', "Транспортная задача"),
+    'task3': (PACKAGE / 'task3', "Решение о закупке в условиях риска (EMV)"),
+    'task4': (PACKAGE / 'task4', "Решение о проведении исследования рынка (EVSI)"),
+}
+
+def task_directory(task):
+    if task not in TASKS:
+        raise ValueError(f"Неизвестная задача: {task} (доступны: {', '.join(TASKS)})")
+    return TASKS[task][0]
+
+def load(task, module='main'):
+    """
+    Импортирует модуль задачи, например load('task3', 'inventory_dp') —
+    то же, что from system_analysis.task3 import inventory_dp.
+    """
+    task_directory(task)
+    return importlib.import_module(f"{__name__}.{task}.{module}")
@@ -0,0 +1,51 @@
+import argparse
+import runpy
+import sys
+
+from . import TASKS, task_directory
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(
+        prog="python -m system_analysis",
+        description="Системный анализ: запуск задач task1–task4",
+        epilog="Остальные аргументы передаются модулю задачи, например: "
+               "python -m system_analysis task3 inventory_dp --horizon 52",
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    for task, (directory, description) in TASKS.items():
+        modules = sorted(p.stem for p in directory.glob('*.py') if not p.stem.startswith(('_', 'test_')))
+        sub = commands.add_parser(task, help=description, add_help=False)
+        sub.add_argument('module', nargs='?', default='main', help=f"модуль задачи: {', '.join(modules)}")
+    commands.add_parser('benchmark', help="бенчмарки фаз всех задач (--help — параметры)", add_help=False)
+    commands.add_parser('serve', help="локальный сервис решателей по HTTP (--help — параметры)", add_help=False)
+    importtime = commands.add_parser('importtime', help="время запуска вычислительных команд (-X importtime)")
+    importtime.add_argument('--limit', type=float, default=200.0, help="допустимое время запуска, мс")
+    importtime.add_argument('--top', type=int, default=8, help="сколько самых дорогих импортов показать")
+
+    # Аргументы модуля задачи (в т.ч. --help) не разбираются здесь
+    if argv and argv[0] in TASKS:
+        task, rest = argv[0], argv[1:]
+        module = rest.pop(0) if rest and not rest[0].startswith('-') else 'main'
+        return run_task(task, module, rest)
+    if argv and argv[0] == 'benchmark':
+        from .benchmark import main as benchmark
+        return benchmark(argv[1:])
+    if argv and argv[0] == 'serve':
+        from .service import main as serve
+        return serve(argv[1:])
+    args = parser.parse_args(argv)
+    from .importtime import run
+    return run(limit=args.limit, top=args.top)
+
+def run_task(task, module, args):
+    """Запускает модуль задачи как скрипт (__name__ == "__main__") с аргументами args."""
+    path = task_directory(task) / f"{module}.py"
+    if not path.exists():
+        raise SystemExit(f"В {task} нет модуля {module}")
+    sys.argv = [str(path), *args]
+    runpy.run_module(f"{__package__}.{task}.{module}", run_name='__main__', alter_sys=True)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+"""
+Бенчмарки всех задач: детерминированные генераторы экземпляров, замер
+каждой фазы отдельно при нескольких размерах задачи, пиковая память
+(tracemalloc и RSS процесса), показатели степени роста времени
+(time ~ size^k) и сравнение с сохраненной базой.
+
+База (benchmark_baseline.json) хранит только то, что не зависит от
+машины: пиковую память фаз и показатели степени роста времени. По базе
+проверяется память; рост показателя степени — предупреждение (--strict —
+ошибка). Время сравнивается только с отчетом, снятым на той же машине
+(--out, затем --times).
+
+    python -m system_analysis benchmark --quick --baseline
+    python -m system_analysis benchmark --out local.json
+    python -m system_analysis benchmark --times local.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from . import load
+
+BASELINE = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# Короткие замеры сильно шумят: регрессия по времени ищется (и показатель степени
+# подбирается для базы) только по замерам дольше MIN_TIME секунд
+MIN_TIME = 0.01
+
+# Допустимый рост показателя степени относительно базы: смена сложности (n -> n^2)
+# дает рост на 1. Показатель по 2-3 размерам шумит (на общей виртуальной машине —
+# до 0.7), поэтому по умолчанию его рост только печатается (--strict — ошибка)
+EXPONENT_TOLERANCE = 0.5
+
+def task1_phases(num_constraints):
+    """task1: двумерная ЛП с num_constraints ограничениями."""
+    lp2d = load('task1', 'lp2d')
+    c, A, b = lp2d.random_problem(num_constraints, np.random.default_rng(num_constraints), feasible_point=(50.0, 50.0))
+    return {
+        'halfplanes': lambda: lp2d.halfplane_intersection(A, b),
+        'vertices': lambda: lp2d.solve_vertices(c, A, b),
+        'seidel': lambda: lp2d.solve_seidel(c, A, b, seed=0),
+    }
+
+def task2_phases(size):
+    """task2: транспортная задача size x size (предложение больше спроса — с фиктивным потребителем)."""
+    main = load('task2', 'main')
+    rng = np.random.default_rng(size)
+    costs = rng.integers(1, 100, size=(size, size)).astype(float)
+    supply = rng.integers(20, 60, size=size).astype(float)
+    demand = rng.integers(10, 50, size=size).astype(float)
+    supply, demand, _ = main.balance_problem(supply, demand)
+    m, n = len(supply), len(demand)
+    return {
+        'model': lambda: (main.build_cost_vector(costs, m, n), main.build_constraint_matrix(m, n)),
+        'highs': lambda: main.solve_balanced(costs, supply, demand, solver='highs', dense=False),
+        'potentials': lambda: main.solve_balanced(costs, supply, demand, solver='potentials', dense=False),
+    }
+
+def task3_phases(levels):
+    """task3: сетка levels действий x levels уровней спроса."""
+    engine = load('task3', 'decision_engine')
+    grid = np.arange(levels)
+    probabilities = np.random.default_rng(levels).dirichlet(np.ones(levels))
+    return {
+        'payoff': lambda: engine.payoff_matrix(grid, grid, 35.0, 56.0),
+        'criteria': lambda: engine.evaluate_criteria(grid, grid, probabilities, 35.0, 56.0),
+    }
+
+def task4_phases(levels):
+    """task4: байесовский анализ и дерево решений на сетке levels x levels."""
+    preposterior = load('task4', 'preposterior')
+    decision_tree = load('task4', 'decision_tree')
+    grid = np.arange(levels)
+    prior = np.random.default_rng(levels).dirichlet(np.ones(levels))
+    payoff = decision_tree.payoff_matrix(grid, grid, 35.0, 56.0)
+    likelihood = preposterior.noisy_study(0.8, levels)
+
+    def tree():
+        builder = decision_tree.DecisionTree()
+        root = builder.decision("Исследование", [
+            ("не проводить", builder.stock_decision(grid, grid, prior, 35.0, 56.0)),
+            ("проводить", builder.stock_decision(grid, grid, likelihood[0] * prior / (likelihood[0] @ prior),
+                                                 35.0, 56.0), 15.0),
+        ])
+        return decision_tree.rollback(root)
+
+    return {
+        'preposterior': lambda: preposterior.preposterior_analysis(payoff, prior, likelihood),
+        'tree': tree,
+    }
+
+# Задача -> (генератор фаз, размеры, размеры быстрого прогона, что такое размер)
+SUITE = {
+    'task1': (task1_phases, [1_000, 10_000, 100_000, 300_000], [1_000, 10_000, 100_000], "ограничений"),
+    'task2': (task2_phases, [50, 100, 200, 400], [50, 100, 200], "m = n"),
+    'task3': (task3_phases, [500, 1_000, 2_000, 4_000], [500, 1_000, 2_000], "действий = уровней спроса"),
+    'task4': (task4_phases, [50, 100, 200, 400], [50, 100, 200], "действий = уровней спроса"),
+}
+
+# Размер для подбора показателя степени: task2 — число клеток m x n
+SCALE = {'task2': lambda size: size * size}
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def measure(phase, repeat=3):
+    """
+    Лучшее из repeat время фазы (после прогревочного вызова) и пиковая
+    память по tracemalloc (отдельным вызовом: трассировка замедляет код).
+    """
+    phase()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        phase()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        phase()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def scaling_exponents(results, min_time=0.0):
+    """
+    Показатель k в time ~ size^k для каждой фазы (наклон в логарифмическом
+    масштабе, МНК) по замерам не короче min_time секунд.
+    """
+    series = {}
+    for r in results:
+        if r['time'] < min_time:
+            continue
+        size = SCALE.get(r['task'], lambda s: s)(r['size'])
+        series.setdefault(f"{r['task']}/{r['phase']}", []).append((size, r['time']))
+    exponents = {}
+    for name, points in series.items():
+        if len(points) >= 2:
+            sizes, times = np.log(np.array(points)).T
+            exponents[name] = round(float(np.polyfit(sizes, times, 1)[0]), 2)
+    return exponents
+
+def run_suite(tasks=None, quick=False, repeat=3):
+    """Прогоняет фазы выбранных задач по всем размерам; печатает таблицу и возвращает отчет (словарь для JSON)."""
+    results = []
+    for task in tasks or SUITE:
+        make_phases, sizes, quick_sizes, meaning = SUITE[task]
+        print(f"--- {task} (размер — {meaning}) ---")
+        for size in quick_sizes if quick else sizes:
+            for phase, run in make_phases(size).items():
+                seconds, peak = measure(run, repeat)
+                results.append({'task': task, 'phase': phase, 'size': size, 'time': seconds,
+                                'peak_bytes': peak, 'rss_mb': _peak_rss_mb()})
+                print(f"   {size:>9,} {phase:<13} {seconds * 1000:10.2f} мс   пик {peak / 2**20:8.2f} МБ")
+    exponents = scaling_exponents(results)
+    print("\nПоказатели степени роста времени (time ~ size^k):")
+    for name, k in exponents.items():
+        print(f"   {name:<22} k = {k:.2f}")
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'quick': quick,
+        'results': results,
+        'exponents': exponents,
+    }
+
+def _mode(report):
+    return 'quick' if report['quick'] else 'full'
+
+def baseline_of(report, baseline=None):
+    """
+    Машинно-независимая часть отчета для базы: пиковая память по фазам и
+    размерам и показатели степени (отдельно для полного и быстрого прогона,
+    наборы размеров у них разные). Дополняет baseline, не стирая записи
+    других задач и другого режима.
+    """
+    baseline = baseline or {'peak_bytes': {}, 'exponents': {}}
+    baseline.update(python=report['python'], numpy=report['numpy'])
+    baseline['peak_bytes'].update({f"{r['task']}/{r['phase']}@{r['size']}": r['peak_bytes'] for r in report['results']})
+    baseline['exponents'].setdefault(_mode(report), {}).update(scaling_exponents(report['results'], MIN_TIME))
+    return baseline
+
+def compare(report, baseline, threshold=0.3):
+    """
+    Регрессии памяти против базы: фазы, требующие больше памяти более чем
+    в 1 + threshold раза. Сравниваются только пары (задача, фаза, размер),
+    которые есть в обоих.
+    """
+    regressions = []
+    for r in report['results']:
+        name = f"{r['task']}/{r['phase']}@{r['size']}"
+        base = baseline['peak_bytes'].get(name)
+        if base is not None and r['peak_bytes'] > base * (1 + threshold) + 2**16:
+            regressions.append(f"{name}: память {base / 2**20:.2f} → {r['peak_bytes'] / 2**20:.2f} МБ")
+    return regressions
+
+def exponent_changes(report, baseline, tolerance=EXPONENT_TOLERANCE):
+    """Фазы, у которых показатель степени роста времени вырос против базы больше чем на tolerance."""
+    reference = baseline['exponents'].get(_mode(report), {})
+    return [f"{name}: показатель степени {reference[name]:.2f} → {k:.2f}"
+            for name, k in scaling_exponents(report['results'], MIN_TIME).items()
+            if name in reference and k > reference[name] + tolerance]
+
+def compare_times(report, previous, threshold=0.3, min_time=MIN_TIME):
+    """
+    Регрессии по времени против отчета previous (--out), снятого на этой же
+    машине: фазы дольше min_time, ставшие медленнее более чем в 1 + threshold
+    раза. Сравниваются только пары (задача, фаза, размер), которые есть в обоих.
+    """
+    reference = {(r['task'], r['phase'], r['size']): r for r in previous['results']}
+    regressions = []
+    for r in report['results']:
+        base = reference.get((r['task'], r['phase'], r['size']))
+        if base is not None and r['time'] > min_time and r['time'] > base['time'] * (1 + threshold):
+            regressions.append(f"{r['task']}/{r['phase']}@{r['size']}: время {base['time'] * 1000:.2f} → "
+                               f"{r['time'] * 1000:.2f} мс")
+    return regressions
+
+def _report_regressions(regressions, threshold, source):
+    if regressions:
+        print(f"\n❌ Регрессии больше {threshold:.0%} относительно '{source}':")
+        print("\n".join(f"   {line}" for line in regressions))
+        return 1
+    print(f"\n✅ Регрессий больше {threshold:.0%} относительно '{source}' нет")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m system_analysis benchmark",
+                                     description="Бенчмарки фаз всех задач при разных размерах")
+    parser.add_argument('--tasks', nargs='+', choices=SUITE, help="задачи (по умолчанию все)")
+    parser.add_argument('--quick', action='store_true', help="только меньшие размеры")
+    parser.add_argument('--repeat', type=int, default=3, help="повторов замера (берется лучший)")
+    parser.add_argument('--out', help="записать отчет в JSON")
+    parser.add_argument('--baseline', nargs='?', const=str(BASELINE),
+                        help=f"сравнить память и показатели степени с базой (без пути — {BASELINE.name})")
+    parser.add_argument('--strict', action='store_true',
+                        help="считать ошибкой и рост показателя степени (по умолчанию — предупреждение)")
+    parser.add_argument('--times', metavar='REPORT',
+                        help="сравнить время с отчетом --out, снятым на этой же машине")
+    parser.add_argument('--threshold', type=float, default=0.3, help="допустимый рост памяти (и времени), доля")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"дописать память и показатели степени прогона в базу {BASELINE.name}")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.tasks, args.quick, args.repeat)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=1, ensure_ascii=False), encoding='utf-8')
+        print(f"\n💾 Отчет сохранен в '{args.out}'")
+    if args.save_baseline:
+        baseline = json.loads(BASELINE.read_text(encoding='utf-8')) if BASELINE.exists() else None
+        BASELINE.write_text(json.dumps(baseline_of(report, baseline), indent=1, ensure_ascii=False), encoding='utf-8')
+        print(f"\n💾 База обновлена: '{BASELINE}'")
+    status = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions, changes = compare(report, baseline, args.threshold), exponent_changes(report, baseline)
+        if changes and not args.strict:
+            print(f"\n⚠️  Показатель степени вырос больше чем на {EXPONENT_TOLERANCE} (возможен шум замеров):")
+            print("\n".join(f"   {line}" for line in changes))
+        status |= _report_regressions(regressions + changes * args.strict, args.threshold, args.baseline)
+    if args.times:
+        previous = json.loads(Path(args.times).read_text(encoding='utf-8'))
+        status |= _report_regressions(compare_times(report, previous, args.threshold), args.threshold, args.times)
+    return status
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""
+Кэш результатов решенных задач с адресацией по содержимому.
+
+Ключ — SHA-256 от нормализованных входных данных: массивы хешируются по
+сырым байтам (с формой), параметры — по каноническому представлению,
+вместе с версией решателя; числовые массивы перед хешированием приводятся
+к float64, поэтому [20, 30] и [20.0, 30.0] дают один ключ. Результат (словарь из массивов, чисел, строк,
+None и кортежей массивов) хранится в двух уровнях: LRU в памяти и сжатые
+.npz-файлы на диске с ограничением общего размера.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+def _feed(digest, value):
+    """Добавляет в хеш каноническое представление значения."""
+    if isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key=str):
+            _feed(digest, str(key))
+            _feed(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        try:
+            array = np.asarray(value)
+        except ValueError:
+            # Списки разной длины — поэлементно
+            array = np.empty(0, dtype=object)
+        if array.dtype.kind in 'biuf':
+            array = np.ascontiguousarray(array, dtype=np.float64)
+            digest.update(f"a{array.shape}".encode())
+            digest.update(array.tobytes())
+        else:
+            digest.update(f"l{len(value)}[".encode())
+            for item in value:
+                _feed(digest, item)
+            digest.update(b']')
+    elif isinstance(value, (bool, np.bool_)):
+        digest.update(f"b{bool(value)}".encode())
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        digest.update(f"n{float(value)!r}".encode())
+    else:
+        digest.update(f"s{value!r}".encode())
+    digest.update(b';')
+
+def stable_hash(*parts):
+    """SHA-256 (hex) нормализованных входных данных; не зависит от процесса и порядка ключей словарей."""
+    digest = hashlib.sha256()
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+def _encode(result):
+    """Словарь результата -> массивы для np.savez и JSON-описание их видов."""
+    arrays, kinds = {}, {}
+    for key, value in result.items():
+        if value is None:
+            kinds[key] = 'none'
+        elif isinstance(value, tuple):
+            kinds[key] = ['tuple', len(value)]
+            for i, item in enumerate(value):
+                arrays[f"{key}.{i}"] = np.asarray(item)
+        else:
+            kinds[key] = 'array' if isinstance(value, np.ndarray) else 'scalar'
+            arrays[key] = np.asarray(value)
+    return arrays, kinds
+
+def _decode(arrays, kinds):
+    result = {}
+    for key, kind in kinds.items():
+        if kind == 'none':
+            result[key] = None
+        elif kind == 'scalar':
+            result[key] = arrays[key].item()
+        elif kind == 'array':
+            result[key] = arrays[key]
+        else:
+            result[key] = tuple(arrays[f"{key}.{i}"] for i in range(kind[1]))
+    return result
+
+class ResultCache:
+    """
+    Двухуровневый кэш результатов: LRU на memory_items записей в памяти
+    перед каталогом directory с файлами <ключ>.npz. Если общий размер
+    файлов превышает max_bytes, удаляются давно не использованные
+    (по времени изменения, которое обновляется при каждом попадании).
+    directory=None — только память.
+
+    Счетчики: hits (из памяти), disk_hits (с диска), misses.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 2**20, memory_items=128):
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.npz"
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """Результат по ключу или None (промах)."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    arrays = {name: data[name] for name in data.files}
+                result = _decode(arrays, json.loads(arrays.pop('__kinds__').item()))
+                os.utime(path)
+            except (OSError, ValueError, KeyError):
+                # Нет файла или он поврежден (например, прерванная запись другим процессом)
+                result = None
+            if result is not None:
+                self.disk_hits += 1
+                self._remember(key, result)
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        self._remember(key, result)
+        if self.directory is None:
+            return
+        arrays, kinds = _encode(result)
+        arrays['__kinds__'] = np.array(json.dumps(kinds))
+        # Запись во временный файл и атомарная замена: параллельные читатели не видят неполных файлов
+        import tempfile
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as file:
+            np.savez_compressed(file, **arrays)
+        os.replace(temporary, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob('*.npz'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def get_or_compute(self, key, compute):
+        """Результат из кэша или compute() с сохранением."""
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses}
+
+    def summary(self):
+        return f"Кэш: попаданий {self.hits} (память) + {self.disk_hits} (диск), промахов {self.misses}"
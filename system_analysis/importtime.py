@@ -0,0 +1,66 @@
+"""
+Время запуска вычислительных команд: каждая команда выполняется в отдельном
+процессе с python -X importtime, отчет (stderr) разбирается, и для каждой
+команды печатаются общее время, время импортов и самые дорогие пакеты.
+"""
+import subprocess
+import sys
+import time
+
+from . import ROOT
+
+# Команды без графиков: числовое ядро должно обходиться одним NumPy
+COMMANDS = [
+    ['task1', '--no-plot'],
+    ['task2', '--solver', 'potentials'],
+    ['task3', '--no-plot'],
+    ['task4', '--no-plot'],
+]
+
+HEAVY = ('pandas', 'matplotlib', 'seaborn', 'scipy')
+
+def parse_importtime(stderr):
+    """
+    Разбирает строки «import time: self | cumulative | package».
+    Возвращает список (пакет верхнего уровня, cumulative мкс, self мкс).
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|', 2)
+        records.append((name.rstrip()[1:], int(cumulative), int(own)))
+    return records
+
+def measure(command, repeat=3):
+    """Лучшее из repeat время процесса (мс) и отчет importtime последнего запуска."""
+    best, stderr = float('inf'), ''
+    for _ in range(repeat):
+        started = time.perf_counter()
+        done = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'system_analysis', *command],
+                              cwd=ROOT, capture_output=True, text=True)
+        best = min(best, (time.perf_counter() - started) * 1000)
+        if done.returncode:
+            raise RuntimeError(f"{' '.join(command)}: код {done.returncode}\n{done.stderr[-2000:]}")
+        stderr = done.stderr
+    return best, parse_importtime(stderr)
+
+def run(limit=200.0, top=8):
+    """Печатает разбивку времени запуска; возвращает 1, если команда дольше limit мс или грузит тяжелые пакеты."""
+    failures = 0
+    for command in COMMANDS:
+        wall, records = measure(command)
+        # Пакеты верхнего уровня — строки без отступа
+        roots = [(name, cumulative) for name, cumulative, _ in records if not name.startswith(' ')]
+        imports = sum(cumulative for _, cumulative in roots) / 1000
+        heavy = sorted({name.strip().split('.')[0] for name, _, _ in records} & set(HEAVY))
+        ok = wall < limit and not heavy
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} python -m system_analysis {' '.join(command)}: "
+              f"{wall:.0f} мс (импорты {imports:.0f} мс)")
+        for name, cumulative in sorted(roots, key=lambda r: -r[1])[:top]:
+            print(f"      {cumulative / 1000:7.1f} мс  {name}")
+        if heavy:
+            print(f"      загружены тяжелые пакеты: {', '.join(heavy)}")
+    print(f"\nПорог: {limit:.0f} мс на команду, без {', '.join(HEAVY)}")
+    return 1 if failures else 0
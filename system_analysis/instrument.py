@@ -0,0 +1,211 @@
+"""
+Инструментирование задач: интервалы времени фаз (span), счетчики (count),
+запись событий в JSON Lines, профилирование прогона (cProfile или
+выборочное) и тихий режим, в котором консольный вывод (echo) отключен.
+
+    with session(quiet=True, trace='run.jsonl', profile='sample'):
+        with span('solve', solver='potentials'):
+            ...
+        count('pivots', result['pivots'])
+
+Без session() span и count ничего не делают, а echo печатает как print —
+поведение и скорость функций задач не меняются.
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+PROFILERS = ('cprofile', 'sample')
+
+# Сколько строк профиля печатать и записывать
+PROFILE_TOP = 15
+
+class Sampler:
+    """
+    Выборочный профилировщик: фоновый поток раз в interval секунд снимает
+    стек основного потока (sys._current_frames). Накладные расходы не
+    зависят от числа вызовов функций, в отличие от cProfile.
+    """
+
+    def __init__(self, interval=0.005):
+        import threading
+        self.interval = interval
+        self.own = {}
+        self.total = {}
+        self.samples = 0
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.samples += 1
+            seen = set()
+            innermost = True
+            while frame is not None:
+                code = frame.f_code
+                key = f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+                if innermost:
+                    self.own[key] = self.own.get(key, 0) + 1
+                    innermost = False
+                if key not in seen:
+                    seen.add(key)
+                    self.total[key] = self.total.get(key, 0) + 1
+                frame = frame.f_back
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def top(self, limit=PROFILE_TOP):
+        """Функции с наибольшей долей выборок (включая вызванные), доли собственных выборок."""
+        rows = sorted(self.total.items(), key=lambda item: -item[1])[:limit]
+        return [{'function': key, 'total': hits / self.samples, 'own': self.own.get(key, 0) / self.samples}
+                for key, hits in rows] if self.samples else []
+
+class Recorder:
+    """
+    Накопитель интервалов и счетчиков одного прогона. Интервалы вкладываются:
+    имя вложенного интервала — путь через '/', например 'solve/model'.
+    Каждый завершенный интервал сразу пишется в trace (JSON Lines).
+    enabled=False — интервалы и счетчики не записываются (вне session()).
+    """
+
+    def __init__(self, quiet=False, trace=None, enabled=True):
+        self.quiet = quiet
+        self.enabled = enabled
+        self.trace = trace
+        self.spans = []
+        self.counters = {}
+        self._stack = []
+
+    def write(self, record):
+        if self.trace is not None:
+            self.trace.write(json.dumps(record, ensure_ascii=False, default=float) + "\n")
+
+    @contextmanager
+    def span(self, name, **fields):
+        if not self.enabled:
+            yield
+            return
+        self._stack.append(name)
+        path = "/".join(self._stack)
+        # Место в списке — по началу интервала: сводка идет в порядке вложенности
+        index = len(self.spans)
+        self.spans.append((path, 0.0))
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            self._stack.pop()
+            self.spans[index] = (path, duration)
+            self.write({'type': 'span', 'name': path, 'duration': duration, **fields})
+
+    def count(self, name, value=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """Время по фазам (суммарно по повторам) и счетчики в виде строк."""
+        totals = {}
+        for path, duration in self.spans:
+            totals[path] = totals.get(path, 0.0) + duration
+        lines = [f"   {'  ' * path.count('/')}{path.rsplit('/', 1)[-1]:<{28 - 2 * path.count('/')}} "
+                 f"{duration * 1000:10.2f} мс" for path, duration in totals.items()]
+        lines += [f"   {name:<28} {value:>10,}" if isinstance(value, int) else f"   {name:<28} {value:>10.4g}"
+                  for name, value in self.counters.items()]
+        return lines
+
+_recorder = Recorder(enabled=False)
+
+def echo(*args, **kwargs):
+    """print, отключаемый тихим режимом."""
+    if not _recorder.quiet:
+        print(*args, **kwargs)
+
+def quiet():
+    """True в тихом режиме: вызывающий код может пропустить подготовку вывода целиком."""
+    return _recorder.quiet
+
+def span(name, **fields):
+    """Интервал времени фазы: with span('solve', solver='highs'): ..."""
+    return _recorder.span(name, **fields)
+
+def count(name, value=1):
+    """Увеличивает счетчик name на value (размер ЛП, число итераций, вычисленных клеток...)."""
+    _recorder.count(name, value)
+
+def _start_profile(profile):
+    if profile == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    sampler = Sampler()
+    sampler.start()
+    return sampler
+
+def _stop_profile(profiler, target):
+    """Останавливает профилировщик, печатает самые дорогие функции в stderr и пишет их в trace."""
+    if isinstance(profiler, Sampler):
+        profiler.stop()
+        top = profiler.top()
+        print(f"\nВыборочный профиль ({profiler.samples} выборок):", file=sys.stderr)
+        for row in top:
+            print(f"   {row['total']:6.1%} {row['own']:6.1%}  {row['function']}", file=sys.stderr)
+    else:
+        profiler.disable()
+        import pstats
+        stats = pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative')
+        stats.print_stats(PROFILE_TOP)
+        top = [{'function': f"{file}:{line}({name})", 'calls': calls, 'total': cumulative, 'own': own}
+               for (file, line, name), (_, calls, own, cumulative, _) in
+               sorted(stats.stats.items(), key=lambda item: -item[1][3])[:PROFILE_TOP]]
+    target.write({'type': 'profile', 'profiler': 'sample' if isinstance(profiler, Sampler) else 'cprofile',
+                 'top': top})
+
+@contextmanager
+def session(quiet=False, trace=None, profile=None, timings=False, name=None):
+    """
+    Прогон с инструментированием: quiet — без консольного вывода, trace —
+    путь к файлу JSON Lines (дописывается), profile — 'cprofile' или
+    'sample', timings — напечатать сводку по фазам и счетчики. В конце в
+    trace пишутся счетчики и общее время прогона.
+    """
+    global _recorder
+    handle = open(trace, 'a', encoding='utf-8') if trace else None
+    previous, _recorder = _recorder, Recorder(quiet=quiet, trace=handle)
+    profiler = _start_profile(profile) if profile else None
+    started = time.perf_counter()
+    try:
+        with _recorder.span(name or 'run'):
+            yield _recorder
+    finally:
+        if profiler is not None:
+            _stop_profile(profiler, _recorder)
+        _recorder.write({'type': 'counters', 'name': name or 'run', 'counters': _recorder.counters,
+                         'duration': time.perf_counter() - started})
+        if timings:
+            print("\n⏱ Время по фазам и счетчики:")
+            print("\n".join(_recorder.summary()))
+        if handle is not None:
+            handle.close()
+        _recorder = previous
+
+def add_arguments(parser):
+    """Флаги --quiet, --timings, --trace, --profile для CLI задач."""
+    parser.add_argument('--quiet', action='store_true', help="без консольного вывода")
+    parser.add_argument('--timings', action='store_true', help="напечатать время по фазам и счетчики")
+    parser.add_argument('--trace', help="дописывать интервалы и счетчики в файл JSON Lines")
+    parser.add_argument('--profile', choices=PROFILERS, help="профилировать прогон")
+
+def session_from_args(args, name=None):
+    return session(quiet=args.quiet, trace=args.trace, profile=args.profile, timings=args.timings, name=name)
@@ -0,0 +1,340 @@
+"""
+Компактные объекты результатов задач и их двоичный вывод.
+
+TransportResult (task2) и ResearchResult (task4) хранят поля в __slots__:
+числа и строки — как есть, план, потенциалы, платежную матрицу, EMV и
+вероятности — массивами NumPy без копирования. Результат сохраняется:
+
+    result.save_npz('plan.npz')          # один результат, np.savez без сжатия
+    write_arrow('results.arrow', [...])  # Arrow IPC, пакет на результат (нужен pyarrow)
+    save_result(path, result)            # .npz или .arrow по расширению
+    ResultLog('runs.salog').append(result)
+
+ResultLog — один дописываемый файл для множества результатов. Запись:
+длина заголовка и данных, JSON-заголовок (тип, скалярные поля, имена, типы
+и формы массивов), затем сырые байты массивов, выровненные по 64 байтам.
+Файл читается через отображение в память: массивы прочитанных результатов —
+срезы отображения, а столбцы скалярных полей (log.columns('fun', ...))
+собираются по заголовкам, не трогая массивы. Оборванная при сбое последняя
+запись при чтении пропускается.
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+# Выравнивание массивов в журнале (и начала каждой записи)
+ALIGN = 64
+
+LOG_MAGIC = b'SALOG01\n'
+
+# Префикс записи журнала: длина JSON-заголовка и длина данных массивов
+_PREFIX = struct.Struct('<QQ')
+
+RESULT_TYPES = {}
+
+def _padding(size):
+    return -size % ALIGN
+
+def _plain(value):
+    """Скаляр NumPy -> число Python (для JSON)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+class Result:
+    """
+    Основа объектов результатов: SCALARS — имена скалярных полей, ARRAYS —
+    имена полей-массивов (None, если массива нет, например при неудаче).
+    Поля доступны атрибутами и, для совместимости со словарями, по ключу.
+    """
+    __slots__ = ()
+    SCALARS = ()
+    ARRAYS = ()
+    # Типы столбцов Arrow (для массивов — тип элементов) и двумерные поля:
+    # схема не зависит от значений, поэтому пакеты разных результатов совместимы
+    ARROW_TYPES = {}
+    MATRICES = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        RESULT_TYPES[cls.__name__] = cls
+
+    def __init__(self, **fields):
+        unknown = set(fields) - set(self.SCALARS) - set(self.ARRAYS)
+        if unknown:
+            raise TypeError(f"{type(self).__name__}: неизвестные поля {', '.join(sorted(unknown))}")
+        for name in self.SCALARS:
+            setattr(self, name, _plain(fields.get(name)))
+        for name in self.ARRAYS:
+            value = fields.get(name)
+            # np.asarray не копирует готовый массив
+            setattr(self, name, None if value is None else np.asarray(value))
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def __repr__(self):
+        scalars = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.SCALARS)
+        arrays = ", ".join(f"{name}{getattr(self, name).shape}" for name in self.ARRAYS
+                           if getattr(self, name) is not None)
+        return f"{type(self).__name__}({scalars}; {arrays})"
+
+    def scalars(self):
+        return {name: getattr(self, name) for name in self.SCALARS}
+
+    def arrays(self):
+        """Массивы результата (сами объекты, без копий); отсутствующие пропускаются."""
+        return {name: getattr(self, name) for name in self.ARRAYS if getattr(self, name) is not None}
+
+    def fields(self):
+        """Все поля словарем (например, для ResultCache.put)."""
+        return {**self.scalars(), **{name: getattr(self, name) for name in self.ARRAYS}}
+
+    def save_npz(self, path):
+        """Сохраняет результат в .npz без сжатия: массивы пишутся из своих буферов, скаляры — JSON в __meta__."""
+        meta = json.dumps({'type': type(self).__name__, 'scalars': self.scalars()}, ensure_ascii=False)
+        np.savez(path, __meta__=np.array(meta), **self.arrays())
+
+    def to_arrow(self):
+        """
+        Результат как pyarrow.RecordBatch из одной строки. Массивы — столбцы
+        list<тип> поверх буферов NumPy (без копий для непрерывных массивов
+        нужного типа); для двумерных полей добавляется столбец '<имя>.shape'.
+        Типы столбцов — из ARROW_TYPES, отсутствующие значения — null.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Для вывода в Arrow установите pyarrow: pip install pyarrow") from None
+        columns = {name: pa.array([value], type=pa.type_for_alias(self.ARROW_TYPES[name]))
+                   for name, value in self.scalars().items()}
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            item = pa.type_for_alias(self.ARROW_TYPES[name])
+            if array is None:
+                columns[name] = pa.nulls(1, type=pa.list_(item))
+            else:
+                flat = pa.array(array.reshape(-1), type=item)
+                columns[name] = pa.ListArray.from_arrays(pa.array([0, len(flat)], type=pa.int32()), flat)
+            if name in self.MATRICES:
+                columns[f"{name}.shape"] = pa.array([None if array is None else list(array.shape)],
+                                                    type=pa.list_(pa.int64()))
+        return pa.RecordBatch.from_pydict(columns, metadata={'type': type(self).__name__})
+
+def load_npz(path):
+    """Читает результат, сохраненный save_npz."""
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(data['__meta__'].item())
+        arrays = {name: data[name] for name in data.files if name != '__meta__'}
+    return RESULT_TYPES[meta['type']](**meta['scalars'], **arrays)
+
+def write_arrow(path, results):
+    """
+    Пишет результаты одного типа в файл Arrow IPC, по пакету на результат.
+    Пакеты, чьи типы столбцов отличаются от первого (например, план float32),
+    приводятся к схеме первого.
+    """
+    import pyarrow as pa
+
+    writer = schema = None
+    try:
+        for result in results:
+            batch = result.to_arrow()
+            if writer is None:
+                schema = batch.schema
+                writer = pa.ipc.new_file(str(path), schema)
+            elif not batch.schema.equals(schema):
+                batch = pa.Table.from_batches([batch]).cast(schema).to_batches()[0]
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def save_result(path, result):
+    """Сохраняет один результат: .arrow или .feather — Arrow IPC, иначе — .npz."""
+    if str(path).endswith(('.arrow', '.feather')):
+        write_arrow(path, [result])
+    else:
+        result.save_npz(path)
+
+class ResultLog:
+    """
+    Дописываемый журнал результатов (формат — в описании модуля). Дописывать
+    можно из нескольких процессов: файл появляется под своим именем уже с
+    заголовком (_create), а каждая запись уходит в файл одним вызовом
+    os.writev (на POSIX) в режиме O_APPEND.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._map = None
+        self._index = []
+        self._end = 0
+
+    def append(self, result):
+        self.extend([result])
+
+    def extend(self, results):
+        """Дописывает результаты в конец журнала (файл создается при первой записи)."""
+        if not self.path.exists():
+            self._create()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        try:
+            for result in results:
+                _write_all(fd, self._record(result))
+        finally:
+            os.close(fd)
+
+    def _create(self):
+        """
+        Создает журнал с заголовком атомарно: заголовок пишется во временный
+        файл, который получает имя журнала жесткой ссылкой (os.link не
+        перезаписывает существующий файл). Если журнал успел создать другой
+        процесс, используется его файл; пустого журнала без заголовка,
+        в который кто-то дописывает записи, не бывает.
+        """
+        import tempfile
+
+        fd, temporary = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            os.write(fd, LOG_MAGIC + b'\0' * _padding(len(LOG_MAGIC)))
+            os.close(fd)
+            os.chmod(temporary, 0o644)
+            try:
+                os.link(temporary, self.path)
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(temporary)
+
+    @staticmethod
+    def _record(result):
+        """Буферы одной записи: префикс с заголовком и массивы (сами буферы NumPy, без копий)."""
+        descriptors, buffers, offset = [], [], 0
+        for name, array in result.arrays().items():
+            array = np.ascontiguousarray(array)
+            descriptors.append([name, array.dtype.str, list(array.shape), offset])
+            buffers.append(memoryview(array).cast('B'))
+            offset += array.nbytes
+            buffers.append(b'\0' * _padding(offset))
+            offset += _padding(offset)
+        header = json.dumps({'type': type(result).__name__, 'scalars': result.scalars(), 'arrays': descriptors},
+                            ensure_ascii=False, default=_plain).encode('utf-8')
+        header += b' ' * _padding(_PREFIX.size + len(header))
+        return [_PREFIX.pack(len(header), offset), header, *buffers]
+
+    def _scan(self):
+        """
+        Отображает файл в память и дополняет индекс записей (заголовок, начало
+        данных): после дописывания разбираются только новые записи.
+        """
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if self._map is not None and len(self._map) == size:
+            return self._index
+        if not size:
+            self._map, self._index, self._end = b'', [], 0
+            return self._index
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        if self._map[:len(LOG_MAGIC)] != LOG_MAGIC:
+            raise ValueError(f"{self.path} не является журналом результатов")
+        position = self._end or len(LOG_MAGIC) + _padding(len(LOG_MAGIC))
+        while position + _PREFIX.size <= size:
+            header_size, data_size = _PREFIX.unpack_from(self._map, position)
+            start = position + _PREFIX.size + header_size
+            if start + data_size > size:
+                break  # запись оборвана или еще дописывается
+            self._index.append((json.loads(self._map[position + _PREFIX.size:start]), start))
+            position = start + data_size
+        self._end = position
+        return self._index
+
+    def __len__(self):
+        return len(self._scan())
+
+    def __getitem__(self, i):
+        header, start = self._scan()[i]
+        arrays = {}
+        for name, dtype, shape, offset in header['arrays']:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            arrays[name] = np.frombuffer(self._map, dtype=dtype, count=count,
+                                         offset=start + offset).reshape(shape)
+        return RESULT_TYPES[header['type']](**header['scalars'], **arrays)
+
+    def __iter__(self):
+        for i in range(len(self._scan())):
+            yield self[i]
+
+    def columns(self, *names, type=None):
+        """
+        Скалярные поля всех записей (или только записей типа type, например
+        'TransportResult') массивами NumPy: {имя: массив}. Числовые поля —
+        float64 с NaN вместо отсутствующих значений. Массивы записей не читаются.
+        """
+        headers = [header for header, _ in self._scan() if type is None or header['type'] == type]
+        columns = {}
+        for name in names:
+            values = [header['scalars'].get(name) for header in headers]
+            column = np.array(values)
+            if column.dtype == object and all(v is None or isinstance(v, (int, float)) for v in values):
+                column = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            columns[name] = column
+        return columns
+
+def _write_all(fd, buffers):
+    """Пишет буферы в файл; os.writev — одним системным вызовом, где он есть."""
+    if hasattr(os, 'writev'):
+        written = os.writev(fd, buffers)
+        total = sum(len(buffer) for buffer in buffers)
+        if written == total:
+            return
+        # Частичная запись (очень большие записи): дописываем остаток
+        rest = b''.join(bytes(buffer) for buffer in buffers)[written:]
+        while rest:
+            rest = rest[os.write(fd, rest):]
+        return
+    for buffer in buffers:
+        view = memoryview(buffer)
+        while len(view):
+            view = view[os.write(fd, view):]
+
+class TransportResult(Result):
+    """
+    Результат транспортной задачи (task2). Размеры — сбалансированной задачи;
+    fictitious — 'consumer', 'supplier' или None. План — разреженный (rows,
+    cols, values), u и v — потенциалы поставщиков и потребителей,
+    iterations — итерации метода потенциалов или Синкхорна.
+    """
+    SCALARS = ('success', 'message', 'fun', 'solver', 'fictitious', 'num_suppliers', 'num_consumers',
+               'iterations')
+    ARRAYS = ('rows', 'cols', 'values', 'u', 'v')
+    __slots__ = SCALARS + ARRAYS
+    ARROW_TYPES = {'success': 'bool', 'message': 'string', 'fun': 'double', 'solver': 'string',
+                   'fictitious': 'string', 'num_suppliers': 'int64', 'num_consumers': 'int64',
+                   'iterations': 'int64', 'rows': 'int64', 'cols': 'int64', 'values': 'double',
+                   'u': 'double', 'v': 'double'}
+
+    def plan(self):
+        """Плотная матрица плана (только для небольших задач)."""
+        plan = np.zeros((self.num_suppliers, self.num_consumers))
+        plan[self.rows, self.cols] = self.values
+        return plan
+
+class ResearchResult(Result):
+    """
+    Результат анализа исследования (task4): итоговое решение, EVSI/EVPI,
+    платежная матрица, вероятности и EMV действий без исследования и с ним,
+    вероятности сигналов, апостериорные вероятности и действия по сигналам.
+    """
+    SCALARS = ('conduct_research', 'optimal_action', 'expected_profit', 'evsi', 'evpi', 'research_cost',
+               'optimal_original', 'optimal_research')
+    ARRAYS = ('actions', 'demand_levels', 'payoff', 'prob_original', 'prob_research', 'emv_original',
+              'emv_research', 'signal_prob', 'posterior', 'signal_action')
+    __slots__ = SCALARS + ARRAYS
+    # Объемы закупки и уровни спроса — double: допускаются дробные величины
+    ARROW_TYPES = {'conduct_research': 'bool', **dict.fromkeys(SCALARS[1:], 'double'),
+                   **dict.fromkeys(ARRAYS, 'double')}
+    MATRICES = ('payoff', 'posterior')
@@ -0,0 +1,552 @@
+"""
+Долгоживущий локальный сервис решателей: HTTP поверх asyncio (TCP или
+Unix-сокет), без сторонних библиотек. Модули задач импортируются один раз в
+процессах-исполнителях, поэтому запрос не платит за запуск интерпретатора и
+импорт numpy/scipy.
+
+    POST /solve/task1  {"c": [1.5, 3], "A": [[4, 5], ...], "b": [40, ...]}
+    POST /solve/task2  {"costs": [[...]], "supply": [...], "demand": [...], "solver": "potentials"}
+    POST /solve/task3  {"actions": [...], "demand_levels": [...], "probabilities": [...],
+                        "profit_per_box": 35, "cost_of_unsold": 56}
+    POST /solve/task4  {... как task3, "prior": [...], "accuracy": 0.8 или "likelihood": [[...]],
+                        "study_cost": 15}
+    GET  /stats        очередь, пакеты, перцентили задержки
+    GET  /health
+
+Запросы одного вида, пришедшие в пределах окна window (по умолчанию 2 мс),
+собираются в пакет (не больше max_batch) и решаются одним заданием пула:
+задачи task1 с одинаковыми ограничениями — одним проходом CostSweep, task3
+с одинаковой платежной матрицей — одним матричным произведением, task4 —
+одним вызовом preposterior_analysis по стеку априорных вероятностей и
+исследований; задачи task2 решаются по очереди, но за одну пересылку.
+
+    python -m system_analysis serve --port 8765 --workers 4
+    python -m system_analysis serve --check      # самопроверка на localhost
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import load
+
+KINDS = ('task1', 'task2', 'task3', 'task4')
+
+# Сколько последних задержек хранить для перцентилей
+LATENCY_WINDOW = 10_000
+
+MAX_BODY = 64 * 2**20
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# --- Решатели (выполняются в процессах-исполнителях) ---
+
+_modules = None
+
+def _load_modules():
+    """Импортирует модули задач один раз на процесс."""
+    global _modules
+    if _modules is None:
+        _modules = {
+            'numpy': importlib.import_module('numpy'),
+            'lp2d': load('task1', 'lp2d'),
+            'sweep': load('task1', 'sweep'),
+            'main': load('task2', 'main'),
+            'decision_engine': load('task3', 'decision_engine'),
+            'preposterior': load('task4', 'preposterior'),
+        }
+    return _modules
+
+def _warm_up():
+    _load_modules()
+
+def _plain(value):
+    """Результат NumPy -> JSON: массивы в списки, NaN и бесконечности в null."""
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, 'tolist'):
+        return _plain(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def _group(payloads, key):
+    """Индексы запросов, сгруппированные по ключу (общие данные пакета)."""
+    groups = {}
+    for i, payload in enumerate(payloads):
+        groups.setdefault(json.dumps([payload.get(k) for k in key]), []).append(i)
+    return groups.values()
+
+def _solve_task1(payloads):
+    m = _load_modules()
+    np = m['numpy']
+    results = [None] * len(payloads)
+    for indices in _group(payloads, ('A', 'b')):
+        first = payloads[indices[0]]
+        if len(indices) > 1 and 'method' not in first:
+            # Одни ограничения, разные стоимости: многоугольник строится один раз
+            try:
+                sweep = m['sweep'].CostSweep(first['A'], first['b'])
+            except ValueError:
+                sweep = None
+            if sweep is not None:
+                solved = sweep.solve([payloads[i]['c'] for i in indices])
+                for k, i in enumerate(indices):
+                    unbounded = bool(solved['unbounded'][k])
+                    results[i] = {'success': not unbounded, 'status': 'unbounded' if unbounded else 'optimal',
+                                  'x': None if unbounded else solved['x'][k], 'fun': None if unbounded else solved['fun'][k]}
+                continue
+        for i in indices:
+            payload = payloads[i]
+            solve = m['lp2d'].solve_vertices if payload.get('method') == 'vertices' else m['lp2d'].solve_seidel
+            result = solve(np.asarray(payload['c'], dtype=float), payload['A'], payload['b'])
+            results[i] = {key: result[key] for key in ('success', 'status', 'x', 'fun')}
+    return results
+
+def _solve_task2(payloads):
+    m = _load_modules()
+    np, transport = m['numpy'], m['main']
+    results = []
+    for payload in payloads:
+        costs = np.asarray(payload['costs'], dtype=float)
+        supply, demand, fictitious = transport.balance_problem(np.asarray(payload['supply'], dtype=float),
+                                                               np.asarray(payload['demand'], dtype=float))
+        result = transport.solve_balanced(costs, supply, demand, solver=payload.get('solver', 'potentials'),
+                                          dense=False, **payload.get('options', {}))
+        results.append({'success': result['success'], 'message': result['message'], 'fun': result['fun'],
+                        'fictitious': fictitious, **{key: result.get(key) for key in ('rows', 'cols', 'values')}})
+    return results
+
+PAYOFF_KEY = ('actions', 'demand_levels', 'profit_per_box', 'cost_of_unsold')
+
+def _payoff(payload):
+    return _load_modules()['decision_engine'].payoff_matrix(
+        payload['actions'], payload['demand_levels'], payload['profit_per_box'], payload['cost_of_unsold'])
+
+def _solve_task3(payloads):
+    np = _load_modules()['numpy']
+    results = [None] * len(payloads)
+    for indices in _group(payloads, PAYOFF_KEY):
+        payoff = _payoff(payloads[indices[0]])
+        actions = np.asarray(payloads[indices[0]]['actions'])
+        # EMV всех запросов группы — одно матричное произведение
+        emv = np.asarray([payloads[i]['probabilities'] for i in indices], dtype=float) @ payoff.T
+        best = emv.argmax(axis=1)
+        for k, i in enumerate(indices):
+            results[i] = {'emv': emv[k], 'action': actions[best[k]], 'emv_max': emv[k, best[k]]}
+    return results
+
+def _solve_task4(payloads):
+    m = _load_modules()
+    np, preposterior = m['numpy'], m['preposterior']
+    results = [None] * len(payloads)
+    for indices in _group(payloads, PAYOFF_KEY):
+        first = payloads[indices[0]]
+        payoff = _payoff(first)
+        actions = np.asarray(first['actions'])
+        levels = len(first['demand_levels'])
+        priors = np.asarray([payloads[i]['prior'] for i in indices], dtype=float)
+        likelihoods = [payloads[i]['likelihood'] if 'likelihood' in payloads[i]
+                       else preposterior.noisy_study(payloads[i]['accuracy'], levels) for i in indices]
+        # Все исследования группы — один стек B x S x D и один байесовский анализ
+        study = preposterior.preposterior_analysis(payoff, priors, preposterior.stack_designs(likelihoods))
+        for k, i in enumerate(indices):
+            signals = len(likelihoods[k])
+            result = {key: study[key][k] for key in ('evsi', 'evpi', 'emv_prior', 'emv_with_study')}
+            result['signal_prob'] = study['signal_prob'][k, :signals]
+            result['signal_action'] = actions[study['action'][k, :signals]]
+            if 'study_cost' in payloads[i]:
+                result['conduct'] = bool(study['evsi'][k] > payloads[i]['study_cost'])
+            results[i] = result
+    return results
+
+SOLVERS = {'task1': _solve_task1, 'task2': _solve_task2, 'task3': _solve_task3, 'task4': _solve_task4}
+
+def solve_batch(kind, payloads):
+    """
+    Решает пакет запросов одного вида. Возвращает список пар (ошибка, результат).
+    Если пакет целиком не решился (например, один запрос с неверными данными
+    испортил векторный проход), запросы решаются по одному.
+    """
+    try:
+        return [(None, _plain(r)) for r in SOLVERS[kind](payloads)]
+    except Exception:
+        if len(payloads) == 1:
+            raise
+    answers = []
+    for payload in payloads:
+        try:
+            answers.append((None, _plain(SOLVERS[kind]([payload])[0])))
+        except Exception as error:
+            answers.append((f"{type(error).__name__}: {error}", None))
+    return answers
+
+def _solve_guarded(kind, payloads):
+    try:
+        return solve_batch(kind, payloads)
+    except Exception as error:
+        return [(f"{type(error).__name__}: {error}", None)]
+
+# --- Сервис ---
+
+def percentiles(values, points=(50, 90, 99)):
+    """Перцентили (ближайший ранг) по списку значений."""
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{p}": None for p in points}
+    return {f"p{p}": ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)] for p in points}
+
+class SolverService:
+    """
+    Очереди запросов по видам задач, сборщики пакетов и пул исполнителей.
+    workers=0 — решение в одном потоке этого же процесса (для отладки).
+    """
+
+    def __init__(self, workers=None, window=0.002, max_batch=256):
+        self.workers = workers
+        self.window = window
+        self.max_batch = max_batch
+        self.queues = {}
+        self.in_flight = 0
+        self.requests = dict.fromkeys(KINDS, 0)
+        self.batches = dict.fromkeys(KINDS, 0)
+        self.errors = 0
+        self.latency = {kind: deque(maxlen=LATENCY_WINDOW) for kind in KINDS}
+        self.started = time.time()
+        self._tasks = []
+        self.pool = None
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8765, unix=None):
+        if self.workers == 0:
+            self.pool = ThreadPoolExecutor(max_workers=1)
+        else:
+            self.workers = self.workers or os.cpu_count() or 1
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Исполнители запускаются и импортируют модули задач до открытия сокета:
+        # первый запрос не ждет импорта, а дочерние процессы не наследуют
+        # соединения клиентов (иначе закрытое клиентом соединение не дает EOF)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_up)
+                               for _ in range(max(self.workers, 1))))
+        self.queues = {kind: asyncio.Queue() for kind in KINDS}
+        self._tasks = [asyncio.create_task(self._collect(kind)) for kind in KINDS]
+        if unix:
+            self.server = await asyncio.start_unix_server(self._handle, path=unix)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def submit(self, kind, payload):
+        """Ставит запрос в очередь своего вида и ждет его результат: (ошибка, результат)."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queues[kind].put((payload, future))
+        return await future
+
+    async def _collect(self, kind):
+        """Собирает пакеты: первый запрос + все, что придет в пределах окна, не больше max_batch."""
+        queue, loop = self.queues[kind], asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                if queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(queue.get_nowait())
+            # Пакет решается в пуле, а сборщик сразу собирает следующий
+            asyncio.create_task(self._run(kind, batch))
+
+    async def _run(self, kind, batch):
+        self.in_flight += 1
+        self.batches[kind] += 1
+        try:
+            answers = await asyncio.get_running_loop().run_in_executor(
+                self.pool, _solve_guarded, kind, [payload for payload, _ in batch])
+        except Exception as error:  # например, упал процесс-исполнитель
+            answers = [(f"{type(error).__name__}: {error}", None)]
+        finally:
+            self.in_flight -= 1
+        if len(answers) != len(batch):
+            answers = answers * len(batch)
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+    def stats(self):
+        every = [value for kind in KINDS for value in self.latency[kind]]
+        return {
+            'uptime': time.time() - self.started,
+            'queue_depth': {kind: queue.qsize() for kind, queue in self.queues.items()},
+            'in_flight_batches': self.in_flight,
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch': {kind: self.requests[kind] / self.batches[kind] if self.batches[kind] else None
+                           for kind in KINDS},
+            'errors': self.errors,
+            'latency_ms': {
+                'all': percentiles([1000 * v for v in every]),
+                **{kind: percentiles([1000 * v for v in self.latency[kind]]) for kind in KINDS},
+            },
+        }
+
+    async def _route(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, self.stats()
+        kind = path.removeprefix('/solve/')
+        if not path.startswith('/solve/') or kind not in KINDS:
+            return 404, {'error': f"Неизвестный путь: {path}"}
+        if method != 'POST':
+            return 405, {'error': "Нужен POST с JSON"}
+        try:
+            payload = json.loads(body)
+            if not isinstance(payload, dict):
+                raise ValueError("ожидался JSON-объект")
+        except ValueError as error:
+            return 400, {'error': f"Неверный JSON: {error}"}
+        started = time.perf_counter()
+        self.requests[kind] += 1
+        error, result = await self.submit(kind, payload)
+        self.latency[kind].append(time.perf_counter() - started)
+        if error is not None:
+            self.errors += 1
+            return 400, {'error': error}
+        return 200, result
+
+    async def _handle(self, reader, writer):
+        """Соединение HTTP/1.1 с keep-alive: запросы читаются, пока клиент не закроет соединение."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY:
+                    status, answer = 413, {'error': "Слишком большой запрос"}
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, answer = await self._route(method, path, body)
+                    except Exception as error:
+                        status, answer = 500, {'error': f"{type(error).__name__}: {error}"}
+                data = json.dumps(answer, ensure_ascii=False).encode('utf-8')
+                close = headers.get('connection', '').lower() == 'close' or status == 413
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                             .encode('latin-1') + data)
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+# --- Клиент ---
+
+class Client:
+    """Минимальный асинхронный HTTP-клиент с keep-alive для сервиса (TCP или Unix-сокет)."""
+
+    def __init__(self, host='127.0.0.1', port=8765, unix=None):
+        self.host, self.port, self.unix = host, port, unix
+        self.reader = self.writer = None
+
+    async def _connect(self):
+        if self.unix:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        """Возвращает (код ответа, JSON)."""
+        if self.writer is None:
+            await self._connect()
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def solve(self, kind, payload):
+        return await self.request('POST', f"/solve/{kind}", payload)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.reader = self.writer = None
+
+# --- Самопроверка ---
+
+def _check_cost(rng, A):
+    """
+    Вектор стоимости task1 для самопроверки: положительный, с нулевой
+    компонентой, нулевой, параллельный нормали ограничения (оптимально целое
+    ребро) или произвольного знака (часто неограниченная задача).
+    """
+    np = _load_modules()['numpy']
+    variant = rng.integers(5)
+    if variant == 0:
+        return rng.uniform(0.1, 5.0, size=2)
+    if variant == 1:
+        return np.eye(2)[rng.integers(2)] * rng.uniform(0.1, 5.0)
+    if variant == 2:
+        return np.zeros(2)
+    if variant == 3:
+        return A[rng.integers(len(A))] * rng.uniform(0.5, 2.0)
+    return rng.uniform(-5.0, 5.0, size=2)
+
+def _check_requests(count, seed=0):
+    """
+    Случайные запросы всех видов и ответы (словари проверяемых полей),
+    посчитанные напрямую без сервиса.
+    """
+    m = _load_modules()
+    np = m['numpy']
+    rng = np.random.default_rng(seed)
+    base = {'actions': [11, 12, 13], 'demand_levels': [11, 12, 13], 'profit_per_box': 35.0, 'cost_of_unsold': 56.0}
+    c, A, b = m['lp2d'].random_problem(40, rng, feasible_point=(50.0, 50.0))
+    requests = []
+    for i in range(count):
+        kind = KINDS[i % 4]
+        if kind == 'task1':
+            payload = {'c': _check_cost(rng, A).tolist(), 'A': A.tolist(), 'b': b.tolist()}
+            result = m['lp2d'].solve_seidel(payload['c'], A, b)
+            expected = {'status': result['status'], 'fun': result['fun']}
+        elif kind == 'task2':
+            size = int(rng.integers(3, 12))
+            payload = {'costs': rng.integers(1, 20, size=(size, size + 1)).tolist(),
+                       'supply': rng.integers(10, 40, size=size).tolist(),
+                       'demand': rng.integers(10, 40, size=size + 1).tolist(), 'solver': 'potentials'}
+            supply, demand, _ = m['main'].balance_problem(np.asarray(payload['supply'], dtype=float),
+                                                          np.asarray(payload['demand'], dtype=float))
+            expected = {'fun': m['main'].solve_balanced(np.asarray(payload['costs'], dtype=float), supply, demand,
+                                                        solver='potentials', dense=False)['fun']}
+        elif kind == 'task3':
+            payload = {**base, 'probabilities': rng.dirichlet(np.ones(3)).tolist()}
+            expected = {'emv_max': float((_payoff(payload) @ payload['probabilities']).max())}
+        else:
+            payload = {**base, 'prior': rng.dirichlet(np.ones(3)).tolist(), 'accuracy': float(rng.uniform(0.4, 1.0))}
+            expected = {'evsi': float(m['preposterior'].preposterior_analysis(
+                _payoff(payload), payload['prior'], m['preposterior'].noisy_study(payload['accuracy'], 3))['evsi'])}
+        requests.append((kind, payload, expected))
+    return requests
+
+def _same(answer, expected):
+    """Поля ответа совпадают с ожидаемыми (числа — с точностью 1e-9)."""
+    for key, value in expected.items():
+        got = answer.get(key)
+        if isinstance(value, (int, float)) and isinstance(got, (int, float)):
+            if not math.isclose(got, value, rel_tol=1e-9, abs_tol=1e-9):
+                return False
+        elif got != value:
+            return False
+    return True
+
+async def _check(workers, count, clients):
+    service = SolverService(workers=workers)
+    await service.start('127.0.0.1', 0)
+    host, port = service.address[:2]
+    print(f"Сервис запущен на http://{host}:{port}, запросов: {count}, клиентов: {clients}")
+    requests = _check_requests(count)
+    mismatches = 0
+
+    async def run_client(part):
+        nonlocal mismatches
+        client = Client(host, port)
+        for kind, payload, expected in part:
+            status, answer = await client.solve(kind, payload)
+            if status != 200 or not _same(answer, expected):
+                mismatches += 1
+        await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(requests[i::clients]) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    client = Client(host, port)
+    bad, _ = await client.solve('task3', {'actions': [1, 2]})
+    _, stats = await client.request('GET', '/stats')
+    await client.close()
+    await service.close()
+
+    print(f"Время: {elapsed:.2f} с ({count / elapsed:,.0f} запросов в секунду), расхождений: {mismatches}")
+    print(f"Неверный запрос → код {bad}")
+    for kind in KINDS:
+        latency = stats['latency_ms'][kind]
+        print(f"   {kind}: пакетов {stats['batches'][kind]}, в среднем {stats['mean_batch'][kind]:.1f} запросов, "
+              f"задержка p50 {latency['p50']:.2f} / p90 {latency['p90']:.2f} / p99 {latency['p99']:.2f} мс")
+    return mismatches + (bad != 400)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m system_analysis serve",
+                                     description="Локальный сервис решателей task1–task4 (HTTP поверх asyncio)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="слушать Unix-сокет вместо TCP")
+    parser.add_argument('--workers', type=int, default=None, help="процессов-исполнителей (0 — в этом процессе)")
+    parser.add_argument('--window-ms', type=float, default=2.0, help="окно сбора пакета, мс")
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--check', action='store_true', help="самопроверка: сервис на localhost и сверка ответов")
+    parser.add_argument('--requests', type=int, default=2000, help="число запросов самопроверки")
+    parser.add_argument('--clients', type=int, default=32, help="одновременных клиентов самопроверки")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 1 if asyncio.run(_check(args.workers, args.requests, args.clients)) else 0
+
+    async def serve():
+        service = SolverService(args.workers, args.window_ms / 1000, args.max_batch)
+        server = await service.start(args.host, args.port, args.unix)
+        where = args.unix or f"http://{args.host}:{service.address[1]}"
+        print(f"🚀 Сервис решателей: {where} (Ctrl+C — остановка)")
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
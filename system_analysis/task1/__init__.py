@@ -0,0 +1 @@
+"""Минимизация стоимости добавок в топливо (ЛП)."""
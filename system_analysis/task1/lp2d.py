@@ -0,0 +1,318 @@
+import time
+from collections import deque
+
+import numpy as np
+
+# Ограничения задаются в виде A @ (x, y) >= b (как в условии задачи 1)
+STATUS_MESSAGES = {
+    'optimal': "Оптимальное решение найдено.",
+    'infeasible': "Область допустимых решений пуста.",
+    'unbounded': "Целевая функция не ограничена на допустимой области.",
+}
+
+# Допуск на нарушение ограничения (строки нормированы, поэтому допуск абсолютный)
+TOL = 1e-9
+
+def normalize_constraints(A, b):
+    """
+    Приводит ограничения A @ p >= b к виду с единичными нормалями |a_i| = 1.
+    Строки с нулевой нормалью (0 >= b_i) не задают прямую: они либо
+    выполняются всегда, либо делают задачу несовместной — это
+    возвращается флагом feasible.
+    """
+    A = np.asarray(A, dtype=float).reshape(-1, 2)
+    b = np.asarray(b, dtype=float).ravel()
+    norms = np.hypot(A[:, 0], A[:, 1])
+    degenerate = norms < TOL
+    feasible = bool(np.all(b[degenerate] <= TOL))
+    keep = np.flatnonzero(~degenerate)
+    return A[keep] / norms[keep, None], b[keep] / norms[keep], keep, feasible
+
+def default_bound(b):
+    """Полуразмер ограничивающего квадрата |x|, |y| <= bound: выход на него означает неограниченность."""
+    return 1e6 * max(1.0, float(np.abs(b).max(initial=0.0)))
+
+def _box(bound):
+    """Четыре полуплоскости квадрата |x|, |y| <= bound."""
+    A = np.array([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0]])
+    return A, np.full(4, -bound)
+
+def _result(status, point=None, c=None, active=()):
+    if status != 'optimal':
+        return {'success': False, 'status': status, 'message': STATUS_MESSAGES[status],
+                'x': None, 'fun': None, 'active': None}
+    return {'success': True, 'status': status, 'message': STATUS_MESSAGES[status],
+            'x': point, 'fun': float(c @ point), 'active': np.array(active, dtype=np.int64)}
+
+def _solve_on_line(c, A, b, k):
+    """
+    Одномерная задача на прямой a_k · p = b_k с ограничениями A[:k] (векторно).
+    Точка прямой p = p0 + t·d; каждое ограничение дает t >= ... или t <= ...
+    Возвращает (точка, индекс ограничения, задавшего конец отрезка) или None,
+    если ограничения несовместны на прямой.
+    """
+    a = A[k]
+    p0 = b[k] * a
+    d = np.array([-a[1], a[0]])
+    slope = A[:k] @ d
+    rhs = b[:k] - A[:k] @ p0
+
+    parallel = np.abs(slope) < TOL
+    if np.any(rhs[parallel] > TOL):
+        return None
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bounds = rhs / slope
+    lower = np.where(slope > TOL, bounds, -np.inf)
+    upper = np.where(slope < -TOL, bounds, np.inf)
+    lo_index = int(np.argmax(lower))
+    hi_index = int(np.argmin(upper))
+    lo, hi = lower[lo_index], upper[hi_index]
+    if lo > hi + TOL:
+        return None
+
+    direction = c @ d
+    if direction > 0:
+        t, tight = lo, lo_index
+    elif direction < 0:
+        t, tight = hi, hi_index
+    else:
+        t, tight = (lo, lo_index) if np.isfinite(lo) else (hi, hi_index)
+    if lo > hi:
+        t = 0.5 * (lo + hi)
+    return p0 + t * d, tight
+
+def _seidel(c, A, b, bound, rng, chunk):
+    """Алгоритм Зейделя для нормированных ограничений; возвращает (точка, активные строки) или None."""
+    order = rng.permutation(len(b))
+    box_A, box_b = _box(bound)
+    A_all = np.concatenate((box_A, A[order]))
+    b_all = np.concatenate((box_b, b[order]))
+    # Индексы строк A (-1 — сторона ограничивающего квадрата)
+    labels = np.concatenate((np.full(4, -1), order))
+
+    # Оптимум на квадрате: угол, выбранный по знакам c (при c = 0 — любой)
+    point = np.where(c > 0, -bound, bound).astype(float)
+    active = [0 if c[0] > 0 else 2, 1 if c[1] > 0 else 3]
+
+    pos, step, total = 4, chunk, len(b_all)
+    while pos < total:
+        stop = min(total, pos + step)
+        violated = np.flatnonzero(A_all[pos:stop] @ point < b_all[pos:stop] - TOL)
+        if len(violated) == 0:
+            pos, step = stop, step * 2
+            continue
+        k = pos + int(violated[0])
+        found = _solve_on_line(c, A_all, b_all, k)
+        if found is None:
+            return None
+        point, tight = found
+        active = [k, tight]
+        pos, step = k + 1, chunk
+    return point, labels[active]
+
+def solve_seidel(c, A, b, bound=None, seed=None, chunk=64):
+    """
+    Рандомизированный инкрементный алгоритм Зейделя для задачи
+    min c · p при A @ p >= b, p = (x, y). Ожидаемое время O(m).
+
+    Ограничения перебираются в случайном порядке; текущий оптимум меняется,
+    только если новое ограничение нарушено (вероятность 2/i), и тогда новый
+    оптимум ищется на прямой этого ограничения среди предыдущих. Поиск
+    следующего нарушенного ограничения выполняется векторно блоками растущей
+    длины, а одномерная задача — векторно по префиксу, поэтому цикл Python
+    выполняет лишь O(log m) шагов в среднем.
+
+    Поиск ведется в квадрате |x|, |y| <= bound. Неограниченность проверяется
+    отдельно той же процедурой: задача неограниченна, если на конусе
+    A @ d >= 0 (в единичном квадрате) есть направление d с c · d < 0.
+    Возвращает словарь: success, status ('optimal' / 'infeasible' /
+    'unbounded'), message, x (точка), fun, active (индексы двух ограничений,
+    задающих вершину; -1 — сторона квадрата).
+    """
+    c = np.asarray(c, dtype=float)
+    A_n, b_n, original, feasible = normalize_constraints(A, b)
+    if not feasible:
+        return _result('infeasible')
+    if bound is None:
+        bound = default_bound(b_n)
+    rng = np.random.default_rng(seed)
+
+    found = _seidel(c, A_n, b_n, bound, rng, chunk)
+    if found is None:
+        return _result('infeasible')
+    direction, _ = _seidel(c, A_n, np.zeros(len(b_n)), 1.0, rng, chunk)
+    if c @ direction < -TOL * max(1.0, float(np.abs(c).max())):
+        return _result('unbounded')
+    point, active = found
+    return _result('optimal', point, c, sorted(original[k] if k >= 0 else -1 for k in active))
+
+def _intersect(A, b, i, j):
+    """Точки пересечения прямых a_i · p = b_i и a_j · p = b_j (векторно)."""
+    det = A[i, 0] * A[j, 1] - A[i, 1] * A[j, 0]
+    x = (b[i] * A[j, 1] - b[j] * A[i, 1]) / det
+    y = (A[i, 0] * b[j] - A[j, 0] * b[i]) / det
+    return np.stack((x, y), axis=-1)
+
+def halfplane_intersection(A, b, bound=None):
+    """
+    Многоугольник допустимых решений A @ p >= b, ограниченный квадратом
+    |x|, |y| <= bound: вершины в порядке обхода против часовой стрелки.
+
+    Полуплоскости сортируются по углу граничной прямой (np.lexsort), из
+    параллельных оставляется самая сильная, затем одним проходом с деком
+    отбрасываются лишние; вершины вычисляются векторно как пересечения
+    соседних прямых. Время O(m log m).
+
+    Возвращает (vertices, edges): vertices — массив (k, 2), edges[i] —
+    индекс исходного ограничения, на прямой которого лежит ребро от
+    vertices[i] к vertices[i + 1] (-1 — сторона квадрата). Для пустой
+    области возвращаются пустые массивы.
+    """
+    A_n, b_n, original, feasible = normalize_constraints(A, b)
+    if not feasible:
+        return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+    if bound is None:
+        bound = default_bound(b_n)
+    box_A, box_b = _box(bound)
+    A_all = np.concatenate((A_n, box_A))
+    b_all = np.concatenate((b_n, box_b))
+    labels = np.concatenate((original, np.full(4, -1)))
+
+    # Направление прямой d = (a_y, -a_x): допустимая сторона слева от d.
+    # Прибавление 0.0 убирает -0.0, иначе одно направление дало бы углы -pi и pi
+    angle = np.arctan2(0.0 - A_all[:, 0], A_all[:, 1] + 0.0)
+    angle = np.round(angle / 1e-12) * 1e-12
+    order = np.lexsort((-b_all, angle))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = angle[order[1:]] != angle[order[:-1]]
+    order = order[first]
+
+    # Проход с деком — поэлементный, на числах Python (быстрее скалярных операций NumPy)
+    ax, ay, bb = A_all[:, 0].tolist(), A_all[:, 1].tolist(), b_all.tolist()
+
+    def outside(k, i, j):
+        det = ax[i] * ay[j] - ay[i] * ax[j]
+        if abs(det) < TOL:
+            return False
+        x = (bb[i] * ay[j] - bb[j] * ay[i]) / det
+        y = (ax[i] * bb[j] - ax[j] * bb[i]) / det
+        return ax[k] * x + ay[k] * y < bb[k] - TOL
+
+    dq = deque()
+    for k in order.tolist():
+        while len(dq) >= 2 and outside(k, dq[-1], dq[-2]):
+            dq.pop()
+        while len(dq) >= 2 and outside(k, dq[0], dq[1]):
+            dq.popleft()
+        if dq and abs(ax[k] * ay[dq[-1]] - ay[k] * ax[dq[-1]]) < TOL:
+            # Противоположные направления: полоса пуста или вырождена
+            if ax[k] * ax[dq[-1]] + ay[k] * ay[dq[-1]] < 0:
+                return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+            continue
+        dq.append(k)
+    while len(dq) >= 3 and outside(dq[0], dq[-1], dq[-2]):
+        dq.pop()
+    while len(dq) >= 3 and outside(dq[-1], dq[0], dq[1]):
+        dq.popleft()
+    if len(dq) < 3:
+        return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+
+    lines = np.fromiter(dq, dtype=np.int64, count=len(dq))
+    vertices = _intersect(A_all, b_all, lines, np.roll(lines, -1))
+    # Ребро от вершины i к вершине i + 1 лежит на прямой lines[i + 1]
+    edges = labels[np.roll(lines, -1)]
+    # Совпадающие вершины (через точку проходит больше двух прямых) объединяются
+    step = np.hypot(*(vertices - np.roll(vertices, 1, axis=0)).T)
+    distinct = step > 1e-9 * (1.0 + np.abs(vertices).max(axis=1))
+    if distinct.any():
+        vertices, edges = vertices[distinct], edges[np.roll(distinct, -1)]
+    else:
+        vertices, edges = vertices[:1], edges[:1]
+    # Вырожденная область (точка или отрезок): проход с деком не замечает
+    # противоположных полуплоскостей, разделенных другими, — проверяем явно
+    if len(vertices) < 3 and np.any(A_all @ vertices.T < b_all[:, None] - 1e-7 * (1.0 + np.abs(vertices).max())):
+        return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+    return vertices, edges
+
+def solve_vertices(c, A, b, bound=None):
+    """
+    Перебор вершин допустимого многоугольника (см. halfplane_intersection):
+    стоимость всех вершин считается одним матрично-векторным произведением.
+    Используется для перекрестной проверки solve_seidel; формат результата тот же.
+    """
+    c = np.asarray(c, dtype=float)
+    if bound is None:
+        bound = default_bound(normalize_constraints(A, b)[1])
+    vertices, edges = halfplane_intersection(A, b, bound)
+    if len(vertices) == 0:
+        return _result('infeasible')
+    # Конус направлений неограниченности: вершины многоугольника A @ d >= 0 в единичном квадрате
+    directions, _ = halfplane_intersection(A, np.zeros(len(np.atleast_2d(A))), 1.0)
+    if len(directions) and (directions @ c).min() < -TOL * max(1.0, float(np.abs(c).max())):
+        return _result('unbounded')
+    costs = vertices @ c
+    best = int(np.argmin(costs))
+    return _result('optimal', vertices[best], c, sorted((edges[best - 1], edges[best])))
+
+def random_problem(m, rng, feasible_point=None):
+    """
+    Случайная задача с m ограничениями: нормали направлены в первую четверть,
+    так что область неограниченна вверх-вправо, а стоимость с c > 0 ограничена
+    снизу. Ограничения проходят ниже feasible_point, если она задана.
+    """
+    angles = rng.uniform(0.0, np.pi / 2, size=m)
+    A = np.stack((np.cos(angles), np.sin(angles)), axis=1) * rng.uniform(0.5, 2.0, size=(m, 1))
+    if feasible_point is None:
+        b = rng.uniform(0.0, 100.0, size=m)
+    else:
+        b = A @ np.asarray(feasible_point) - rng.exponential(10.0, size=m)
+    c = rng.uniform(0.1, 5.0, size=2)
+    return c, A, b
+
+def cross_check(num_instances=1000, max_constraints=50, seed=0):
+    """
+    Сверяет solve_seidel с перебором вершин на случайных задачах, включая
+    несовместные и неограниченные; каждая третья задача целочисленная
+    (вырожденные вершины, параллельные ограничения). Возвращает число расхождений.
+    """
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for k in range(num_instances):
+        m = int(rng.integers(1, max_constraints + 1))
+        A = rng.normal(size=(m, 2))
+        b = rng.normal(scale=10.0, size=m)
+        c = rng.normal(size=2)
+        if k % 3 == 0:
+            A, b, c = np.round(A), np.round(b), np.round(c)
+        fast = solve_seidel(c, A, b, seed=k)
+        reference = solve_vertices(c, A, b)
+        ok = fast['status'] == reference['status'] and (
+            not fast['success'] or np.isclose(fast['fun'], reference['fun'], rtol=1e-7, atol=1e-6)
+        )
+        if not ok:
+            mismatches += 1
+            print(f"❌ Задача {k} (m={m}): {fast['status']} {fast['fun']} != {reference['status']} {reference['fun']}")
+    print(f"Проверено задач: {num_instances}, расхождений: {mismatches}")
+    return mismatches
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Двумерная задача ЛП: алгоритм Зейделя и перебор вершин")
+    parser.add_argument('--check', action='store_true', help="сверить алгоритм Зейделя с перебором вершин")
+    parser.add_argument('--constraints', type=int, default=1_000_000, help="число ограничений в замере времени")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if cross_check() else 0)
+
+    rng = np.random.default_rng(args.seed)
+    c, A, b = random_problem(args.constraints, rng)
+    print(f"--- Случайная задача с {args.constraints} ограничениями ---")
+    for name, solve in (("Алгоритм Зейделя", solve_seidel), ("Перебор вершин", solve_vertices)):
+        started = time.perf_counter()
+        result = solve(c, A, b)
+        elapsed = time.perf_counter() - started
+        print(f"{name}: {result['message']} x = {result['x']}, стоимость {result['fun']:.6f}, "
+              f"активные ограничения {result['active']}, время {elapsed:.3f} с")
@@ -0,0 +1,132 @@
+import numpy as np
+
+from ..instrument import add_arguments, count, echo, session_from_args, span
+from .lp2d import halfplane_intersection, solve_seidel, solve_vertices
+from .sweep import CostSweep
+
+# Цены продуктов A и B (ф. ст./л)
+PRICES = np.array([1.5, 3.0])
+
+# Ограничения: a*x + b*y >= c
+CONSTRAINTS = np.array([
+    [4, 5],  # X: 4x + 5y ≥ 40
+    [2, 1],  # Y: 2x + y ≥ 14
+    [3, 1],  # Z: 3x + y ≥ 18
+    [1, 0],  # x ≥ 0
+    [0, 1],  # y ≥ 0
+])
+REQUIREMENTS = np.array([40, 14, 18, 0, 0])
+LABELS = ['4x + 5y ≥ 40', '2x + y ≥ 14', '3x + y ≥ 18', 'x ≥ 0', 'y ≥ 0']
+
+SOLVERS = {'seidel': solve_seidel, 'vertices': solve_vertices}
+
+# Границы графика
+X_MAX, Y_MAX = 15, 20
+
+def feasible_vertices(A=CONSTRAINTS, b=REQUIREMENTS):
+    """Вершины области допустимых решений (без вершин вспомогательного квадрата)."""
+    vertices, edges = halfplane_intersection(A, b)
+    # Вершина настоящая, если оба ребра, сходящиеся в ней, — исходные ограничения
+    real = (edges >= 0) & (np.roll(edges, 1) >= 0)
+    return vertices[real]
+
+def solve(method='seidel', costs=PRICES, A=CONSTRAINTS, b=REQUIREMENTS):
+    """Решает задачу выбранным методом: 'seidel' (алгоритм Зейделя) или 'vertices' (перебор вершин)."""
+    return SOLVERS[method](costs, A, b)
+
+def plot_solution(best, vertices, A=CONSTRAINTS, b=REQUIREMENTS, labels=LABELS, save=None, dpi=100):
+    """
+    График области и оптимума в файл save (по умолчанию region.png): бэкенд
+    Agg, без окна, дисплей не нужен.
+    """
+    # Общая настройка бэкенда и шрифта графиков — в task3/reports.py
+    from ..task3.reports import use_agg
+    plt = use_agg()
+    save = save or 'region.png'
+
+    x_vals = np.linspace(0, X_MAX, 400)
+    colors = ['r-', 'g-', 'b-']
+
+    plt.figure(figsize=(10, 8))
+
+    # Построим ограничения (кроме осей)
+    for k, ((a1, a2), c) in enumerate(zip(A, b)):
+        if a2 != 0 and c != 0:
+            plt.plot(x_vals, (c - a1 * x_vals) / a2, colors[k % len(colors)], label=labels[k])
+
+    # Заштрихуем область допустимых решений в пределах графика
+    view_A = np.vstack((A, [[-1, 0], [0, -1]]))
+    view_b = np.concatenate((b, [-X_MAX, -Y_MAX]))
+    region, _ = halfplane_intersection(view_A, view_b)
+    if len(region):
+        plt.fill(region[:, 0], region[:, 1], color='gray', alpha=0.3, label='Допустимая область')
+
+    # Отметим вершины области
+    for x, y in vertices:
+        plt.plot(x, y, 'bo', markersize=8, label=f'({x:.2f}, {y:.2f})')
+
+    # Отметим оптимальную точку
+    plt.plot(best[0], best[1], 'ro', markersize=12, label=f'Оптимум ({best[0]:.2f}, {best[1]:.2f})')
+
+    plt.xlim(0, X_MAX)
+    plt.ylim(0, Y_MAX)
+    plt.xlabel('Продукт A (л)')
+    plt.ylabel('Продукт B (л)')
+    plt.title('Область допустимых решений и оптимальное решение')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(save, dpi=dpi)
+    plt.close()
+    echo(f"\n📊 График сохранен в файл '{save}'")
+
+def main(method='seidel', plot=True, save=None):
+    with span('vertices'):
+        vertices = feasible_vertices()
+        costs = vertices @ PRICES
+    count('constraints', len(CONSTRAINTS))
+    count('feasible_vertices', len(vertices))
+
+    echo("Вершины области допустимых решений:")
+    for (x, y), cost in zip(vertices, costs):
+        echo(f"({x:.2f}, {y:.2f}) — стоимость: {cost:.2f}")
+
+    with span('solve', method=method):
+        result = solve(method)
+    if not result['success']:
+        echo(f"\n❌ {result['message']}")
+        return result
+
+    x, y = result['x']
+    echo("\nРезультат:")
+    echo(f"Оптимальное количество продукта A: {x:.2f} л")
+    echo(f"Оптимальное количество продукта B: {y:.2f} л")
+    echo(f"Минимальная стоимость: {result['fun']:.2f} ф. ст.")
+    echo("Активные ограничения: " + ", ".join(LABELS[k] for k in result['active']))
+
+    # Диапазон цены A (при неизменной цене B), в котором план остается оптимальным
+    with span('ranges'):
+        sweep = CostSweep(CONSTRAINTS, REQUIREMENTS)
+        vertex = sweep.optimal_vertex(PRICES)[0]
+        ranges = sweep.ranges()
+    for row in ranges:
+        if row['vertex'] == vertex and row['ratio_from'] is not None:
+            echo(f"План оптимален при цене A от {row['ratio_from'] * PRICES[1]:.2f} "
+                 f"до {row['ratio_to'] * PRICES[1]:.2f} ф. ст./л (цена B {PRICES[1]:.2f})")
+
+    if plot:
+        with span('plot'):
+            plot_solution(result['x'], vertices, save=save)
+    return result
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Минимизация стоимости добавок (двумерная задача ЛП)")
+    parser.add_argument('--method', choices=SOLVERS, default='seidel',
+                        help="алгоритм Зейделя или перебор вершин допустимой области")
+    parser.add_argument('--no-plot', action='store_true', help="не строить график (без matplotlib)")
+    parser.add_argument('--save', help="файл графика (по умолчанию region.png)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    with session_from_args(args, name='task1'):
+        main(args.method, plot=not args.no_plot, save=args.save)
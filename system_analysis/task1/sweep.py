@@ -0,0 +1,162 @@
+import time
+
+import numpy as np
+
+from .lp2d import halfplane_intersection
+
+# Допуск на совпадение угла вектора стоимости с углом нормали ребра (радианы)
+ANGLE_TOL = 1e-9
+
+class CostSweep:
+    """
+    Многократное решение задачи min c · p при A @ p >= b для разных векторов
+    стоимости c при неизменных ограничениях.
+
+    Многоугольник допустимых решений строится один раз. Вершина i оптимальна
+    тогда и только тогда, когда c лежит в конусе, натянутом на внутренние
+    нормали двух сходящихся в ней ребер (условие двойственности), а нормали
+    ребер выпуклого многоугольника упорядочены по углу. Поэтому оптимальная
+    вершина для пачки векторов c находится одним векторным проходом:
+    угол c (np.arctan2) и двоичный поиск среди углов нормалей (np.searchsorted).
+    Если оптимальная вершина лежит на вспомогательном квадрате, целевая
+    функция при таком c не ограничена.
+    """
+
+    def __init__(self, A, b, bound=None):
+        self.vertices, self.edges = halfplane_intersection(A, b, bound)
+        k = len(self.vertices)
+        if k == 0:
+            raise ValueError("Область допустимых решений пуста.")
+        # Вершина i лежит между ребрами i - 1 и i; настоящая — если оба ребра исходные
+        self.bounded = (self.edges >= 0) & (np.roll(self.edges, 1) >= 0)
+        if k == 1:
+            self.normals = np.empty((0, 2))
+            self._angles = np.empty(0)
+            self._shift = 0
+            return
+
+        # Внутренние нормали ребер: обход против часовой стрелки, область слева
+        direction = np.roll(self.vertices, -1, axis=0) - self.vertices
+        normals = np.stack((-direction[:, 1], direction[:, 0]), axis=1)
+        self.normals = normals / np.hypot(normals[:, 0], normals[:, 1])[:, None]
+        angles = np.arctan2(self.normals[:, 1], self.normals[:, 0])
+        # Углы растут по ходу обхода; начинаем с минимального, чтобы массив был отсортирован
+        self._shift = int(np.argmin(angles))
+        self._angles = np.roll(angles, -self._shift)
+
+    def optimal_vertex(self, costs):
+        """Индексы оптимальных вершин для векторов стоимости costs формы (N, 2)."""
+        costs = np.asarray(costs, dtype=float).reshape(-1, 2)
+        if len(self._angles) == 0:
+            return np.zeros(len(costs), dtype=np.int64)
+        k = len(self.vertices)
+        theta = np.arctan2(costs[:, 1], costs[:, 0])
+        pos = np.searchsorted(self._angles, theta, side='right')
+        vertex = (self._shift + pos) % k
+        # c параллелен нормали соседнего ребра (с точностью до ANGLE_TOL): оптимально все
+        # ребро, и если найденная вершина лежит на вспомогательном квадрате, берется
+        # настоящая вершина на другом конце ребра — минимум достигается в ней
+        for edge_pos, step in ((pos - 1, -1), (pos, 1)):
+            gap = np.abs((theta - self._angles[edge_pos % k] + np.pi) % (2 * np.pi) - np.pi)
+            other = (vertex + step) % k
+            vertex = np.where((gap <= ANGLE_TOL) & ~self.bounded[vertex] & self.bounded[other], other, vertex)
+        return vertex
+
+    def solve(self, costs, chunk=1 << 20):
+        """
+        Решает задачу для пачки векторов стоимости costs формы (N, 2).
+        Возвращает словарь: vertex (индексы вершин), x (точки, N x 2),
+        fun (стоимости), unbounded (флаги неограниченности; для них fun = -inf).
+        """
+        costs = np.asarray(costs, dtype=float).reshape(-1, 2)
+        vertex = np.empty(len(costs), dtype=np.int64)
+        fun = np.empty(len(costs))
+        for start in range(0, len(costs), chunk):
+            block = costs[start:start + chunk]
+            index = self.optimal_vertex(block)
+            vertex[start:start + chunk] = index
+            fun[start:start + chunk] = np.einsum('ij,ij->i', block, self.vertices[index])
+        unbounded = ~self.bounded[vertex] & np.any(costs != 0, axis=1)
+        fun[unbounded] = -np.inf
+        return {'vertex': vertex, 'x': self.vertices[vertex], 'fun': fun, 'unbounded': unbounded}
+
+    def ranges(self):
+        """
+        Диапазоны оптимальности настоящих вершин. Для каждой вершины —
+        конус векторов стоимости, при которых она оптимальна (углы нормалей
+        ребер, в градусах), и соответствующий диапазон отношения цен
+        c_a / c_b при c_b > 0 (пустой — None). Возвращает список словарей:
+        vertex, x, angle_from, angle_to, ratio_from, ratio_to.
+        """
+        k = len(self.vertices)
+        rows = []
+        for i in np.flatnonzero(self.bounded):
+            if k == 1:
+                rows.append({'vertex': int(i), 'x': self.vertices[i], 'angle_from': -180.0, 'angle_to': 180.0,
+                             'ratio_from': -np.inf, 'ratio_to': np.inf})
+                continue
+            start = np.arctan2(*self.normals[i - 1][::-1])
+            stop = np.arctan2(*self.normals[i][::-1])
+            if stop < start:
+                stop += 2 * np.pi
+            # Часть конуса с c_b > 0 (углы из (0, pi)); отношение c_a / c_b = ctg(угла) убывает
+            ratio = None
+            for shift in (0.0, 2 * np.pi, -2 * np.pi):
+                lo, hi = max(start + shift, 0.0), min(stop + shift, np.pi)
+                if lo < hi:
+                    ratio = (np.inf if lo == 0.0 else np.cos(lo) / np.sin(lo),
+                             -np.inf if hi == np.pi else np.cos(hi) / np.sin(hi))
+                    break
+            rows.append({
+                'vertex': int(i),
+                'x': self.vertices[i],
+                'angle_from': float(np.degrees(start)),
+                'angle_to': float(np.degrees(stop)),
+                'ratio_from': None if ratio is None else float(ratio[1]),
+                'ratio_to': None if ratio is None else float(ratio[0]),
+            })
+        return rows
+
+if __name__ == "__main__":
+    import argparse
+
+    from .lp2d import solve_seidel
+    from .main import CONSTRAINTS, PRICES, REQUIREMENTS
+
+    parser = argparse.ArgumentParser(description="Параметрический перебор цен продуктов A и B")
+    parser.add_argument('--scenarios', type=int, default=1_000_000, help="число случайных ценовых сценариев")
+    parser.add_argument('--check', type=int, default=200, help="сколько сценариев сверить с алгоритмом Зейделя")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sweep = CostSweep(CONSTRAINTS, REQUIREMENTS)
+    print(f"Многоугольник построен за {(time.perf_counter() - started) * 1e3:.2f} мс")
+
+    print("\n--- Диапазоны оптимальности вершин ---")
+    for row in sweep.ranges():
+        x, y = row['x']
+        text = f"({x:.2f}, {y:.2f}): угол вектора цен от {row['angle_from']:.1f}° до {row['angle_to']:.1f}°"
+        if row['ratio_from'] is not None:
+            text += f", c_a / c_b ∈ [{row['ratio_from']:.3f}; {row['ratio_to']:.3f}]"
+            text += f" (при c_b = {PRICES[1]:.2f}: c_a ∈ [{row['ratio_from'] * PRICES[1]:.2f}; {row['ratio_to'] * PRICES[1]:.2f}])"
+        print(text)
+
+    rng = np.random.default_rng(args.seed)
+    prices = rng.uniform(0.1, 5.0, size=(args.scenarios, 2))
+    started = time.perf_counter()
+    result = sweep.solve(prices)
+    elapsed = time.perf_counter() - started
+    print(f"\n--- {args.scenarios} ценовых сценариев ---")
+    print(f"Время: {elapsed:.3f} с ({args.scenarios / elapsed:,.0f} сценариев/с)")
+    counts = np.bincount(result['vertex'], minlength=len(sweep.vertices))
+    for i in np.flatnonzero(counts):
+        x, y = sweep.vertices[i]
+        print(f"  ({x:.2f}, {y:.2f}) оптимальна в {counts[i] / args.scenarios:.1%} сценариев")
+
+    mismatches = 0
+    for c, fun in zip(prices[:args.check], result['fun'][:args.check]):
+        reference = solve_seidel(c, CONSTRAINTS, REQUIREMENTS)
+        if not np.isclose(reference['fun'], fun):
+            mismatches += 1
+    print(f"Сверка с алгоритмом Зейделя: {args.check} сценариев, расхождений: {mismatches}")
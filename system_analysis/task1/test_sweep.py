@@ -0,0 +1,42 @@
+"""
+Сверка пакетного решения CostSweep с алгоритмом Зейделя на векторах
+стоимости, параллельных осям и нормалям ребер (ребро оптимально целиком).
+
+    python -m pytest system_analysis/task1
+"""
+import numpy as np
+import pytest
+
+from system_analysis.task1 import lp2d, main, sweep
+
+def problems():
+    """Задача из условия, неограниченный угол, треугольник и случайные задачи."""
+    yield 'задача из условия', main.CONSTRAINTS, main.REQUIREMENTS
+    yield 'угол', np.array([[1, 0], [0, 1], [1, 1]]), np.array([0, 0, 1])
+    yield 'треугольник', np.array([[1, 0], [0, 1], [-1, -1]]), np.array([0, 0, -4])
+    rng = np.random.default_rng(0)
+    for k in range(5):
+        _, A, b = lp2d.random_problem(int(rng.integers(3, 30)), rng, feasible_point=(50.0, 50.0))
+        yield f'случайная {k}', A, b
+
+def special_costs(A):
+    """Нулевой вектор, векторы вдоль осей и вдоль нормалей ограничений (со знаком ±)."""
+    axes = np.array([[0, 0], [1, 0], [0, 1], [-1, 0], [0, -1], [2, 0], [0, 3]], dtype=float)
+    A = np.asarray(A, dtype=float)
+    return np.concatenate((axes, A, -A, 2.5 * A))
+
+@pytest.mark.parametrize('name, A, b', list(problems()), ids=[name for name, _, _ in problems()])
+def test_matches_seidel(name, A, b):
+    costs = special_costs(A)
+    result = sweep.CostSweep(A, b).solve(costs)
+    for c, unbounded, fun in zip(costs, result['unbounded'], result['fun']):
+        expected = lp2d.solve_seidel(c, A, b)
+        assert unbounded == (expected['status'] == 'unbounded'), c
+        if not unbounded:
+            assert fun == pytest.approx(expected['fun'], abs=1e-6), c
+
+def test_edge_parallel_attains_minimum():
+    result = sweep.CostSweep([[1, 0], [0, 1], [1, 1]], [0, 0, 1]).solve([[0, 1], [1, 0], [1, 1]])
+    assert not result['unbounded'].any()
+    np.testing.assert_allclose(result['fun'], [0, 0, 1])
+    np.testing.assert_allclose(result['x'], [[1, 0], [0, 1], [1, 0]])
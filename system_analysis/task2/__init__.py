@@ -0,0 +1 @@
+"""Транспортная задача."""
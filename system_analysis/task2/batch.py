@@ -0,0 +1,162 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .main import SOLVERS, balance_problem, load_npz, solve_balanced
+
+# Сценарии, загруженные в процесс-исполнитель один раз при его запуске
+_scenarios = None
+
+def load_scenarios(path):
+    """
+    Загружает пачку сценариев из .npz: costs (S, m, n), supply (S, m), demand (S, n).
+    Несжатые массивы отображаются в память, поэтому процессы пула разделяют
+    одни и те же страницы файла вместо собственных копий.
+    """
+    data = load_npz(path)
+    costs, supply, demand = data['costs'], data['supply'], data['demand']
+    if costs.ndim != 3 or supply.shape != costs.shape[:2] or demand.shape != (costs.shape[0], costs.shape[2]):
+        raise ValueError(f"Ожидались costs (S, m, n), supply (S, m), demand (S, n); получено "
+                         f"{costs.shape}, {supply.shape}, {demand.shape}")
+    return costs, supply, demand
+
+def make_scenarios(path, count, num_suppliers, num_consumers, seed=0):
+    """Генерирует случайные сценарии стоимостей и спроса вокруг общей базовой сети."""
+    rng = np.random.default_rng(seed)
+    base_costs = rng.uniform(1, 10, size=(num_suppliers, num_consumers))
+    base_demand = rng.uniform(10, 50, size=num_consumers)
+    supply = np.broadcast_to(rng.uniform(20, 60, size=num_suppliers), (count, num_suppliers))
+    costs = base_costs * rng.lognormal(0.0, 0.2, size=(count, num_suppliers, num_consumers))
+    demand = np.round(base_demand * rng.lognormal(0.0, 0.3, size=(count, num_consumers)))
+    np.savez(path, costs=costs, supply=np.round(supply), demand=demand)
+
+def _init_worker(path):
+    global _scenarios
+    _scenarios = load_scenarios(path)
+
+def _solve_chunk(start, stop, solver):
+    """Решает сценарии [start, stop) в процессе-исполнителе; план возвращается в разреженном виде."""
+    costs, supply, demand = _scenarios
+    results = []
+    for k in range(start, stop):
+        supply_b, demand_b, _ = balance_problem(supply[k], demand[k])
+        result = solve_balanced(costs[k], supply_b, demand_b, solver=solver, dense=False)
+        if result['success']:
+            rows, cols, values = result['rows'], result['cols'], result['values']
+        else:
+            rows = cols = np.empty(0, dtype=np.int64)
+            values = np.empty(0)
+        results.append({
+            'index': k,
+            'success': bool(result['success']),
+            'fun': float(result['fun']) if result['success'] else None,
+            'rows': rows.astype(np.int32),
+            'cols': cols.astype(np.int32),
+            'values': values,
+        })
+    return results
+
+def solve_batch(path, solver='potentials', workers=None, chunk_size=16):
+    """
+    Решает все сценарии файла path в пуле процессов и выдает результаты
+    по мере готовности (порядок не гарантируется). Каждый процесс загружает
+    сценарии один раз, задачи раздаются блоками по chunk_size сценариев.
+    """
+    count = len(np.load(path)['supply'])
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+        futures = [
+            pool.submit(_solve_chunk, start, min(count, start + chunk_size), solver)
+            for start in range(0, count, chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+class BatchStatistics:
+    """Накопление сводной статистики по решенным сценариям."""
+
+    def __init__(self, num_suppliers, num_consumers):
+        self.objectives = []
+        self.failures = 0
+        self.route_usage = np.zeros((num_suppliers, num_consumers), dtype=np.int64)
+        self.route_volume = np.zeros((num_suppliers, num_consumers))
+
+    def add(self, result):
+        if not result['success']:
+            self.failures += 1
+            return
+        self.objectives.append(result['fun'])
+        m, n = self.route_usage.shape
+        real = (result['rows'] < m) & (result['cols'] < n)
+        rows, cols = result['rows'][real], result['cols'][real]
+        np.add.at(self.route_usage, (rows, cols), 1)
+        np.add.at(self.route_volume, (rows, cols), result['values'][real])
+
+    def summary(self):
+        objectives = np.array(self.objectives)
+        solved = len(objectives)
+        if solved == 0:
+            return {'solved': 0, 'failed': self.failures}
+        q05, q50, q95 = np.percentile(objectives, [5, 50, 95])
+        return {
+            'solved': solved,
+            'failed': self.failures,
+            'objective_mean': float(objectives.mean()),
+            'objective_std': float(objectives.std()),
+            'objective_min': float(objectives.min()),
+            'objective_p05': float(q05),
+            'objective_median': float(q50),
+            'objective_p95': float(q95),
+            'objective_max': float(objectives.max()),
+            'mean_plan': self.route_volume / solved,
+            'route_frequency': self.route_usage / solved,
+        }
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Пакетное решение сценариев транспортной задачи")
+    parser.add_argument('scenarios', help=".npz с массивами costs (S, m, n), supply (S, m), demand (S, n)")
+    parser.add_argument('--solver', choices=SOLVERS, default='potentials')
+    parser.add_argument('--workers', type=int, default=None, help="число процессов (по умолчанию — число ядер)")
+    parser.add_argument('--chunk-size', type=int, default=16, help="сценариев в одной задаче процесса")
+    parser.add_argument('--out', help="файл JSON Lines для потоковой записи результатов")
+    parser.add_argument('--generate', nargs=3, type=int, metavar=('S', 'M', 'N'),
+                        help="сначала сгенерировать S случайных сценариев размера M x N в файл scenarios")
+    args = parser.parse_args()
+
+    if args.generate:
+        make_scenarios(args.scenarios, *args.generate)
+
+    costs_shape = np.load(args.scenarios)['costs'].shape
+    stats = BatchStatistics(costs_shape[1], costs_shape[2])
+    out = open(args.out, 'w', encoding='utf-8') if args.out else None
+
+    started = time.perf_counter()
+    for done, result in enumerate(solve_batch(args.scenarios, args.solver, args.workers, args.chunk_size), start=1):
+        stats.add(result)
+        if out:
+            record = {key: (value.tolist() if isinstance(value, np.ndarray) else value) for key, value in result.items()}
+            out.write(json.dumps(record) + "\n")
+        if done % 100 == 0:
+            elapsed = time.perf_counter() - started
+            print(f"  решено {done}/{costs_shape[0]} ({done / elapsed:.1f} задач/с)")
+    elapsed = time.perf_counter() - started
+    if out:
+        out.close()
+
+    summary = stats.summary()
+    print(f"\n--- Итоги по {costs_shape[0]} сценариям ({costs_shape[1]}x{costs_shape[2]}) ---")
+    print(f"Решено: {summary['solved']}, не решено: {summary['failed']}")
+    print(f"Время: {elapsed:.2f} с, пропускная способность: {costs_shape[0] / elapsed:.1f} задач/с")
+    if summary['solved']:
+        print(f"Стоимость: среднее {summary['objective_mean']:.2f} ± {summary['objective_std']:.2f}, "
+              f"медиана {summary['objective_median']:.2f}, "
+              f"5%–95%: [{summary['objective_p05']:.2f}; {summary['objective_p95']:.2f}]")
+        frequent = np.argsort(summary['route_frequency'], axis=None)[::-1][:5]
+        print("Чаще всего используемые маршруты:")
+        for cell in frequent:
+            i, j = np.unravel_index(cell, summary['route_frequency'].shape)
+            print(f"  {i+1}→{j+1}: в {summary['route_frequency'][i, j]:.0%} сценариев, "
+                  f"в среднем {summary['mean_plan'][i, j]:.1f} ед.")
@@ -0,0 +1,222 @@
+import time
+
+import numpy as np
+from scipy.optimize import linprog
+
+from .main import balance_problem, build_arc_constraint_matrix
+
+def distance_costs(supplier_xy, consumer_xy, cost_per_unit=1.0):
+    """
+    Ленивая функция стоимости по координатам: евклидово расстояние, умноженное
+    на cost_per_unit. Полная матрица стоимостей не строится.
+    """
+    supplier_xy = np.asarray(supplier_xy, dtype=float)
+    consumer_xy = np.asarray(consumer_xy, dtype=float)
+
+    def cost(rows, cols):
+        dx = supplier_xy[rows, 0] - consumer_xy[cols, 0]
+        dy = supplier_xy[rows, 1] - consumer_xy[cols, 1]
+        return cost_per_unit * np.hypot(dx, dy)
+
+    return cost
+
+def _top_k(values, k, axis):
+    """Индексы k наименьших элементов вдоль оси axis."""
+    k = min(k, values.shape[axis])
+    return np.argpartition(values, k - 1, axis=axis).take(np.arange(k), axis=axis)
+
+def _northwest_arcs(supply, demand):
+    """Маршруты плана северо-западного угла — гарантируют допустимость суженной задачи."""
+    a, b = supply.astype(float).copy(), demand.astype(float).copy()
+    rows, cols = [], []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        rows.append(i)
+        cols.append(j)
+        x = min(a[i], b[j])
+        a[i] -= x
+        b[j] -= x
+        if a[i] <= 0 and (b[j] > 0 or i < len(a) - 1):
+            i += 1
+        else:
+            j += 1
+    return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+
+class ColumnGeneration:
+    """
+    Транспортная задача с ленивыми стоимостями (генерация столбцов).
+
+    cost(rows, cols) — функция стоимости с семантикой broadcasting NumPy:
+    для rows формы (b, 1) и cols формы (1, n) возвращает блок b x n, для двух
+    одномерных массивов одинаковой длины — стоимости пар.
+
+    Решается суженная задача по набору маршрутов-кандидатов: k самых дешевых
+    маршрутов каждого поставщика и каждого потребителя, маршруты плана
+    северо-западного угла (для допустимости) и все маршруты фиктивного
+    участника. Затем по двойственным оценкам HiGHS блоками строк вычисляются
+    оценки остальных маршрутов, и маршруты с отрицательной оценкой добавляются,
+    пока они есть. В памяти одновременно находятся только блок оценок
+    (block_size элементов) и множество маршрутов, размер которого растет
+    пропорционально m + n.
+    """
+
+    def __init__(self, cost, supply, demand, k=10, block_size=1 << 20, add_per_row=2):
+        self.cost = cost
+        self.m0, self.n0 = len(supply), len(demand)
+        self.supply, self.demand, self.fictitious = balance_problem(np.asarray(supply), np.asarray(demand))
+        self.m, self.n = len(self.supply), len(self.demand)
+        self.k = k
+        self.block_rows = max(1, block_size // self.n0)
+        self.add_per_row = add_per_row
+        self.stats = {'rounds': 0, 'priced': 0, 'columns': 0, 'lp_time': 0.0, 'pricing_time': 0.0}
+
+    def _row_blocks(self):
+        for r0 in range(0, self.m0, self.block_rows):
+            yield np.arange(r0, min(self.m0, r0 + self.block_rows))
+
+    def _initial_arcs(self):
+        all_cols = np.arange(self.n0)
+        rows, cols = [], []
+        best_cost = np.full((0, self.n0), np.inf)
+        best_rows = np.empty((0, self.n0), dtype=np.int64)
+        for block in self._row_blocks():
+            c = self.cost(block[:, None], all_cols[None, :])
+            # k самых дешевых потребителей для каждого поставщика блока
+            top = _top_k(c, self.k, axis=1)
+            rows.append(np.repeat(block, top.shape[1]))
+            cols.append(top.ravel())
+            # Текущие k самых дешевых поставщиков для каждого потребителя
+            best_cost = np.concatenate((best_cost, c))
+            best_rows = np.concatenate((best_rows, np.broadcast_to(block[:, None], c.shape)))
+            keep = _top_k(best_cost, self.k, axis=0)
+            best_cost = np.take_along_axis(best_cost, keep, axis=0)
+            best_rows = np.take_along_axis(best_rows, keep, axis=0)
+        rows.append(best_rows.ravel())
+        cols.append(np.tile(all_cols, best_rows.shape[0]))
+
+        nw_rows, nw_cols = _northwest_arcs(self.supply, self.demand)
+        real = (nw_rows < self.m0) & (nw_cols < self.n0)
+        rows.append(nw_rows[real])
+        cols.append(nw_cols[real])
+
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        ids = np.unique(rows * self.n + cols)
+        return ids // self.n, ids % self.n
+
+    def _fictitious_arcs(self):
+        if self.fictitious == 'consumer':
+            return np.arange(self.m0), np.full(self.m0, self.n0)
+        if self.fictitious == 'supplier':
+            return np.full(self.n0, self.m0), np.arange(self.n0)
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    def _solve_restricted(self, rows, cols, costs):
+        A_eq = build_arc_constraint_matrix(rows, cols, self.m, self.n)
+        b_eq = np.concatenate([self.supply, self.demand])
+        started = time.perf_counter()
+        result = linprog(costs, A_eq=A_eq, b_eq=b_eq, bounds=(0, None), method='highs')
+        self.stats['lp_time'] += time.perf_counter() - started
+        return result
+
+    def _price(self, u, v):
+        """Оценки всех реальных маршрутов блоками строк; возвращает маршруты с отрицательной оценкой."""
+        started = time.perf_counter()
+        all_cols = np.arange(self.n0)
+        tol = 1e-9 * max(1.0, float(np.abs(u).max()), float(np.abs(v).max()))
+        new_rows, new_cols, new_costs = [], [], []
+        for block in self._row_blocks():
+            c = self.cost(block[:, None], all_cols[None, :])
+            d = c - u[block, None] - v[None, :self.n0]
+            top = _top_k(d, self.add_per_row, axis=1)
+            best = np.take_along_axis(d, top, axis=1)
+            hit = best < -tol
+            r, t = np.nonzero(hit)
+            new_rows.append(block[r])
+            new_cols.append(top[r, t])
+            new_costs.append(np.take_along_axis(c, top, axis=1)[hit])
+            self.stats['priced'] += c.size
+        self.stats['pricing_time'] += time.perf_counter() - started
+        return np.concatenate(new_rows), np.concatenate(new_cols), np.concatenate(new_costs)
+
+    def solve(self, max_rounds=100, verbose=False):
+        """
+        Решает задачу генерацией столбцов. Возвращает словарь в формате
+        solve_balanced: success, message, fun, разреженный план (rows, cols,
+        values), потенциалы u, v; плюс статистику stats.
+        """
+        rows, cols = self._initial_arcs()
+        costs = self.cost(rows, cols).astype(float)
+        fict_rows, fict_cols = self._fictitious_arcs()
+        rows = np.concatenate((rows, fict_rows))
+        cols = np.concatenate((cols, fict_cols))
+        costs = np.concatenate((costs, np.zeros(len(fict_rows))))
+
+        for round_no in range(1, max_rounds + 1):
+            result = self._solve_restricted(rows, cols, costs)
+            self.stats['rounds'] = round_no
+            self.stats['columns'] = len(rows)
+            if not result.success:
+                return {'success': False, 'message': result.message, 'fun': None, 'stats': self.stats}
+
+            u = result.eqlin.marginals[:self.m]
+            v = result.eqlin.marginals[self.m:]
+            add_rows, add_cols, add_costs = self._price(u, v)
+            if verbose:
+                print(f"  Раунд {round_no}: маршрутов {len(rows)}, стоимость {result.fun:.4f}, "
+                      f"добавлено {len(add_rows)}")
+            if len(add_rows) == 0:
+                used = result.x > 1e-9
+                return {
+                    'success': True,
+                    'message': "Оптимальный план найден: все оценки неотрицательны.",
+                    'fun': result.fun,
+                    'rows': rows[used],
+                    'cols': cols[used],
+                    'values': result.x[used],
+                    'u': u,
+                    'v': v,
+                    'stats': self.stats,
+                }
+            rows = np.concatenate((rows, add_rows))
+            cols = np.concatenate((cols, add_cols))
+            costs = np.concatenate((costs, add_costs))
+
+        return {'success': False, 'message': "Превышено число раундов генерации столбцов.",
+                'fun': result.fun, 'stats': self.stats}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Транспортная задача с ленивыми стоимостями (генерация столбцов)")
+    parser.add_argument('--suppliers', type=int, default=1000)
+    parser.add_argument('--consumers', type=int, default=1500)
+    parser.add_argument('--k', type=int, default=8, help="число дешевых маршрутов-кандидатов на узел")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='store_true', help="сверить с решением полной задачи (только для небольших сетей)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    supplier_xy = rng.uniform(0, 100, size=(args.suppliers, 2))
+    consumer_xy = rng.uniform(0, 100, size=(args.consumers, 2))
+    supply = rng.integers(10, 60, size=args.suppliers).astype(float)
+    demand = rng.integers(5, 40, size=args.consumers).astype(float)
+    cost = distance_costs(supplier_xy, consumer_xy)
+
+    print(f"--- Генерация столбцов: {args.suppliers} поставщиков x {args.consumers} потребителей ---")
+    started = time.perf_counter()
+    result = ColumnGeneration(cost, supply, demand, k=args.k).solve(verbose=True)
+    elapsed = time.perf_counter() - started
+    stats = result['stats']
+    print(f"\n{result['message']}")
+    print(f"Минимальная стоимость: {result['fun']:.4f}")
+    print(f"Раундов: {stats['rounds']}, маршрутов в суженной задаче: {stats['columns']} "
+          f"из {args.suppliers * args.consumers}")
+    print(f"Время: {elapsed:.2f} с (ЛП {stats['lp_time']:.2f} с, оценка маршрутов {stats['pricing_time']:.2f} с)")
+
+    if args.check:
+        from .main import solve_balanced
+        rows = np.arange(args.suppliers)
+        full_costs = cost(rows[:, None], np.arange(args.consumers)[None, :])
+        supply_b, demand_b, _ = balance_problem(supply, demand)
+        reference = solve_balanced(full_costs, supply_b, demand_b, solver='potentials', dense=False)
+        print(f"Полная задача: {reference['fun']:.4f}, расхождение {abs(reference['fun'] - result['fun']):.2e}")
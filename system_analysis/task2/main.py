@@ -0,0 +1,490 @@
+import zipfile
+
+import numpy as np
+
+from ..cache import ResultCache, stable_hash
+from ..instrument import add_arguments, count, echo, quiet, session_from_args, span
+from ..results import ResultLog, TransportResult, save_result
+from .potentials import TransportationSimplex
+from .sinkhorn import solve_sinkhorn
+
+SOLVERS = ('highs', 'potentials', 'sinkhorn')
+
+# Версия решателей в ключе кэша результатов: увеличивается при изменении результатов
+SOLVER_VERSION = 1
+
+# Максимальное число строк/столбцов, при котором план печатается плотной таблицей
+SMALL_INSTANCE = 30
+
+# Исходные данные задачи из условия
+EXAMPLE_SUPPLY = np.array([20, 30, 40, 20])
+EXAMPLE_DEMAND = np.array([40, 40, 20])
+EXAMPLE_COSTS = np.array([
+    [2, 3, 4],
+    [1, 2, 3],
+    [4, 1, 2],
+    [3, 1, 1]
+])
+
+def balance_problem(supply, demand):
+    """
+    Приводит задачу к сбалансированному виду.
+
+    Возвращает новые векторы предложения и спроса и тип добавленного
+    фиктивного участника: 'consumer', 'supplier' или None.
+    Матрица стоимостей при этом не копируется: фиктивной строке/столбцу
+    соответствуют нулевые стоимости, которые учитываются при сборке модели.
+    """
+    total_supply = np.sum(supply)
+    total_demand = np.sum(demand)
+
+    if total_supply > total_demand:
+        demand = np.concatenate((demand, [total_supply - total_demand]))
+        return supply, demand, 'consumer'
+    if total_demand > total_supply:
+        supply = np.concatenate((supply, [total_demand - total_supply]))
+        return supply, demand, 'supplier'
+    return supply, demand, None
+
+def build_cost_vector(costs, num_suppliers, num_consumers):
+    """
+    Разворачивает матрицу стоимостей в вектор c сбалансированной задачи.
+
+    Вектор выделяется один раз, исходная матрица записывается в его
+    левый верхний блок; фиктивные перевозки остаются с нулевой стоимостью.
+    """
+    c = np.zeros(num_suppliers * num_consumers)
+    c.reshape(num_suppliers, num_consumers)[:costs.shape[0], :costs.shape[1]] = costs
+    return c
+
+def build_arc_constraint_matrix(arc_rows, arc_cols, num_suppliers, num_consumers):
+    """
+    Строит разреженную матрицу ограничений-равенств для произвольного набора
+    маршрутов (arc_rows[k], arc_cols[k]).
+
+    Переменная-маршрут входит ровно в два ограничения: в строку поставщика
+    и в строку потребителя m + j. Поэтому матрица собирается сразу в формате
+    CSC по два ненулевых элемента на столбец.
+    """
+    from scipy.sparse import csc_array
+
+    num_vars = len(arc_rows)
+    index_dtype = np.int32 if 2 * num_vars < np.iinfo(np.int32).max else np.int64
+
+    indices = np.empty(2 * num_vars, dtype=index_dtype)
+    indices[0::2] = arc_rows
+    indices[1::2] = num_suppliers + np.asarray(arc_cols, dtype=index_dtype)
+    indptr = np.arange(0, 2 * num_vars + 1, 2, dtype=index_dtype)
+    data = np.ones(2 * num_vars)
+
+    return csc_array((data, indices, indptr), shape=(num_suppliers + num_consumers, num_vars))
+
+def build_constraint_matrix(num_suppliers, num_consumers):
+    """
+    Строит разреженную матрицу ограничений-равенств A_eq полной задачи.
+
+    Переменная x_ij (индекс i * n + j) входит в строку поставщика i и в строку
+    потребителя m + j: всего 2·m·n единиц вместо (m+n)·m·n элементов плотной
+    матрицы.
+    """
+    index_dtype = np.int32 if 2 * num_suppliers * num_consumers < np.iinfo(np.int32).max else np.int64
+    arc_rows = np.repeat(np.arange(num_suppliers, dtype=index_dtype), num_consumers)
+    arc_cols = np.tile(np.arange(num_consumers, dtype=index_dtype), num_suppliers)
+    return build_arc_constraint_matrix(arc_rows, arc_cols, num_suppliers, num_consumers)
+
+def solve_balanced(costs, supply, demand, solver='highs', start='vogel', dense=True, **options):
+    """
+    Решает сбалансированную задачу выбранным методом.
+
+    solver='highs'      — общий ЛП-решатель scipy.optimize.linprog (HiGHS);
+    solver='potentials' — собственный метод потенциалов (см. potentials.py),
+                          start задает начальный план: 'vogel' или 'northwest';
+    solver='sinkhorn'   — приближенный план энтропийной регуляризацией
+                          (см. sinkhorn.py), options передаются в solve_sinkhorn
+                          (epsilon, tol, max_iter, float32).
+
+    Возвращает словарь с флагом success, сообщением, значением целевой
+    функции fun, планом в разреженном виде (rows, cols, values — только
+    клетки с ненулевой перевозкой, не более m + n - 1) и потенциалами
+    u (поставщики) и v (потребители); оценка клетки d_ij = c_ij - u_i - v_j.
+    При dense=True добавляется плотная матрица плана x (m' x n'). Метод
+    потенциалов дополнительно возвращает базисные клетки basis. План
+    Синкхорна допустим, но не оптимален и, как правило, не разрежен: rows,
+    cols, values содержат только заметные перевозки.
+    """
+    num_suppliers, num_consumers = len(supply), len(demand)
+
+    if solver == 'highs':
+        # scipy загружается только для HiGHS: метод потенциалов и Синкхорн работают на одном NumPy
+        from scipy.optimize import linprog
+
+        with span('model'):
+            c = build_cost_vector(costs, num_suppliers, num_consumers)
+            b_eq = np.concatenate([supply, demand])
+            A_eq = build_constraint_matrix(num_suppliers, num_consumers)
+        count('lp_variables', len(c))
+        count('lp_constraints', A_eq.shape[0])
+        with span('linprog'):
+            result = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=(0, None), method='highs')
+        if not result.success:
+            return {'success': False, 'message': result.message, 'x': None, 'fun': result.fun}
+        cells = np.flatnonzero(result.x > 1e-9)
+        rows, cols = np.divmod(cells, num_consumers)
+        # Маргинальные оценки ограничений-равенств — потенциалы поставщиков и потребителей
+        marginals = result.eqlin.marginals
+        solution = {
+            'success': True,
+            'message': result.message,
+            'fun': result.fun,
+            'rows': rows,
+            'cols': cols,
+            'values': result.x[cells],
+            'u': marginals[:num_suppliers],
+            'v': marginals[num_suppliers:],
+        }
+        if dense:
+            solution['x'] = result.x.reshape((num_suppliers, num_consumers))
+        return solution
+
+    if solver == 'potentials':
+        with span('initial_plan', start=start):
+            engine = TransportationSimplex(costs, supply, demand, start=start)
+        with span('pivots'):
+            result = engine.solve()
+        count('pivots', result['pivots'])
+        if not result['success']:
+            result['x'] = None
+            return result
+        rows, cols, flows = engine.basis()
+        used = flows > 1e-9
+        result.update({
+            'rows': rows[used],
+            'cols': cols[used],
+            'values': flows[used],
+            'u': engine.u.copy(),
+            'v': engine.v.copy(),
+            'basis': (rows, cols),
+        })
+        if dense:
+            result['x'] = engine.plan()
+        return result
+
+    if solver == 'sinkhorn':
+        result = solve_sinkhorn(costs, supply, demand, **options)
+        count('sinkhorn_iterations', result['iterations'])
+        if not dense:
+            del result['x']
+        return result
+
+    raise ValueError(f"Неизвестный решатель: {solver}. Доступны: {', '.join(SOLVERS)}")
+
+# --- Ввод и вывод данных ---
+
+def load_npz(path):
+    """
+    Загружает .npz, отображая в память (mmap_mode='r') все массивы, записанные
+    без сжатия (np.savez). Сжатые массивы (np.savez_compressed) читаются целиком.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            # Локальный заголовок zip: 30 байт + имя файла + дополнительное поле
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(f.read(4), dtype='<u2')
+            f.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', shape=shape,
+                                     order='F' if fortran_order else 'C', offset=f.tell())
+    return arrays
+
+def read_csv_matrix(path, dtype=np.float64, chunk_rows=10000):
+    """Читает числовую CSV-матрицу блоками по chunk_rows строк."""
+    blocks = []
+    with open(path, encoding='utf-8') as f:
+        while True:
+            lines = [line for _, line in zip(range(chunk_rows), f)]
+            lines = [line for line in lines if line.strip()]
+            if not lines:
+                break
+            blocks.append(np.loadtxt(lines, delimiter=',', dtype=dtype, ndmin=2))
+    return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+def load_array(path):
+    """Загружает массив из .npy (с отображением в память) или из CSV."""
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    if path.endswith('.csv'):
+        return read_csv_matrix(path)
+    raise ValueError(f"Неподдерживаемый формат файла: {path} (ожидается .npy или .csv)")
+
+def load_instance(instance=None, costs=None, supply=None, demand=None):
+    """
+    Загружает задачу: либо один .npz с массивами costs, supply, demand,
+    либо три отдельных файла .npy/.csv. Стоимости могут быть float32 —
+    тип сохраняется, матрица не копируется.
+    """
+    if instance is not None:
+        data = load_npz(instance)
+        costs, supply, demand = data['costs'], data['supply'], data['demand']
+    else:
+        costs, supply, demand = load_array(costs), load_array(supply), load_array(demand)
+    return np.asarray(costs), np.ravel(supply), np.ravel(demand)
+
+def save_plan(path, result, shape):
+    """
+    Сохраняет оптимальный план в разреженном виде (COO: поставщик, потребитель,
+    объем) в .npz или в Parquet (требуется pyarrow).
+    """
+    rows = np.asarray(result['rows'], dtype=np.int64)
+    cols = np.asarray(result['cols'], dtype=np.int64)
+    values = np.asarray(result['values'], dtype=float)
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Для записи в Parquet установите pyarrow: pip install pyarrow") from None
+        table = pa.table({'supplier': rows, 'consumer': cols, 'amount': values})
+        table = table.replace_schema_metadata({
+            'shape': f"{shape[0]},{shape[1]}",
+            'total_cost': repr(float(result['fun'])),
+        })
+        pq.write_table(table, path)
+    else:
+        np.savez(path, rows=rows, cols=cols, values=values, shape=np.array(shape), fun=result['fun'])
+
+def print_plan_table(rows, cols, values, shape, num_consumers_orig, is_fictitious_consumer):
+    """Печатает план плотной таблицей (только для небольших задач)."""
+    shipping_plan = np.zeros(shape)
+    shipping_plan[rows, cols] = values
+
+    header_parts = [f"Потребитель {j+1:<2}" for j in range(num_consumers_orig)]
+    if is_fictitious_consumer:
+        header_parts.append("Фиктивный")
+
+    header = "          |" + "|".join([f"{part:^14}" for part in header_parts])
+    echo(header)
+    echo("-" * len(header))
+    for i in range(shape[0]):
+        row_str = f"Поставщик {i+1:<2} |"
+        for val in shipping_plan[i]:
+            # Используем .0f для округления до целого, abs() чтобы убрать "-0.0"
+            row_str += f" {abs(val):^13.0f}|"
+        echo(row_str)
+
+def solve_transportation_problem(supply=None, demand=None, costs=None, solver='highs',
+                                 show_table=None, output=None, cache=None, **options):
+    """
+    Решает несбалансированную транспортную задачу, приводя ее к сбалансированному виду
+    и используя метод линейного программирования (solver='highs'),
+    метод потенциалов (solver='potentials') или приближенный алгоритм
+    Синкхорна (solver='sinkhorn', параметры — в options).
+
+    Без аргументов решается задача из условия. Плотная таблица плана печатается
+    только по запросу (show_table=True, для задачи из условия — по умолчанию)
+    и только для небольших задач; output — путь для сохранения разреженного
+    плана (.npz или .parquet). cache — ResultCache: для уже решенной задачи
+    (те же данные, решатель и options) решатель не запускается.
+
+    Возвращает TransportResult (system_analysis/results.py): статус,
+    стоимость, разреженный план и потенциалы — массивами решателя, без копий.
+    """
+    # --- 1. Исходные данные ---
+    if costs is None:
+        supply, demand, costs = EXAMPLE_SUPPLY, EXAMPLE_DEMAND, EXAMPLE_COSTS
+        if show_table is None:
+            show_table = True
+
+    num_suppliers = len(supply)
+    num_consumers_orig = len(demand)
+    small = max(num_suppliers, num_consumers_orig) + 1 <= SMALL_INSTANCE
+    count('suppliers', num_suppliers)
+    count('consumers', num_consumers_orig)
+
+    echo("--- Исходные данные ---")
+    echo(f"Размер задачи: {num_suppliers} поставщиков x {num_consumers_orig} потребителей")
+    echo(f"Мощности поставщиков (A): {supply}")
+    echo(f"Мощности потребителей (B): {demand}")
+    if small:
+        echo("Матрица стоимостей (C):\n", costs)
+    echo("-" * 25)
+
+    # --- 2. Проверка и балансировка задачи ---
+    with span('balance'):
+        total_supply = np.sum(supply)
+        total_demand = np.sum(demand)
+        supply, demand, fictitious = balance_problem(supply, demand)
+
+    echo(f"Общее предложение: {total_supply}")
+    echo(f"Общий спрос: {total_demand}\n")
+    
+    is_fictitious_consumer = fictitious == 'consumer'
+    if fictitious == 'consumer':
+        echo("Задача несбалансированная (предложение > спрос).")
+        echo(f"Добавлен фиктивный потребитель со спросом: {demand[-1]}")
+        echo("Стоимости перевозок к нему равны 0.\n")
+    elif fictitious == 'supplier':
+        echo("Задача несбалансированная (спрос > предложение).")
+        echo(f"Добавлен фиктивный поставщик с предложением: {supply[-1]}\n")
+
+    num_suppliers_balanced = len(supply)
+    num_consumers_balanced = len(demand)
+
+    if small and not quiet():
+        echo("--- Сбалансированная задача ---")
+        echo(f"Новые мощности потребителей (B'): {demand}")
+        pad = ((0, num_suppliers_balanced - num_suppliers), (0, num_consumers_balanced - num_consumers_orig))
+        echo("Новая матрица стоимостей (C'):\n", np.pad(costs, pad))
+        echo("-" * 25)
+
+    # --- 3. Решение ---
+    if solver == 'potentials':
+        echo("Решение задачи методом потенциалов...")
+    elif solver == 'sinkhorn':
+        echo("Приближенное решение алгоритмом Синкхорна...")
+    else:
+        echo("Решение задачи методом линейного программирования...")
+    with span('solve', solver=solver):
+        if cache is None:
+            result = solve_balanced(costs, supply, demand, solver=solver, dense=False, **options)
+        else:
+            key = stable_hash('transport', SOLVER_VERSION, solver, costs, supply, demand, options)
+            result = cache.get_or_compute(
+                key, lambda: solve_balanced(costs, supply, demand, solver=solver, dense=False, **options))
+
+    # --- 4. Вывод результатов ---
+    if result['success']:
+        rows, cols, values = result['rows'], result['cols'], result['values']
+        total_cost = result['fun']
+        shape = (num_suppliers_balanced, num_consumers_balanced)
+        count('plan_cells', len(rows))
+
+        # В тихом режиме отчет не форматируется вовсе
+        if not quiet():
+            with span('report'):
+                echo("\n--- РЕЗУЛЬТАТЫ ---")
+                if show_table and small:
+                    echo("\nОптимальный план перевозок (матрица X):")
+                    print_plan_table(rows, cols, values, shape, num_consumers_orig, is_fictitious_consumer)
+                elif show_table:
+                    echo(f"\nТаблица плана не печатается для задач больше {SMALL_INSTANCE}x{SMALL_INSTANCE}.")
+
+                # Интерпретация по ненулевым клеткам плана (не более m + n - 1 строк)
+                order = np.lexsort((cols, rows))
+                limit = len(order) if small else 20
+                echo("\n\nИнтерпретация:")
+                for i, j, amount in zip(rows[order[:limit]], cols[order[:limit]], values[order[:limit]]):
+                    if is_fictitious_consumer and j == num_consumers_balanced - 1:
+                        echo(f"  - У поставщика {i+1} на складе остается {amount:.0f} ед. товара.")
+                    else:
+                        echo(f"  - От поставщика {i+1} к потребителю {j+1} везти {amount:.0f} ед.")
+                if len(order) > limit:
+                    echo(f"  ... и еще {len(order) - limit} перевозок")
+
+        if output:
+            with span('save'):
+                save_plan(output, result, shape)
+            echo(f"\n💾 Разреженный план ({len(rows)} перевозок) сохранен в '{output}'")
+
+        if solver == 'sinkhorn':
+            echo(f"\n≈ Стоимость приближенного плана: {total_cost:.2f} "
+                 f"({result['iterations']} итераций, {result['message']})")
+        else:
+            echo(f"\n✅ Минимальная общая стоимость перевозок: {total_cost:.2f}")
+    else:
+        echo("\n❌ Не удалось найти оптимальное решение.")
+        echo(f"Статус: {result['message']}")
+
+    return TransportResult(
+        success=result['success'], message=str(result['message']), fun=result['fun'], solver=solver,
+        fictitious=fictitious, num_suppliers=num_suppliers_balanced, num_consumers=num_consumers_balanced,
+        iterations=result.get('pivots', result.get('iterations')),
+        **{name: result.get(name) for name in TransportResult.ARRAYS},
+    )
+
+def compare_solvers(num_instances=50, max_size=40, seed=0):
+    """
+    Сверяет метод потенциалов с linprog на случайных несбалансированных задачах.
+    Проверяет совпадение стоимости и допустимость плана, возвращает число
+    расхождений.
+    """
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for k in range(num_instances):
+        m, n = rng.integers(1, max_size + 1, size=2)
+        costs = rng.integers(0, 100, size=(m, n))
+        supply, demand, _ = balance_problem(rng.integers(1, 50, size=m), rng.integers(1, 50, size=n))
+
+        reference = solve_balanced(costs, supply, demand, solver='highs')
+        for start in ('vogel', 'northwest'):
+            result = solve_balanced(costs, supply, demand, solver='potentials', start=start)
+            plan = result['x']
+            ok = (
+                result['success']
+                and np.isclose(result['fun'], reference['fun'])
+                and np.allclose(plan.sum(axis=1), supply)
+                and np.allclose(plan.sum(axis=0), demand)
+                and plan.min() >= -1e-9
+            )
+            if not ok:
+                mismatches += 1
+                echo(f"❌ Задача {k} ({m}x{n}, {start}): {result['fun']} != {reference['fun']}")
+
+    echo(f"Проверено задач: {num_instances}, расхождений: {mismatches}")
+    return mismatches
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Транспортная задача")
+    parser.add_argument('--solver', choices=SOLVERS, default='highs', help="метод решения")
+    parser.add_argument('--check', action='store_true', help="сверить метод потенциалов с linprog на случайных задачах")
+    parser.add_argument('--instance', help=".npz с массивами costs, supply, demand")
+    parser.add_argument('--costs', help="матрица стоимостей .npy/.csv")
+    parser.add_argument('--supply', help="мощности поставщиков .npy/.csv")
+    parser.add_argument('--demand', help="мощности потребителей .npy/.csv")
+    parser.add_argument('--output', help="сохранить разреженный план в .npz или .parquet")
+    parser.add_argument('--table', action='store_true', help="напечатать план плотной таблицей (небольшие задачи)")
+    parser.add_argument('--epsilon', type=float, default=1e-3, help="регуляризация для --solver sinkhorn")
+    parser.add_argument('--tol', type=float, default=1e-4, help="точность маргиналов для --solver sinkhorn")
+    parser.add_argument('--float32', action='store_true', help="вычисления Синкхорна в float32")
+    parser.add_argument('--cache', help="каталог кэша результатов (.npz)")
+    parser.add_argument('--cache-size', type=float, default=256, help="предельный размер кэша на диске, МБ")
+    parser.add_argument('--result', help="сохранить объект результата в .npz или .arrow")
+    parser.add_argument('--log', help="дописать результат в журнал результатов (ResultLog)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    options = {'epsilon': args.epsilon, 'tol': args.tol, 'float32': args.float32} if args.solver == 'sinkhorn' else {}
+    cache = ResultCache(args.cache, max_bytes=args.cache_size * 2**20) if args.cache else None
+
+    if args.check:
+        raise SystemExit(1 if compare_solvers() else 0)
+
+    if args.costs and not args.instance and not (args.supply and args.demand):
+        parser.error("вместе с --costs нужны --supply и --demand")
+    with session_from_args(args, name='task2'):
+        if args.instance or args.costs:
+            with span('input'):
+                costs, supply, demand = load_instance(args.instance, args.costs, args.supply, args.demand)
+            result = solve_transportation_problem(supply, demand, costs, solver=args.solver, show_table=args.table,
+                                                  output=args.output, cache=cache, **options)
+        else:
+            result = solve_transportation_problem(solver=args.solver, output=args.output, cache=cache, **options)
+        with span('save'):
+            if args.result:
+                save_result(args.result, result)
+            if args.log:
+                ResultLog(args.log).append(result)
+        if cache is not None:
+            for name, value in cache.stats().items():
+                count(f"cache_{name}", value)
+            echo(f"\n{cache.summary()}")
@@ -0,0 +1,432 @@
+import numpy as np
+
+class TransportationSimplex:
+    """
+    Метод потенциалов (MODI) для сбалансированной транспортной задачи.
+
+    Базисный план хранится как остовное дерево двудольного графа
+    «поставщики — потребители»: ровно m + n - 1 базисных клеток (включая
+    вырожденные нулевые). Узлы 0..m-1 — поставщики, узлы m..m+n-1 —
+    потребители. Потенциалы u, v пересчитываются только для поддерева,
+    которое «переподвешивается» при замене базиса, а оценки свободных клеток
+    считаются блоками строк (частичный выбор входящей клетки), поэтому
+    плотная матрица оценок целиком никогда не строится.
+    """
+
+    def __init__(self, costs, supply, demand, start='vogel'):
+        supply = np.asarray(supply, dtype=float)
+        demand = np.asarray(demand, dtype=float)
+        costs = np.asarray(costs)
+        self.m = len(supply)
+        self.n = len(demand)
+
+        # Фиктивная строка/столбец (если задача была сбалансирована) имеют нулевую стоимость
+        # float32 стоимости не расширяются до float64: оценки считаются блоками в float64
+        dtype = costs.dtype if costs.dtype in (np.float32, np.float64) else np.float64
+        if costs.shape == (self.m, self.n):
+            self.costs = np.asarray(costs, dtype=dtype)
+            self._owns_costs = self.costs is not costs
+        else:
+            self.costs = np.zeros((self.m, self.n), dtype=dtype)
+            self.costs[:costs.shape[0], :costs.shape[1]] = costs
+            self._owns_costs = True
+
+        self.supply = supply
+        self.demand = demand
+        self.start = start
+        self.eps = 1e-9 * max(1.0, float(np.abs(self.costs).max(initial=0.0)))
+        self.pivots = 0
+
+        block_count = max(1, int(np.sqrt(self.m)))
+        self.block_rows = -(-self.m // block_count)
+        self._next_block = 0
+
+    # --- Начальный опорный план ---
+
+    def _northwest_corner(self):
+        a = self.supply.copy()
+        b = self.demand.copy()
+        rows, cols, flows = [], [], []
+        i = j = 0
+        while i < self.m and j < self.n:
+            x = min(a[i], b[j])
+            rows.append(i)
+            cols.append(j)
+            flows.append(x)
+            a[i] -= x
+            b[j] -= x
+            if a[i] <= self.eps and (b[j] > self.eps or i < self.m - 1):
+                i += 1
+            else:
+                j += 1
+        return rows, cols, flows
+
+    @staticmethod
+    def _advance(order, ptr, alive, lines):
+        """Сдвигает указатели ptr[lines] до первого живого элемента в order."""
+        width = order.shape[1]
+        while lines.size:
+            cur = ptr[lines]
+            lines = lines[cur < width]
+            cur = ptr[lines]
+            lines = lines[~alive[order[lines, cur]]]
+            ptr[lines] += 1
+
+    def _penalties(self, order, cost_lines, p1, p2, alive_lines):
+        """Штрафы Фогеля: разность двух наименьших стоимостей в живой строке/столбце."""
+        width = order.shape[1]
+        penalty = np.full(len(p1), -np.inf)
+        idx = np.flatnonzero(alive_lines)
+        first = order[idx, np.minimum(p1[idx], width - 1)]
+        has_second = p2[idx] < width
+        second = order[idx, np.minimum(p2[idx], width - 1)]
+        c1 = cost_lines(idx, first)
+        c2 = cost_lines(idx, second)
+        penalty[idx] = np.where(has_second, c2 - c1, 0.0)
+        return penalty
+
+    def _vogel(self):
+        C = self.costs
+        m, n = self.m, self.n
+        a = self.supply.copy()
+        b = self.demand.copy()
+
+        # Порядок клеток по возрастанию стоимости в каждой строке и в каждом столбце
+        row_order = np.argsort(C, axis=1, kind='stable')
+        col_order = np.argsort(C, axis=0, kind='stable').T
+        row_alive = np.ones(m, dtype=bool)
+        col_alive = np.ones(n, dtype=bool)
+        rp1, rp2 = np.zeros(m, dtype=np.int64), np.ones(m, dtype=np.int64)
+        cp1, cp2 = np.zeros(n, dtype=np.int64), np.ones(n, dtype=np.int64)
+
+        row_cost = lambda r, c: C[r, c]
+        col_cost = lambda c, r: C[r, c]
+
+        rows, cols, flows = [], [], []
+        rows_left, cols_left = m, n
+        while rows_left and cols_left:
+            pr = self._penalties(row_order, row_cost, rp1, rp2, row_alive)
+            pc = self._penalties(col_order, col_cost, cp1, cp2, col_alive)
+            r_best = int(np.argmax(pr))
+            c_best = int(np.argmax(pc))
+            if pr[r_best] >= pc[c_best]:
+                i, j = r_best, int(row_order[r_best, rp1[r_best]])
+            else:
+                i, j = int(col_order[c_best, cp1[c_best]]), c_best
+
+            x = min(a[i], b[j])
+            rows.append(i)
+            cols.append(j)
+            flows.append(x)
+            a[i] -= x
+            b[j] -= x
+
+            # Вычеркиваем ровно одну линию, чтобы план остался деревом из m + n - 1 клеток
+            if a[i] <= self.eps and (b[j] > self.eps or rows_left > 1):
+                row_alive[i] = False
+                rows_left -= 1
+                order, p1, p2, alive, killed = col_order, cp1, cp2, row_alive, i
+                lines = np.flatnonzero(col_alive)
+            else:
+                col_alive[j] = False
+                cols_left -= 1
+                order, p1, p2, alive, killed = row_order, rp1, rp2, col_alive, j
+                lines = np.flatnonzero(row_alive)
+
+            width = order.shape[1]
+            hit1 = order[lines, np.minimum(p1[lines], width - 1)] == killed
+            hit2 = order[lines, np.minimum(p2[lines], width - 1)] == killed
+            touched = lines[hit1 | hit2]
+            self._advance(order, p1, alive, touched)
+            np.maximum(p2, p1 + 1, out=p2)
+            self._advance(order, p2, alive, touched)
+
+        return rows, cols, flows
+
+    # --- Дерево базиса и потенциалы ---
+
+    def _build_tree(self, rows, cols, flows):
+        size = self.m + self.n
+        self._rows = list(rows)
+        self._cols = list(cols)
+        self._flow = [float(x) for x in flows]
+        self._adj = [[] for _ in range(size)]
+        for e, (i, j) in enumerate(zip(self._rows, self._cols)):
+            self._adj[i].append(e)
+            self._adj[self.m + j].append(e)
+
+        self._pot = np.zeros(size)
+        self._parent = [-1] * size
+        self._parent_edge = [-1] * size
+        self._depth = [0] * size
+        self._hang(0, -1, -1)
+
+    def _hang(self, root, parent, parent_edge):
+        """Обходит поддерево от root, записывая родителей, глубины и потенциалы."""
+        m = self.m
+        C = self.costs
+        pot, par, par_edge, depth = self._pot, self._parent, self._parent_edge, self._depth
+        rows, cols, adj = self._rows, self._cols, self._adj
+
+        par[root] = parent
+        par_edge[root] = parent_edge
+        depth[root] = depth[parent] + 1 if parent >= 0 else 0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for e in adj[node]:
+                if e == par_edge[node]:
+                    continue
+                other = m + cols[e] if node < m else rows[e]
+                pot[other] = float(C[rows[e], cols[e]]) - pot[node]
+                par[other] = node
+                par_edge[other] = e
+                depth[other] = depth[node] + 1
+                stack.append(other)
+
+    @property
+    def u(self):
+        return self._pot[:self.m]
+
+    @property
+    def v(self):
+        return self._pot[self.m:]
+
+    # --- Итерации метода потенциалов ---
+
+    def _reduced_costs(self, r0, r1):
+        return self.costs[r0:r1] - self.u[r0:r1, None] - self.v[None, :]
+
+    def _price(self):
+        """Ищет входящую клетку с отрицательной оценкой, просматривая строки блоками по кругу."""
+        blocks = -(-self.m // self.block_rows)
+        for step in range(blocks):
+            b = (self._next_block + step) % blocks
+            r0 = b * self.block_rows
+            r1 = min(self.m, r0 + self.block_rows)
+            d = self._reduced_costs(r0, r1)
+            k = int(np.argmin(d))
+            i, j = divmod(k, self.n)
+            if d[i, j] < -self.eps:
+                self._next_block = b
+                return r0 + i, j
+        return None
+
+    def _pivot(self, i, j):
+        m = self.m
+        par, par_edge, depth = self._parent, self._parent_edge, self._depth
+
+        # Цикл пересчета: путь в дереве от поставщика i до потребителя j
+        x, y = i, m + j
+        path_x, path_y = [], []
+        while depth[x] > depth[y]:
+            path_x.append(par_edge[x])
+            x = par[x]
+        while depth[y] > depth[x]:
+            path_y.append(par_edge[y])
+            y = par[y]
+        while x != y:
+            path_x.append(par_edge[x])
+            x = par[x]
+            path_y.append(par_edge[y])
+            y = par[y]
+        path = path_x + path_y[::-1]
+
+        flow = self._flow
+        minus = path[0::2]
+        pos = min(range(len(minus)), key=lambda k: flow[minus[k]])
+        leaving = minus[pos]
+        theta = flow[leaving]
+        for e in minus:
+            flow[e] -= theta
+        for e in path[1::2]:
+            flow[e] += theta
+
+        # Поддерево, отрезаемое уходящей клеткой, содержит конец входящей клетки
+        if 2 * pos < len(path_x):
+            inner, outer = i, m + j
+        else:
+            inner, outer = m + j, i
+
+        old_i, old_j = self._rows[leaving], self._cols[leaving]
+        self._adj[old_i].remove(leaving)
+        self._adj[m + old_j].remove(leaving)
+        self._rows[leaving] = i
+        self._cols[leaving] = j
+        flow[leaving] = theta
+        self._adj[i].append(leaving)
+        self._adj[m + j].append(leaving)
+
+        # Отрезанное поддерево подвешивается к дереву через входящую клетку
+        self._pot[inner] = float(self.costs[i, j]) - self._pot[outer]
+        self._hang(inner, outer, leaving)
+        self.pivots += 1
+
+    def solve(self, max_iter=None):
+        """
+        Строит начальный план и улучшает его до оптимального.
+        Возвращает словарь с планом в виде разреженных массивов и статусом.
+        """
+        if self.start == 'northwest':
+            rows, cols, flows = self._northwest_corner()
+        elif self.start == 'vogel':
+            rows, cols, flows = self._vogel()
+        else:
+            raise ValueError(f"Неизвестный метод начального плана: {self.start}")
+        self._build_tree(rows, cols, flows)
+        return self.optimize(max_iter)
+
+    def optimize(self, max_iter=None):
+        """Итерации метода потенциалов от текущего базиса до оптимума."""
+        if max_iter is None:
+            max_iter = 50 * (self.m + self.n) + 1000
+        start_pivots = self.pivots
+        success = False
+        while self.pivots - start_pivots < max_iter:
+            entering = self._price()
+            if entering is None:
+                success = True
+                break
+            self._pivot(*entering)
+
+        return {
+            'success': success,
+            'message': "Оптимальный план найден." if success else "Превышено число итераций.",
+            'fun': self.objective,
+            'pivots': self.pivots - start_pivots,
+        }
+
+    # --- Повторное решение от текущего базиса ---
+
+    def _compute_flows(self):
+        """Пересчитывает объемы базисных перевозок по дереву для текущих supply/demand."""
+        m = self.m
+        par, par_edge, adj = self._parent, self._parent_edge, self._adj
+        rows, cols = self._rows, self._cols
+
+        order = [0]
+        for node in order:
+            for e in adj[node]:
+                if e != par_edge[node]:
+                    order.append(m + cols[e] if node < m else rows[e])
+
+        residual = np.concatenate((self.supply, self.demand)).tolist()
+        for node in reversed(order[1:]):
+            self._flow[par_edge[node]] = residual[node]
+            residual[par[node]] -= residual[node]
+
+    def _subtree(self, root):
+        nodes = [root]
+        for node in nodes:
+            for e in self._adj[node]:
+                if e != self._parent_edge[node]:
+                    nodes.append(self.m + self._cols[e] if node < self.m else self._rows[e])
+        return nodes
+
+    def _dual_pivot(self, leaving):
+        """
+        Шаг двойственного метода: выводит из базиса клетку с отрицательной
+        перевозкой, сохраняя неотрицательность оценок.
+        """
+        m = self.m
+        r, c = self._rows[leaving], self._cols[leaving]
+        child = r if self._parent_edge[r] == leaving else m + c
+
+        in_subtree = np.zeros(m + self.n, dtype=bool)
+        in_subtree[self._subtree(child)] = True
+        # Компонента A (с поставщиком r) недополучает груз: он должен прийти
+        # от поставщиков из компоненты B к потребителям из компоненты A
+        in_a = in_subtree if child == r else ~in_subtree
+        rows_b = np.flatnonzero(~in_a[:m])
+        cols_a = np.flatnonzero(in_a[m:])
+        if rows_b.size == 0 or cols_a.size == 0:
+            return False
+
+        d = self.costs[np.ix_(rows_b, cols_a)] - self.u[rows_b, None] - self.v[None, cols_a]
+        k = int(np.argmin(d))
+        i, j = int(rows_b[k // cols_a.size]), int(cols_a[k % cols_a.size])
+
+        self._adj[r].remove(leaving)
+        self._adj[m + c].remove(leaving)
+        self._rows[leaving] = i
+        self._cols[leaving] = j
+        self._adj[i].append(leaving)
+        self._adj[m + j].append(leaving)
+
+        inner, outer = (i, m + j) if in_subtree[i] else (m + j, i)
+        self._pot[inner] = self.costs[i, j] - self._pot[outer]
+        self._hang(inner, outer, leaving)
+        self._compute_flows()
+        self.pivots += 1
+        return True
+
+    def _restore_feasibility(self, max_iter):
+        """Двойственный симплекс-метод: устраняет отрицательные перевозки в базисе."""
+        for _ in range(max_iter):
+            flow = np.array(self._flow)
+            leaving = int(np.argmin(flow))
+            if flow[leaving] >= -self.eps:
+                return True
+            if not self._dual_pivot(leaving):
+                return False
+        return False
+
+    def resolve(self, cost_cells=None, cost_values=None, supply=None, demand=None, max_iter=None):
+        """
+        Переоптимизирует план после изменения данных, начиная с текущего базиса.
+
+        cost_cells — пара массивов (строки, столбцы) измененных клеток, cost_values —
+        их новые стоимости; supply/demand — новые сбалансированные векторы той же
+        длины. Сначала при старых стоимостях двойственным методом восстанавливается
+        допустимость плана (базис остается двойственно допустимым), затем
+        применяются новые стоимости и выполняются обычные итерации метода
+        потенциалов. Число итераций обоих этапов суммируется в 'pivots'.
+        """
+        if max_iter is None:
+            max_iter = 50 * (self.m + self.n) + 1000
+        start_pivots = self.pivots
+
+        if supply is not None or demand is not None:
+            if supply is not None:
+                self.supply = np.asarray(supply, dtype=float)
+            if demand is not None:
+                self.demand = np.asarray(demand, dtype=float)
+            self._compute_flows()
+            if not self._restore_feasibility(max_iter):
+                return {
+                    'success': False,
+                    'message': "Не удалось восстановить допустимость плана.",
+                    'fun': self.objective,
+                    'pivots': self.pivots - start_pivots,
+                }
+
+        if cost_cells is not None:
+            if not self._owns_costs:
+                self.costs = self.costs.copy()
+                self._owns_costs = True
+            self.costs[cost_cells] = cost_values
+            self.eps = 1e-9 * max(1.0, float(np.abs(self.costs).max(initial=0.0)))
+            self._pot[0] = 0.0
+            self._hang(0, -1, -1)
+
+        result = self.optimize(max_iter)
+        result['pivots'] = self.pivots - start_pivots
+        return result
+
+    # --- Результат ---
+
+    @property
+    def objective(self):
+        rows, cols, flow = self.basis()
+        return float(np.dot(self.costs[rows, cols].astype(float), flow))
+
+    def basis(self):
+        """Базисные клетки (строки, столбцы) и объемы перевозок по ним."""
+        return np.array(self._rows), np.array(self._cols), np.array(self._flow)
+
+    def plan(self):
+        """Плотная матрица плана перевозок m x n."""
+        rows, cols, flow = self.basis()
+        plan = np.zeros((self.m, self.n))
+        plan[rows, cols] = flow
+        return plan
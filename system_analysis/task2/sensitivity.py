@@ -0,0 +1,343 @@
+import numpy as np
+
+from .main import balance_problem, solve_balanced
+
+class SensitivityAnalysis:
+    """
+    Ответы на вопросы «что если» по оптимальному плану без повторного решения.
+
+    Используются потенциалы u, v (маргинальные оценки HiGHS или потенциалы
+    метода потенциалов) и оптимальный базис — остовное дерево из m + n - 1
+    клеток. Если базис не передан, он восстанавливается по плану: сначала
+    клетки с положительной перевозкой, затем клетки с нулевой оценкой. При
+    вырожденных оценках HiGHS клеток с нулевой оценкой может не хватить на
+    остовное дерево; тогда задача решается заново методом потенциалов, и
+    берутся его план, потенциалы и базис.
+
+    - Стоимость свободной клетки: план не меняется, пока c_ij >= u_i + v_j (O(1)).
+    - Стоимость базисной клетки: допустимый диапазон определяется разрезом
+      дерева по этой клетке; считается один раз и кэшируется.
+    - Мощность поставщика/потребителя: изменение компенсируется фиктивным
+      участником, цена единицы — разность/сумма потенциалов, диапазон —
+      по перевозкам на пути в дереве (O(m + n), кэшируется).
+
+    Если запрос выходит за диапазон устойчивости базиса, задача решается
+    заново (resolve=True) тем же решателем.
+    """
+
+    def __init__(self, costs, supply, demand, result, solver='highs'):
+        self.costs = np.asarray(costs)
+        self.supply = np.asarray(supply, dtype=float)
+        self.demand = np.asarray(demand, dtype=float)
+        self.solver = solver
+        self.m, self.n = len(self.supply), len(self.demand)
+        self.m0, self.n0 = self.costs.shape
+        self.u = np.asarray(result['u'], dtype=float)
+        self.v = np.asarray(result['v'], dtype=float)
+        self.objective = float(result['fun'])
+        self.tol = 1e-9 * max(1.0, float(np.abs(self.costs).max(initial=0.0)))
+
+        if self.n > self.n0:
+            self.fictitious, self.fictitious_node = 'consumer', self.m + self.n0
+        elif self.m > self.m0:
+            self.fictitious, self.fictitious_node = 'supplier', self.m0
+        else:
+            self.fictitious, self.fictitious_node = None, None
+
+        plan_rows = np.asarray(result['rows'], dtype=np.int64)
+        plan_cols = np.asarray(result['cols'], dtype=np.int64)
+        basis = result.get('basis')
+        if basis is None:
+            basis = self._basis_from_plan(plan_rows, plan_cols)
+        if basis is None:
+            result = solve_balanced(self.costs, self.supply, self.demand, solver='potentials', dense=False)
+            self.u, self.v = result['u'], result['v']
+            self.objective = float(result['fun'])
+            plan_rows, plan_cols = result['rows'], result['cols']
+            basis = result['basis']
+        rows, cols = (np.asarray(a, dtype=np.int64) for a in basis)
+
+        # Перевозки по базисным клеткам берутся из разреженного плана (нулевые — вырожденные)
+        flows = np.zeros(len(rows))
+        plan_ids = plan_rows * self.n + plan_cols
+        basis_ids = rows * self.n + cols
+        order = np.argsort(plan_ids)
+        pos = np.minimum(np.searchsorted(plan_ids, basis_ids, sorter=order), max(len(order) - 1, 0))
+        if len(order):
+            found = plan_ids[order[pos]] == basis_ids
+            flows[found] = np.asarray(result['values'], dtype=float)[order[pos[found]]]
+        self._build_tree(rows, cols, flows)
+
+        self._cost_range_cache = {}
+        self._rhs_cache = {}
+
+    # --- Базис ---
+
+    def cost_block(self, rows, cols):
+        """Стоимости клеток rows x cols сбалансированной задачи (фиктивные — 0)."""
+        rows, cols = np.asarray(rows), np.asarray(cols)
+        block = np.zeros((len(rows), len(cols)))
+        rm, cm = rows < self.m0, cols < self.n0
+        block[np.ix_(rm, cm)] = self.costs[np.ix_(rows[rm], cols[cm])]
+        return block
+
+    def _cost(self, rows, cols):
+        rows, cols = np.asarray(rows), np.asarray(cols)
+        real = (rows < self.m0) & (cols < self.n0)
+        return np.where(real, self.costs[np.minimum(rows, self.m0 - 1), np.minimum(cols, self.n0 - 1)], 0.0)
+
+    def _basis_from_plan(self, pos_r, pos_c):
+        """
+        Достраивает клетки с положительной перевозкой до остовного дерева
+        клетками с нулевой оценкой; None, если таких клеток не хватило.
+        """
+        parent = list(range(self.m + self.n))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        rows, cols = [], []
+        candidates = [(pos_r, pos_c)]
+        block = max(1, 1_000_000 // self.n)
+        for r0 in range(0, self.m, block):
+            r = np.arange(r0, min(self.m, r0 + block))
+            d = self.cost_block(r, np.arange(self.n)) - self.u[r, None] - self.v[None, :]
+            zr, zc = np.nonzero(np.abs(d) <= 100 * self.tol)
+            candidates.append((r[zr], zc))
+
+        for cand_r, cand_c in candidates:
+            for i, j in zip(cand_r.tolist(), cand_c.tolist()):
+                a, b = find(i), find(self.m + j)
+                if a != b:
+                    parent[a] = b
+                    rows.append(i)
+                    cols.append(j)
+                    if len(rows) == self.m + self.n - 1:
+                        return np.array(rows), np.array(cols)
+        return None
+
+    def _build_tree(self, rows, cols, flows):
+        m = self.m
+        size = m + self.n
+        self.basis_rows, self.basis_cols = rows, cols
+        self.flows = np.asarray(flows, dtype=float)
+        self._basis_ids = rows * self.n + cols
+        self._basis_order = np.argsort(self._basis_ids)
+
+        adj = [[] for _ in range(size)]
+        for e, (i, j) in enumerate(zip(rows.tolist(), cols.tolist())):
+            adj[i].append(e)
+            adj[m + j].append(e)
+        self._adj = adj
+
+        parent = [-1] * size
+        parent_edge = [-1] * size
+        order = [0]
+        for node in order:
+            for e in adj[node]:
+                if e != parent_edge[node]:
+                    other = m + int(cols[e]) if node < m else int(rows[e])
+                    parent[other] = node
+                    parent_edge[other] = e
+                    order.append(other)
+        self._parent, self._parent_edge, self._order = parent, parent_edge, order
+
+    def basic_edge(self, rows, cols):
+        """Номер базисной клетки для каждой пары (rows, cols) или -1 для свободных."""
+        ids = np.asarray(rows, dtype=np.int64) * self.n + np.asarray(cols, dtype=np.int64)
+        pos = np.searchsorted(self._basis_ids, ids, sorter=self._basis_order)
+        pos = np.minimum(pos, len(self._basis_ids) - 1)
+        edge = self._basis_order[pos]
+        return np.where(self._basis_ids[edge] == ids, edge, -1)
+
+    def _subtree_mask(self, root):
+        mask = np.zeros(self.m + self.n, dtype=bool)
+        nodes = [root]
+        for node in nodes:
+            for e in self._adj[node]:
+                if e != self._parent_edge[node]:
+                    nodes.append(self.m + int(self.basis_cols[e]) if node < self.m else int(self.basis_rows[e]))
+        mask[nodes] = True
+        return mask
+
+    # --- Диапазоны ---
+
+    def cost_range(self, edge):
+        """
+        Допустимое изменение стоимости базисной клетки (delta_min, delta_max),
+        при котором базис остается оптимальным.
+        """
+        if edge in self._cost_range_cache:
+            return self._cost_range_cache[edge]
+        i, j = int(self.basis_rows[edge]), int(self.basis_cols[edge])
+        child = i if self._parent_edge[i] == edge else self.m + j
+        in_a = self._subtree_mask(child)
+        if child != i:
+            in_a = ~in_a
+
+        def min_reduced(rows, cols):
+            if rows.size == 0 or cols.size == 0:
+                return np.inf
+            d = self.cost_block(rows, cols) - self.u[rows, None] - self.v[None, cols]
+            d[(rows == i)[:, None] & (cols == j)[None, :]] = np.inf
+            return float(d.min())
+
+        rows_a, rows_b = np.flatnonzero(in_a[:self.m]), np.flatnonzero(~in_a[:self.m])
+        cols_a, cols_b = np.flatnonzero(in_a[self.m:]), np.flatnonzero(~in_a[self.m:])
+        bounds = (-min_reduced(rows_b, cols_a), min_reduced(rows_a, cols_b))
+        self._cost_range_cache[edge] = bounds
+        return bounds
+
+    def _tree_flows(self, residual):
+        """Перевозки по базисным клеткам для вектора балансов узлов residual."""
+        residual = list(residual)
+        flows = np.zeros(len(self.flows))
+        for node in reversed(self._order[1:]):
+            flows[self._parent_edge[node]] = residual[node]
+            residual[self._parent[node]] -= residual[node]
+        return flows
+
+    def rhs_range(self, node):
+        """
+        Цена единицы и допустимый диапазон (price, delta_min, delta_max) изменения
+        мощности узла node (0..m-1 — поставщики, m..m+n-1 — потребители),
+        компенсируемого фиктивным участником.
+        """
+        if node in self._rhs_cache:
+            return self._rhs_cache[node]
+        f = self.fictitious_node
+        potentials = np.concatenate((self.u, self.v))
+        # +1 к мощности узла; фиктивный участник забирает излишек/покрывает нехватку
+        same_side = (node < self.m) == (f < self.m)
+        residual = np.zeros(self.m + self.n)
+        residual[node] += 1.0
+        residual[f] += -1.0 if same_side else 1.0
+        price = potentials[node] + (-potentials[f] if same_side else potentials[f])
+
+        change = self._tree_flows(residual)
+        dec, inc = change < -1e-12, change > 1e-12
+        delta_max = np.min(self.flows[dec] / -change[dec], initial=np.inf)
+        delta_min = -np.min(self.flows[inc] / change[inc], initial=np.inf)
+
+        amount = self.supply[f] if f < self.m else self.demand[f - self.m]
+        if same_side:
+            delta_max = min(delta_max, amount)
+        else:
+            delta_min = max(delta_min, -amount)
+
+        self._rhs_cache[node] = (price, delta_min, delta_max)
+        return self._rhs_cache[node]
+
+    # --- Запросы ---
+
+    def cost_queries(self, rows, cols, new_costs, resolve=True):
+        """
+        Пакет вопросов «что если маршрут i→j будет стоить X».
+        Возвращает словарь массивов: objective — новая минимальная стоимость,
+        in_range — остался ли базис оптимальным (иначе значение получено
+        повторным решением или равно nan при resolve=False).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        new_costs = np.asarray(new_costs, dtype=float)
+        old_costs = self._cost(rows, cols)
+        edge = self.basic_edge(rows, cols)
+        basic = edge >= 0
+
+        # Свободная клетка: план не меняется, пока оценка неотрицательна
+        in_range = new_costs - self.u[rows] - self.v[cols] >= -self.tol
+        objective = np.full(len(rows), self.objective)
+
+        delta = new_costs - old_costs
+        for e in np.unique(edge[basic]):
+            lo, hi = self.cost_range(int(e))
+            sel = edge == e
+            in_range[sel] = (delta[sel] >= lo - self.tol) & (delta[sel] <= hi + self.tol)
+            objective[sel] += self.flows[e] * delta[sel]
+
+        for k in np.flatnonzero(~in_range):
+            objective[k] = self._resolve_cost(rows[k], cols[k], new_costs[k]) if resolve else np.nan
+        return {'objective': objective, 'in_range': in_range}
+
+    def rhs_queries(self, kind, indices, deltas, resolve=True):
+        """
+        Пакет вопросов «что если поставщик/потребитель k получит delta единиц».
+        kind — 'supplier' или 'consumer', индексы относятся к исходной задаче.
+        Изменение компенсируется фиктивным участником; если его нет или
+        запрос выходит за диапазон, задача решается заново.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        deltas = np.asarray(deltas, dtype=float)
+        nodes = indices if kind == 'supplier' else self.m + indices
+        objective = np.full(len(nodes), np.nan)
+        in_range = np.zeros(len(nodes), dtype=bool)
+
+        if self.fictitious is not None:
+            for node in np.unique(nodes):
+                price, lo, hi = self.rhs_range(int(node))
+                sel = nodes == node
+                in_range[sel] = (deltas[sel] >= lo - self.tol) & (deltas[sel] <= hi + self.tol)
+                objective[sel] = self.objective + price * deltas[sel]
+
+        for k in np.flatnonzero(~in_range):
+            objective[k] = self._resolve_rhs(kind, indices[k], deltas[k]) if resolve else np.nan
+        return {'objective': objective, 'in_range': in_range}
+
+    def cost_query(self, i, j, new_cost, resolve=True):
+        result = self.cost_queries([i], [j], [new_cost], resolve)
+        return float(result['objective'][0]), bool(result['in_range'][0])
+
+    def rhs_query(self, kind, index, delta, resolve=True):
+        result = self.rhs_queries(kind, [index], [delta], resolve)
+        return float(result['objective'][0]), bool(result['in_range'][0])
+
+    # --- Повторное решение ---
+
+    def _resolve_cost(self, i, j, new_cost):
+        costs = self.cost_block(np.arange(self.m), np.arange(self.n))
+        costs[i, j] = new_cost
+        result = solve_balanced(costs, self.supply, self.demand, solver=self.solver)
+        return float(result['fun']) if result['success'] else np.nan
+
+    def _resolve_rhs(self, kind, index, delta):
+        supply, demand = self.supply[:self.m0].copy(), self.demand[:self.n0].copy()
+        if kind == 'supplier':
+            supply[index] += delta
+        else:
+            demand[index] += delta
+        if supply.min(initial=0.0) < 0 or demand.min(initial=0.0) < 0:
+            return np.nan
+        supply, demand, _ = balance_problem(supply, demand)
+        result = solve_balanced(self.costs, supply, demand, solver=self.solver)
+        return float(result['fun']) if result['success'] else np.nan
+
+if __name__ == "__main__":
+    supply = np.array([20, 30, 40, 20])
+    demand = np.array([40, 40, 20])
+    costs = np.array([
+        [2, 3, 4],
+        [1, 2, 3],
+        [4, 1, 2],
+        [3, 1, 1]
+    ])
+    supply_b, demand_b, _ = balance_problem(supply, demand)
+    result = solve_balanced(costs, supply_b, demand_b)
+    analysis = SensitivityAnalysis(costs, supply_b, demand_b, result)
+
+    print(f"Оптимальная стоимость: {analysis.objective:.2f}")
+    print(f"Потенциалы поставщиков u: {analysis.u}")
+    print(f"Потенциалы потребителей v: {analysis.v}\n")
+
+    for i, j, x in [(0, 1, 1.0), (2, 1, 3.0), (2, 1, 10.0), (1, 0, 0.0)]:
+        value, ok = analysis.cost_query(i, j, x)
+        note = "базис не меняется" if ok else "пересчитано заново"
+        print(f"Маршрут {i+1}→{j+1} стоит {x:g}: стоимость {value:.2f} ({note})")
+
+    for kind, k, delta in [('supplier', 1, 5.0), ('consumer', 0, 5.0), ('consumer', 0, 20.0)]:
+        value, ok = analysis.rhs_query(kind, k, delta)
+        who = "Поставщик" if kind == 'supplier' else "Потребитель"
+        note = "базис не меняется" if ok else "пересчитано заново"
+        print(f"{who} {k+1} получает {delta:+g} ед.: стоимость {value:.2f} ({note})")
@@ -0,0 +1,193 @@
+import time
+
+import numpy as np
+
+def _balanced_costs(costs, num_suppliers, num_consumers, dtype=np.float64):
+    """Матрица стоимостей сбалансированной задачи (фиктивные перевозки — 0)."""
+    full = np.zeros((num_suppliers, num_consumers), dtype=dtype)
+    full[:costs.shape[0], :costs.shape[1]] = costs
+    return full
+
+def _kernel(f, g, C, eps, dtype):
+    """Ядро K_ij = exp((f_i + g_j - c_ij) / eps), вычисляемое сразу в нужной точности."""
+    K = f.astype(dtype)[:, None] + g.astype(dtype)[None, :]
+    K -= C
+    K *= dtype(1.0 / eps)
+    return np.exp(K, out=K)
+
+def round_to_marginals(plan, a, b):
+    """
+    Округление приближенного плана до допустимого (Altschuler, Weed, Rigollet):
+    строки и столбцы масштабируются вниз до заданных мощностей, остаток
+    распределяется пропорционально недостачам. Суммы по строкам и столбцам
+    результата в точности равны a и b.
+    """
+    row_scale = np.minimum(a / np.maximum(plan.sum(axis=1), 1e-300), 1.0)
+    plan = plan * row_scale[:, None]
+    col_scale = np.minimum(b / np.maximum(plan.sum(axis=0), 1e-300), 1.0)
+    plan *= col_scale[None, :]
+    err_a = a - plan.sum(axis=1)
+    err_b = b - plan.sum(axis=0)
+    total = err_a.sum()
+    if total > 0:
+        plan += np.outer(err_a, err_b) / total
+    return plan
+
+def solve_sinkhorn(costs, supply, demand, epsilon=1e-3, tol=1e-4, max_iter=5000,
+                   float32=False, anneal=True, absorb_at=None):
+    """
+    Приближенное решение сбалансированной задачи энтропийно-регуляризованным
+    транспортом (алгоритм Синкхорна).
+
+    Масса нормируется к 1, стоимости — к максимуму, поэтому epsilon задается
+    в долях максимальной стоимости. Итерации стабилизированы в логарифмической
+    области: текущие потенциалы f, g «поглощаются» в ядро
+    K = exp((f_i + g_j - c_ij) / eps), а между поглощениями выполняются
+    быстрые матрично-векторные обновления масштабов. При anneal=True
+    epsilon уменьшается ступенями от 1 до заданного (ускоряет сходимость).
+    float32=True хранит ядро в float32 (вдвое меньше памяти и трафика).
+
+    Останавливается, когда относительная ошибка маргиналов меньше tol, затем
+    план округляется до допустимого с точными мощностями. Возвращает словарь
+    в формате solve_balanced (success, message, fun, x, rows, cols, values,
+    u, v) и число итераций.
+    """
+    dtype = np.float32 if float32 else np.float64
+    if absorb_at is None:
+        absorb_at = 1e15 if not float32 else 1e6
+
+    supply = np.asarray(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    m, n = len(supply), len(demand)
+    total = supply.sum()
+    C = _balanced_costs(np.asarray(costs), m, n, dtype=dtype)
+    scale = float(np.abs(C).max()) or 1.0
+    C /= dtype(scale)
+
+    # Узлы с нулевой мощностью не участвуют в итерациях (log 0)
+    rows_alive = supply > 0
+    cols_alive = demand > 0
+    a = supply[rows_alive] / total
+    b = demand[cols_alive] / total
+    Cr = C[np.ix_(rows_alive, cols_alive)] if not (rows_alive.all() and cols_alive.all()) else C
+
+    f = np.zeros(len(a))
+    g = np.zeros(len(b))
+    schedule = [epsilon]
+    if anneal:
+        eps = 1.0
+        schedule = []
+        while eps > epsilon:
+            schedule.append(eps)
+            eps /= 4.0
+        schedule.append(epsilon)
+
+    iterations = 0
+    error = np.inf
+    for stage, eps in enumerate(schedule):
+        last = stage == len(schedule) - 1
+        stage_tol = tol if last else max(tol, 1e-2)
+        K = _kernel(f, g, Cr, eps, dtype)
+        u = np.ones(len(a), dtype=dtype)
+        v = np.ones(len(b), dtype=dtype)
+        while iterations < max_iter:
+            Kv = K @ v
+            u = (a / np.maximum(Kv, 1e-300)).astype(dtype, copy=False)
+            v = (b / np.maximum(K.T @ u, 1e-300)).astype(dtype, copy=False)
+            iterations += 1
+
+            if iterations % 10 == 0 or iterations == max_iter:
+                error = np.abs(u * (K @ v) - a).sum()
+                if error < stage_tol:
+                    break
+            # Поглощение масштабов в потенциалы, пока они не переполнились
+            if max(np.abs(u).max(), np.abs(v).max(), 1.0 / max(u.min(), 1e-300), 1.0 / max(v.min(), 1e-300)) > absorb_at:
+                f += eps * np.log(np.maximum(u, 1e-300))
+                g += eps * np.log(np.maximum(v, 1e-300))
+                K = _kernel(f, g, Cr, eps, dtype)
+                u = np.ones(len(a), dtype=dtype)
+                v = np.ones(len(b), dtype=dtype)
+        f += eps * np.log(np.maximum(u, 1e-300))
+        g += eps * np.log(np.maximum(v, 1e-300))
+
+    plan = _kernel(f, g, Cr, schedule[-1], np.float64)
+    plan = round_to_marginals(plan, a, b) * total
+
+    x = np.zeros((m, n))
+    x[np.ix_(rows_alive, cols_alive)] = plan
+    fun = float(np.sum(x * C, dtype=np.float64)) * scale
+
+    # Разреженное представление: перевозки, заметные на фоне максимальной
+    significant = x > 1e-6 * x.max(initial=0.0)
+    rows, cols = np.nonzero(significant)
+    u_full = np.zeros(m)
+    v_full = np.zeros(n)
+    u_full[rows_alive] = f * scale
+    v_full[cols_alive] = g * scale
+    converged = error < tol
+    return {
+        'success': True,
+        'message': ("Приближенный план найден." if converged
+                    else f"Достигнут предел итераций, ошибка маргиналов {error:.2e}; план округлен."),
+        'fun': fun,
+        'x': x,
+        'rows': rows,
+        'cols': cols,
+        'values': x[rows, cols],
+        'u': u_full,
+        'v': v_full,
+        'iterations': iterations,
+        'marginal_error': float(error),
+    }
+
+def benchmark_gap(sizes=((4, 3), (50, 60), (200, 300), (1000, 1000)), epsilon=1e-3, float32=False, seed=0):
+    """
+    Сравнивает приближенное решение с точным (метод потенциалов) на наборе
+    случайных задач и задаче из условия. Возвращает список строк-результатов
+    с относительным разрывом оптимальности gap = (приближенное - точное) / точное.
+    """
+    from .main import EXAMPLE_COSTS, EXAMPLE_DEMAND, EXAMPLE_SUPPLY, balance_problem, solve_balanced
+
+    rng = np.random.default_rng(seed)
+    instances = [("Задача из условия", EXAMPLE_COSTS, EXAMPLE_SUPPLY, EXAMPLE_DEMAND)]
+    for m, n in sizes:
+        instances.append((
+            f"Случайная {m}x{n}",
+            rng.uniform(1, 100, size=(m, n)),
+            rng.integers(10, 60, size=m).astype(float),
+            rng.integers(10, 60, size=n).astype(float),
+        ))
+
+    rows = []
+    for name, costs, supply, demand in instances:
+        supply_b, demand_b, _ = balance_problem(supply, demand)
+        started = time.perf_counter()
+        exact = solve_balanced(costs, supply_b, demand_b, solver='potentials', dense=False)
+        exact_time = time.perf_counter() - started
+        started = time.perf_counter()
+        approx = solve_sinkhorn(costs, supply_b, demand_b, epsilon=epsilon, float32=float32)
+        approx_time = time.perf_counter() - started
+        rows.append({
+            'name': name,
+            'exact': exact['fun'],
+            'approx': approx['fun'],
+            'gap': (approx['fun'] - exact['fun']) / abs(exact['fun']) if exact['fun'] else 0.0,
+            'exact_time': exact_time,
+            'approx_time': approx_time,
+            'iterations': approx['iterations'],
+        })
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Разрыв оптимальности приближенного решателя Синкхорна")
+    parser.add_argument('--epsilon', type=float, default=1e-3, help="регуляризация в долях максимальной стоимости")
+    parser.add_argument('--float32', action='store_true', help="вычисления ядра в float32")
+    args = parser.parse_args()
+
+    print(f"--- Синкхорн (epsilon={args.epsilon}, {'float32' if args.float32 else 'float64'}) против точного решения ---")
+    print(f"{'Задача':<20}{'Точное':>14}{'Синкхорн':>14}{'Разрыв':>10}{'Итераций':>10}{'t точн., с':>12}{'t прибл., с':>12}")
+    for row in benchmark_gap(epsilon=args.epsilon, float32=args.float32):
+        print(f"{row['name']:<20}{row['exact']:>14.2f}{row['approx']:>14.2f}{row['gap']:>10.3%}"
+              f"{row['iterations']:>10}{row['exact_time']:>12.3f}{row['approx_time']:>12.3f}")
@@ -0,0 +1,50 @@
+"""
+Сверка метода потенциалов с linprog (HiGHS): стоимость плана и выполнение
+ограничений по поставщикам и потребителям.
+
+    python -m pytest system_analysis/task2
+"""
+import numpy as np
+import pytest
+
+from system_analysis.task2 import main
+
+# Вырожденные задачи: частичные суммы мощностей совпадают, одинаковые или нулевые стоимости
+DEGENERATE = {
+    'совпадающие суммы': ([[1, 2, 3], [2, 1, 3], [3, 2, 1]], [10, 20, 30], [10, 20, 30]),
+    'одинаковые стоимости': ([[5, 5, 5], [5, 5, 5]], [15, 15], [10, 10, 10]),
+    'нулевые стоимости': ([[0, 0], [0, 0], [0, 0]], [5, 5, 10], [10, 10]),
+    'один поставщик': ([[4, 1, 3, 2]], [40], [10, 10, 10, 10]),
+    'один потребитель': ([[4], [1], [3]], [10, 20, 30], [60]),
+    'задача из условия': (main.EXAMPLE_COSTS, main.EXAMPLE_SUPPLY, main.EXAMPLE_DEMAND),
+}
+
+def check_against_linprog(costs, supply, demand):
+    costs = np.asarray(costs, dtype=float)
+    supply, demand, fictitious = main.balance_problem(np.asarray(supply, dtype=float), np.asarray(demand, dtype=float))
+    if fictitious is not None:
+        costs = np.pad(costs, ((0, len(supply) - costs.shape[0]), (0, len(demand) - costs.shape[1])))
+    reference = main.solve_balanced(costs, supply, demand, solver='highs')
+    assert reference['success']
+    for start in ('vogel', 'northwest'):
+        result = main.solve_balanced(costs, supply, demand, solver='potentials', start=start)
+        assert result['success']
+        assert result['fun'] == pytest.approx(reference['fun'])
+        plan = result['x']
+        assert plan.min() >= -1e-9
+        np.testing.assert_allclose(plan.sum(axis=1), supply)
+        np.testing.assert_allclose(plan.sum(axis=0), demand)
+        assert (costs * plan).sum() == pytest.approx(result['fun'])
+
+@pytest.mark.parametrize('name', DEGENERATE)
+def test_degenerate(name):
+    check_against_linprog(*DEGENERATE[name])
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random(seed):
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(2, 30, size=2)
+    check_against_linprog(rng.integers(0, 100, size=(m, n)), rng.integers(1, 50, size=m), rng.integers(1, 50, size=n))
+
+def test_compare_solvers():
+    assert main.compare_solvers(num_instances=20, max_size=25, seed=1) == 0
@@ -0,0 +1,43 @@
+"""
+Анализ чувствительности на случайных задачах: базис восстанавливается по
+плану HiGHS (или повторным решением методом потенциалов при вырожденных
+оценках), а ответы в диапазоне устойчивости совпадают с повторным решением.
+
+    python -m pytest system_analysis/task2
+"""
+import numpy as np
+import pytest
+
+from system_analysis.task2 import main, sensitivity
+
+def random_instances(count, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        m, n = rng.integers(3, 9, size=2)
+        costs = rng.integers(1, 10, size=(m, n))
+        supply, demand, _ = main.balance_problem(rng.integers(1, 20, size=m).astype(float),
+                                                 rng.integers(1, 20, size=n).astype(float))
+        yield costs, supply, demand
+
+def test_basis_on_random_highs_results():
+    for costs, supply, demand in random_instances(500):
+        result = main.solve_balanced(costs, supply, demand, solver='highs', dense=False)
+        analysis = sensitivity.SensitivityAnalysis(costs, supply, demand, result)
+        assert len(analysis.basis_rows) == len(supply) + len(demand) - 1
+        assert analysis.objective == pytest.approx(result['fun'])
+
+@pytest.mark.parametrize('seed', range(3))
+def test_cost_queries_match_resolve(seed):
+    rng = np.random.default_rng(100 + seed)
+    for costs, supply, demand in random_instances(30, seed):
+        result = main.solve_balanced(costs, supply, demand, solver='highs', dense=False)
+        analysis = sensitivity.SensitivityAnalysis(costs, supply, demand, result)
+        m, n = costs.shape
+        rows, cols = rng.integers(0, m, size=5), rng.integers(0, n, size=5)
+        new_costs = costs[rows, cols] + rng.integers(-3, 4, size=5)
+        answers = analysis.cost_queries(rows, cols, new_costs, resolve=False)
+        for k in np.flatnonzero(answers['in_range']):
+            changed = costs.astype(float)
+            changed[rows[k], cols[k]] = new_costs[k]
+            expected = main.solve_balanced(changed, supply, demand, solver='highs', dense=False)['fun']
+            assert answers['objective'][k] == pytest.approx(expected)
@@ -0,0 +1,128 @@
+import numpy as np
+
+from .main import balance_problem
+from .potentials import TransportationSimplex
+
+class IncrementalTransportation:
+    """
+    Транспортная задача, которая многократно решается с небольшими изменениями.
+
+    Хранит исходные (несбалансированные) данные и оптимальный базис метода
+    потенциалов. После изменения части стоимостей, мощностей поставщиков или
+    потребителей план переоптимизируется от прежнего базиса: изменения
+    предложения/спроса отрабатываются двойственным методом, изменения
+    стоимостей — обычными итерациями метода потенциалов. Фиктивный участник
+    перебалансируется автоматически; если меняется сторона дисбаланса
+    (фиктивный потребитель должен стать поставщиком или наоборот), структура
+    задачи меняется и выполняется решение с нуля.
+    """
+
+    def __init__(self, costs, supply, demand, start='vogel'):
+        self.costs = np.array(costs, dtype=float)
+        self.supply = np.array(supply, dtype=float)
+        self.demand = np.array(demand, dtype=float)
+        self.start = start
+        self.last_result = self._cold_solve()
+
+    def _cold_solve(self):
+        supply, demand, self.fictitious = balance_problem(self.supply, self.demand)
+        self.engine = TransportationSimplex(self.costs, supply, demand, start=self.start)
+        result = self.engine.solve()
+        self.cold_pivots = result['pivots']
+        result['warm'] = False
+        return result
+
+    def _balanced_rhs(self):
+        """
+        Балансирует новые данные, сохраняя прежнего фиктивного участника.
+        Возвращает None, если это невозможно без изменения структуры задачи.
+        """
+        surplus = self.supply.sum() - self.demand.sum()
+        if self.fictitious == 'consumer' and surplus >= 0:
+            return self.supply, np.concatenate((self.demand, [surplus]))
+        if self.fictitious == 'supplier' and surplus <= 0:
+            return np.concatenate((self.supply, [-surplus])), self.demand
+        if self.fictitious is None and surplus == 0:
+            return self.supply, self.demand
+        return None
+
+    def update(self, cost_changes=None, supply_changes=None, demand_changes=None, compare_cold=False):
+        """
+        Применяет изменения и переоптимизирует план.
+
+        cost_changes   — словарь {(i, j): новая стоимость};
+        supply_changes — словарь {i: новая мощность поставщика};
+        demand_changes — словарь {j: новый спрос потребителя}.
+        Индексы относятся к исходной (несбалансированной) задаче.
+
+        В результате 'pivots' — число итераций повторного решения,
+        'cold_pivots' — число итераций решения с нуля, 'pivots_saved' — их
+        разность. При compare_cold=True задача дополнительно решается с нуля
+        и 'cold_pivots' измеряется на новых данных; иначе используется число
+        итераций последнего решения с нуля этой же сети.
+        """
+        cost_cells = cost_values = None
+        if cost_changes:
+            rows, cols = np.array(list(cost_changes), dtype=np.int64).reshape(-1, 2).T
+            cost_values = np.array(list(cost_changes.values()), dtype=float)
+            self.costs[rows, cols] = cost_values
+            cost_cells = (rows, cols)
+        for i, value in (supply_changes or {}).items():
+            self.supply[i] = value
+        for j, value in (demand_changes or {}).items():
+            self.demand[j] = value
+
+        balanced = self._balanced_rhs()
+        if balanced is None:
+            result = self._cold_solve()
+        else:
+            supply, demand = balanced if (supply_changes or demand_changes) else (None, None)
+            result = self.engine.resolve(cost_cells, cost_values, supply, demand)
+            result['warm'] = True
+            if not result['success']:
+                result = self._cold_solve()
+
+        cold_pivots = self.cold_pivots
+        if compare_cold and not result['warm']:
+            result['cold_fun'] = result['fun']
+        elif compare_cold:
+            supply, demand, _ = balance_problem(self.supply, self.demand)
+            cold = TransportationSimplex(self.costs, supply, demand, start=self.start).solve()
+            cold_pivots = cold['pivots']
+            result['cold_fun'] = cold['fun']
+
+        result['cold_pivots'] = cold_pivots
+        result['pivots_saved'] = cold_pivots - result['pivots'] if result['warm'] else 0
+        self.last_result = result
+        return result
+
+    def plan(self):
+        """План перевозок сбалансированной задачи (с фиктивной строкой/столбцом)."""
+        return self.engine.plan()
+
+    @property
+    def objective(self):
+        return self.engine.objective
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    m, n = 300, 250
+    costs = rng.integers(1, 100, size=(m, n))
+    supply = rng.integers(10, 50, size=m)
+    demand = rng.integers(10, 50, size=n)
+
+    print(f"--- Повторное решение транспортной задачи {m}x{n} ---")
+    problem = IncrementalTransportation(costs, supply, demand)
+    print(f"Решение с нуля: стоимость {problem.objective:.2f}, итераций {problem.cold_pivots}\n")
+
+    for day in range(1, 6):
+        cells = rng.integers(0, [m, n], size=(5, 2))
+        result = problem.update(
+            cost_changes={(int(i), int(j)): float(rng.integers(1, 100)) for i, j in cells},
+            supply_changes={int(rng.integers(m)): float(rng.integers(10, 50))},
+            demand_changes={int(rng.integers(n)): float(rng.integers(10, 50))},
+            compare_cold=True,
+        )
+        print(f"Изменение {day}: стоимость {result['fun']:.2f} (с нуля: {result['cold_fun']:.2f}), "
+              f"итераций {result['pivots']} вместо {result['cold_pivots']}, "
+              f"сэкономлено {result['pivots_saved']}")
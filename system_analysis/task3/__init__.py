@@ -0,0 +1 @@
+"""Решение о закупке в условиях риска (EMV)."""
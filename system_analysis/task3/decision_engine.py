@@ -0,0 +1,156 @@
+import time
+
+import numpy as np
+
+# Критерии принятия решений: для каждого — максимизировать ли значение
+CRITERIA = {
+    'emv': True,          # ожидаемая денежная стоимость
+    'maximin': True,      # критерий Вальда (гарантированный результат)
+    'maximax': True,      # оптимистический критерий
+    'hurwicz': True,      # критерий Гурвица с коэффициентом оптимизма alpha
+    'laplace': True,      # критерий Лапласа (равновероятные исходы)
+    'max_regret': False,  # критерий Сэвиджа (минимакс сожалений)
+}
+
+# Число элементов платежной матрицы, обрабатываемых за один блок строк
+BLOCK_SIZE = 1 << 22
+
+def payoff_matrix(actions, demand_levels, profit_per_box, cost_of_unsold):
+    """
+    Платежная матрица для всех пар (закупка, спрос) одной операцией
+    broadcasting: строки — действия, столбцы — уровни спроса.
+    """
+    stock = np.asarray(actions, dtype=float)[:, None]
+    demand = np.asarray(demand_levels, dtype=float)[None, :]
+    sold = np.minimum(stock, demand)
+    return sold * profit_per_box - (stock - sold) * cost_of_unsold
+
+def best_payoff_per_demand(actions, demand_levels, profit_per_box, cost_of_unsold):
+    """
+    Максимум каждого столбца платежной матрицы без ее построения: при
+    неотрицательных прибыли и убытке выигрыш растет с закупкой до уровня
+    спроса и убывает после, поэтому лучшее действие — ближайшее к спросу
+    снизу или сверху (np.searchsorted по отсортированным действиям).
+    """
+    actions = np.sort(np.asarray(actions, dtype=float))
+    demand = np.asarray(demand_levels, dtype=float)
+    above = np.searchsorted(actions, demand)
+    below = np.clip(above - 1, 0, len(actions) - 1)
+    above = np.clip(above, 0, len(actions) - 1)
+    candidates = np.stack((actions[below], actions[above]))
+    sold = np.minimum(candidates, demand)
+    values = sold * profit_per_box - (candidates - sold) * cost_of_unsold
+    return values.max(axis=0)
+
+def _row_blocks(num_rows, num_cols, chunk_rows):
+    if chunk_rows is None:
+        chunk_rows = max(1, BLOCK_SIZE // max(1, num_cols))
+    for start in range(0, num_rows, chunk_rows):
+        yield slice(start, min(num_rows, start + chunk_rows))
+
+def _empty_result(num_rows):
+    return {name: np.empty(num_rows) for name in CRITERIA}
+
+def _block_criteria(result, rows, block, probabilities, column_max, alpha):
+    """Все критерии для блока строк платежной матрицы за один проход по нему."""
+    row_min = block.min(axis=1)
+    row_max = block.max(axis=1)
+    result['emv'][rows] = block @ probabilities
+    result['maximin'][rows] = row_min
+    result['maximax'][rows] = row_max
+    result['hurwicz'][rows] = alpha * row_max + (1 - alpha) * row_min
+    result['laplace'][rows] = block.mean(axis=1)
+    # max_j (column_max_j - payoff_ij) = -min_j (payoff_ij - column_max_j)
+    result['max_regret'][rows] = -(block - column_max).min(axis=1)
+
+def _finish(result):
+    """Лучшее действие (индекс) по каждому критерию."""
+    result['best'] = {
+        name: int(np.argmax(result[name]) if maximize else np.argmin(result[name]))
+        for name, maximize in CRITERIA.items()
+    }
+    return result
+
+def evaluate_criteria(actions, demand_levels, probabilities, profit_per_box, cost_of_unsold,
+                      alpha=0.5, chunk_rows=None):
+    """
+    Все критерии (EMV, Вальд, максимакс, Гурвиц, Лаплас, Сэвидж) для задачи
+    о закупках. Платежная матрица строится и обрабатывается блоками строк
+    (по умолчанию около BLOCK_SIZE элементов), поэтому целиком в памяти не
+    находится; EMV блока — одно матрично-векторное произведение. Максимумы
+    столбцов для сожалений вычисляются заранее без построения матрицы.
+
+    Возвращает словарь массивов по действиям: emv, maximin, maximax,
+    hurwicz, laplace, max_regret; и best — индекс лучшего действия по
+    каждому критерию.
+    """
+    actions = np.asarray(actions, dtype=float)
+    demand_levels = np.asarray(demand_levels, dtype=float)
+    probabilities = np.asarray(probabilities, dtype=float)
+    column_max = best_payoff_per_demand(actions, demand_levels, profit_per_box, cost_of_unsold)
+
+    result = _empty_result(len(actions))
+    for rows in _row_blocks(len(actions), len(demand_levels), chunk_rows):
+        block = payoff_matrix(actions[rows], demand_levels, profit_per_box, cost_of_unsold)
+        _block_criteria(result, rows, block, probabilities, column_max, alpha)
+    return _finish(result)
+
+def evaluate_matrix(payoff, probabilities, alpha=0.5, chunk_rows=None):
+    """
+    Те же критерии для произвольной платежной матрицы, в том числе
+    отображенной в память (np.load(..., mmap_mode='r')). Матрица читается
+    блоками строк дважды: сначала максимумы столбцов, затем критерии.
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    num_rows, num_cols = payoff.shape
+    column_max = np.full(num_cols, -np.inf)
+    for rows in _row_blocks(num_rows, num_cols, chunk_rows):
+        np.maximum(column_max, np.asarray(payoff[rows]).max(axis=0), out=column_max)
+
+    result = _empty_result(num_rows)
+    for rows in _row_blocks(num_rows, num_cols, chunk_rows):
+        _block_criteria(result, rows, np.asarray(payoff[rows], dtype=float), probabilities, column_max, alpha)
+    return _finish(result)
+
+def save_payoff_memmap(path, actions, demand_levels, profit_per_box, cost_of_unsold,
+                       dtype=np.float64, chunk_rows=None):
+    """
+    Записывает платежную матрицу в файл .npy блоками строк (через
+    np.lib.format.open_memmap) и возвращает ее, отображенную в память.
+    """
+    actions = np.asarray(actions, dtype=float)
+    payoff = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(len(actions), len(demand_levels)))
+    for rows in _row_blocks(len(actions), len(demand_levels), chunk_rows):
+        payoff[rows] = payoff_matrix(actions[rows], demand_levels, profit_per_box, cost_of_unsold)
+    payoff.flush()
+    return np.load(path, mmap_mode='r')
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Критерии принятия решений для больших платежных матриц")
+    parser.add_argument('--levels', type=int, default=20000, help="число уровней закупки и спроса")
+    parser.add_argument('--memmap', help="дополнительно записать матрицу в .npy и посчитать критерии по ней")
+    args = parser.parse_args()
+
+    levels = np.arange(args.levels, dtype=float)
+    # Дискретизированное нормальное распределение спроса
+    probabilities = np.exp(-0.5 * ((levels - 0.6 * args.levels) / (0.1 * args.levels)) ** 2)
+    probabilities /= probabilities.sum()
+
+    print(f"--- Платежная матрица {args.levels} x {args.levels} ({args.levels ** 2 * 8 / 2**30:.1f} ГиБ в float64) ---")
+    started = time.perf_counter()
+    result = evaluate_criteria(levels, levels, probabilities, 35.0, 56.0)
+    print(f"Блоками строк: {time.perf_counter() - started:.2f} с")
+    for name in CRITERIA:
+        best = result['best'][name]
+        print(f"  {name:<11} лучшая закупка {levels[best]:.0f}, значение {result[name][best]:.2f}")
+
+    if args.memmap:
+        started = time.perf_counter()
+        payoff = save_payoff_memmap(args.memmap, levels, levels, 35.0, 56.0)
+        written = time.perf_counter() - started
+        started = time.perf_counter()
+        from_file = evaluate_matrix(payoff, probabilities)
+        print(f"Через файл {args.memmap}: запись {written:.2f} с, критерии {time.perf_counter() - started:.2f} с, "
+              f"совпадение: {all(np.allclose(from_file[name], result[name]) for name in CRITERIA)}")
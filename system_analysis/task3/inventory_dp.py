@@ -0,0 +1,275 @@
+import time
+
+import numpy as np
+
+class InventoryDP:
+    """
+    Многопериодная модель закупок «Фото КОЛОР»: непроданные ящики переходят
+    на следующую неделю, заказ приходит через lead_time недель.
+
+    Экономика обобщает payoff_matrix (decision_engine): проданный ящик приносит
+    profit_per_box, каждый ящик, оставшийся на складе после недели,
+    стоит holding_cost, а ящики, не проданные к концу горизонта (на складе
+    и в пути), списываются с убытком cost_of_unsold. При горизонте в одну
+    неделю и нулевом запасе модель совпадает с исходной задачей.
+    fixed_order_cost — постоянные затраты на каждый заказ, discount —
+    коэффициент дисконтирования.
+
+    Состояние в начале недели (после прихода заказа): доступный запас y и
+    заказы в пути (lead_time - 1 чисел). Запас ограничен max_inventory
+    (излишек теряется), заказ — max_order: это усечение пространства
+    состояний. Каждый шаг обратной индукции — операции NumPy над массивом
+    состояние x заказ, накапливаемым по уровням спроса.
+    """
+
+    def __init__(self, demand_levels, probabilities, profit_per_box, cost_of_unsold,
+                 holding_cost=0.0, fixed_order_cost=0.0, lead_time=0,
+                 max_inventory=None, max_order=None, discount=1.0, float32=False):
+        self.dtype = np.float32 if float32 else np.float64
+        demand_levels = np.asarray(demand_levels, dtype=np.int64)
+        probabilities = np.asarray(probabilities, dtype=float)
+        keep = probabilities > 0
+        self.demand, self.prob = demand_levels[keep], probabilities[keep].astype(self.dtype)
+        max_demand = int(self.demand.max())
+        self.max_inventory = max_inventory if max_inventory is not None else 2 * max_demand * (lead_time + 1)
+        self.max_order = min(max_order if max_order is not None else self.max_inventory, self.max_inventory)
+        self.profit, self.writeoff = profit_per_box, cost_of_unsold
+        self.holding, self.fixed = holding_cost, fixed_order_cost
+        self.lead_time, self.discount = lead_time, discount
+
+        y = np.arange(self.max_inventory + 1)
+        # Остаток после спроса для каждого уровня запаса и спроса: (Y, D)
+        self._leftover = np.maximum(y[:, None] - self.demand[None, :], 0)
+        self._sales = (np.minimum(y[:, None], self.demand[None, :]) @ self.prob).astype(self.dtype)
+        self._carried = (self._leftover @ self.prob).astype(self.dtype)
+        self._orders = np.arange(self.max_order + 1)
+        self._order_cost = np.where(self._orders > 0, self.dtype(fixed_order_cost), self.dtype(0)).astype(self.dtype)
+        # Плотная функция вероятности спроса 0..max_demand и P(D > y) — для свертки при lead_time = 0
+        self._pmf = np.zeros(max_demand + 1, dtype=self.dtype)
+        np.add.at(self._pmf, self.demand, self.prob)
+        tail = 1.0 - np.cumsum(self._pmf, dtype=float)
+        self._tail = np.zeros(self.max_inventory + 1, dtype=self.dtype)
+        self._tail[:min(len(tail), len(self._tail))] = np.maximum(tail, 0.0)[:len(self._tail)]
+
+    @property
+    def state_shape(self):
+        return (self.max_inventory + 1,) + (self.max_order + 1,) * max(0, self.lead_time - 1)
+
+    def _reward(self, last):
+        """Ожидаемый доход недели при доступном запасе y (хранение не начисляется в последнюю неделю)."""
+        holding = 0.0 if last else self.holding
+        return self.profit * self._sales - holding * self._carried
+
+    def _terminal(self):
+        """Списание всех ящиков после последней недели: на складе и в пути."""
+        shape = self.state_shape
+        total = np.zeros(shape, dtype=self.dtype)
+        for axis, size in enumerate(shape):
+            view = [1] * len(shape)
+            view[axis] = size
+            total = total + np.arange(size, dtype=self.dtype).reshape(view)
+        return -self.writeoff * total
+
+    def _expect_leftover(self, future):
+        """
+        E[future((y - D)+)] для всех y одной сверткой: слагаемые с d <= y дает
+        np.convolve, остальные (весь запас продан) — future(0) P(D > y).
+        """
+        cap = self.max_inventory
+        return np.convolve(future, self._pmf)[:cap + 1] + future[0] * self._tail
+
+    def _choose_level(self, gain):
+        """
+        Оптимальный заказ при мгновенной поставке: при запасе x выбирается
+        уровень y = x + q с наибольшим gain(y) - fixed_order_cost [q > 0].
+        Без ограничения заказа лучший уровень выше x — суффиксный максимум
+        gain (O(состояний)); с ограничением — перебор массива состояние x заказ.
+        """
+        cap = self.max_inventory
+        states = np.arange(cap + 1)
+        if self.max_order < cap:
+            target = states[:, None] + self._orders[None, :]
+            values = np.where(target <= cap, gain[np.minimum(target, cap)], -np.inf) - self._order_cost
+            best = values.argmax(axis=1)
+            return values[states, best], best
+
+        suffix = np.maximum.accumulate(gain[::-1])[::-1]
+        # Наименьший уровень y >= x, на котором достигается суффиксный максимум
+        after = np.append(suffix[1:], -np.inf)
+        records = np.where(gain >= after, states, cap + 1)
+        level = np.minimum.accumulate(records[::-1])[::-1]
+        order_value = after - self.dtype(self.fixed)
+        order = order_value > gain
+        next_level = np.append(level[1:], cap)
+        return np.where(order, order_value, gain), np.where(order, next_level - states, 0)
+
+    def _stage(self, future, last):
+        """
+        Один шаг обратной индукции: по ценности future следующего состояния
+        возвращает (ценность, оптимальный заказ) для всех состояний.
+        """
+        cap = self.max_inventory
+        beta = self.dtype(self.discount)
+        reward = self._reward(last).astype(self.dtype)
+
+        if self.lead_time == 0:
+            # Заказ приходит сразу: G(y) = доход(y) + beta E[future((y - D)+)], затем выбор y = x + q
+            return self._choose_level(reward + beta * self._expect_leftover(future))
+
+        orders = self._orders
+        if self.lead_time == 1:
+            # Состояние — запас y; заказ q придет к следующей неделе: y' = (y - d)+ + q
+            expected = np.zeros((cap + 1, len(orders)), dtype=self.dtype)
+            for d, p in enumerate(self.prob):
+                expected += p * future[np.minimum(self._leftover[:, d, None] + orders[None, :], cap)]
+            values = beta * expected - self._order_cost
+            best = values.argmax(axis=1)
+            return reward + values[np.arange(cap + 1), best], best
+
+        # Состояние (y, p1, ..., p_{L-1}); следующее — ((y - d)+ + p1, p2, ..., p_{L-1}, q)
+        shape = self.state_shape
+        tail = future.reshape(cap + 1, -1)
+        expected = np.zeros((cap + 1, len(orders), tail.shape[1]), dtype=self.dtype)
+        for d, p in enumerate(self.prob):
+            expected += p * tail[np.minimum(self._leftover[:, d, None] + orders[None, :], cap)]
+        expected = expected.reshape(shape + (len(orders),))
+        values = beta * expected - self._order_cost
+        best = values.argmax(axis=-1)
+        value = np.take_along_axis(values, best[..., None], axis=-1)[..., 0]
+        return reward.reshape((-1,) + (1,) * (len(shape) - 1)) + value, best
+
+    def solve(self, horizon):
+        """
+        Обратная индукция на horizon недель. Возвращает словарь: value —
+        ожидаемая прибыль за горизонт из каждого начального состояния,
+        policy — оптимальный заказ для каждой недели и состояния
+        (horizon x state_shape), time — время решения.
+        """
+        started = time.perf_counter()
+        future = self._terminal()
+        policy = np.empty((horizon,) + self.state_shape, dtype=np.int32)
+        for t in reversed(range(horizon)):
+            future, policy[t] = self._stage(future, last=t == horizon - 1)
+            future = future.astype(self.dtype, copy=False)
+        return {'value': future, 'policy': policy, 'time': time.perf_counter() - started}
+
+    def value_iteration(self, tol=1e-6, max_iter=10_000):
+        """
+        Стационарная политика бесконечного горизонта (нужен discount < 1).
+        Шаг обратной индукции повторяется, пока размах изменения ценности
+        (max - min по состояниям) больше tol: при discount, близком к 1,
+        сама ценность сходится медленно, а политика и размах — быстро.
+        Итоговая ценность уточняется по границам МакКуина: к ней добавляется
+        discount / (1 - discount) x середина интервала изменений.
+        Возвращает value, policy, iterations и time.
+        """
+        if not 0 < self.discount < 1:
+            raise ValueError("Для итерации по ценностям нужен коэффициент дисконтирования 0 < discount < 1")
+        started = time.perf_counter()
+        value = np.zeros(self.state_shape, dtype=self.dtype)
+        for iteration in range(1, max_iter + 1):
+            new_value, policy = self._stage(value, last=False)
+            change = new_value - value
+            low, high = float(change.min()), float(change.max())
+            value = new_value.astype(self.dtype, copy=False)
+            if high - low < tol:
+                break
+        value = value + self.dtype(self.discount / (1 - self.discount) * (low + high) / 2)
+        return {'value': value, 'policy': policy, 'iterations': iteration, 'time': time.perf_counter() - started}
+
+def _brute_force(model, horizon, state):
+    """Прямой перебор (рекурсия с запоминанием) для проверки на маленьких задачах."""
+    from functools import lru_cache
+
+    cap, lead = model.max_inventory, model.lead_time
+
+    @lru_cache(maxsize=None)
+    def value(t, state):
+        y, pipeline = state[0], state[1:]
+        last = t == horizon - 1
+        best = -np.inf
+        for q in range(model.max_order + 1):
+            if lead == 0 and y + q > cap:
+                break
+            available = y + q if lead == 0 else y
+            total = -model.fixed if q > 0 else 0.0
+            for d, p in zip(model.demand, model.prob):
+                sold = min(available, d)
+                left = available - sold
+                income = model.profit * sold - (0.0 if last else model.holding * left)
+                if lead == 0:
+                    nxt = (left,)
+                elif lead == 1:
+                    nxt = (min(left + q, cap),)
+                else:
+                    nxt = (min(left + pipeline[0], cap),) + pipeline[1:] + (q,)
+                future = -model.writeoff * sum(nxt) if last else value(t + 1, nxt)
+                total += p * (income + model.discount * future)
+            best = max(best, total)
+        return best
+
+    return value(0, state)
+
+def check_small(seed=0):
+    """Сверяет обратную индукцию с прямым перебором на маленьких задачах. Возвращает число расхождений."""
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for k in range(12):
+        lead = k % 3
+        levels = np.arange(0, 4)
+        model = InventoryDP(levels, rng.dirichlet(np.ones(4)), rng.uniform(1, 40), rng.uniform(1, 60),
+                            holding_cost=rng.uniform(0, 5), fixed_order_cost=rng.uniform(0, 10),
+                            lead_time=lead, max_inventory=6, max_order=4 if k % 2 else None, discount=0.95)
+        horizon = 3
+        result = model.solve(horizon)
+        state = (2,) + (1,) * max(0, lead - 1)
+        reference = _brute_force(model, horizon, state)
+        if not np.isclose(result['value'][state], reference):
+            mismatches += 1
+            print(f"❌ Задача {k} (lead_time={lead}): {result['value'][state]} != {reference}")
+    print(f"Проверено задач: 12, расхождений: {mismatches}")
+    return mismatches
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Многопериодное планирование закупок (динамическое программирование)")
+    parser.add_argument('--horizon', type=int, default=52, help="горизонт планирования, недель")
+    parser.add_argument('--lead-time', type=int, default=0, help="срок поставки, недель")
+    parser.add_argument('--holding', type=float, default=2.0, help="стоимость хранения ящика в неделю, тыс. руб.")
+    parser.add_argument('--states', type=int, default=None, help="максимальный запас (усечение пространства состояний)")
+    parser.add_argument('--max-order', type=int, default=None, help="максимальный заказ")
+    parser.add_argument('--float32', action='store_true')
+    parser.add_argument('--check', action='store_true', help="сверить с прямым перебором на маленьких задачах")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if check_small() else 0)
+
+    print("--- Одна неделя без переноса запаса (исходная задача) ---")
+    single = InventoryDP([11, 12, 13], [0.45, 0.35, 0.20], 35.0, 56.0, max_inventory=20).solve(1)
+    print(f"Закупка {single['policy'][0, 0]}, EMV {single['value'][0]:.2f} тыс. руб.")
+
+    print(f"\n--- {args.horizon} недель, перенос запаса, срок поставки {args.lead_time} ---")
+    model = InventoryDP([11, 12, 13], [0.45, 0.35, 0.20], 35.0, 56.0, holding_cost=args.holding,
+                        lead_time=args.lead_time, max_inventory=args.states, max_order=args.max_order,
+                        discount=0.999, float32=args.float32)
+    result = model.solve(args.horizon)
+    start_state = (0,) * len(model.state_shape)
+    print(f"Состояний: {np.prod(model.state_shape):,}, заказов: {model.max_order + 1}, время: {result['time']:.2f} с")
+    print(f"Ожидаемая прибыль за горизонт с пустого склада: {result['value'][start_state]:.2f} тыс. руб.")
+    print("Заказ в первую неделю при запасе 0..15: " + " ".join(str(q) for q in result['policy'][0][:16].reshape(16, -1)[:, 0]))
+
+    stationary = model.value_iteration(tol=1e-3)
+    print(f"Стационарная политика (итерация по ценностям, {stationary['iterations']} итераций, {stationary['time']:.2f} с):")
+    print("  заказ при запасе 0..15: " + " ".join(str(q) for q in stationary['policy'][:16].reshape(16, -1)[:, 0]))
+
+    print("\n--- Масштаб: спрос 0..999, 5000 состояний запаса, 52 недели ---")
+    rng = np.random.default_rng(0)
+    levels = np.arange(1000)
+    probabilities = np.exp(-0.5 * ((levels - 500) / 80.0) ** 2)
+    probabilities /= probabilities.sum()
+    big = InventoryDP(levels, probabilities, 35.0, 56.0, holding_cost=args.holding, fixed_order_cost=200.0,
+                      max_inventory=4999, float32=args.float32)
+    result = big.solve(52)
+    print(f"Время: {result['time']:.2f} с, заказ в первую неделю с пустого склада: {result['policy'][0, 0]}")
@@ -0,0 +1,101 @@
+from ..instrument import add_arguments, count, echo, session_from_args, span
+from .decision_engine import evaluate_criteria, payoff_matrix
+from .newsvendor import cost_boundaries, fractile_sweep
+from .reports import FORMATS, PayoffTable, decision_report, render_file
+
+def solve_and_visualize_decision_problem(plot=True, dpi=100, fmt='png', output=None):
+    """
+    Решает задачу принятия решений и визуализирует результаты.
+    plot=False — без построения графика (matplotlib не загружается);
+    output — файл графика (по умолчанию decision_analysis.<fmt>).
+    """
+    # --- 1. Исходные данные ---
+    profit_per_box = 35.0
+    cost_of_unsold = 56.0
+    actions = [11, 12, 13]
+    demand_levels = [11, 12, 13]
+    probabilities = [0.45, 0.35, 0.20]
+
+    echo("--- Анализ задачи «Фото КОЛОР» ---")
+    echo(f"Прибыль с проданного ящика: {profit_per_box} тыс. руб.")
+    echo(f"Убыток с непроданного ящика: {cost_of_unsold} тыс. руб.\n")
+
+    # --- 2. Построение платежной матрицы ---
+    with span('payoff'):
+        payoff = payoff_matrix(actions, demand_levels, profit_per_box, cost_of_unsold)
+    count('payoff_cells', payoff.size)
+
+    payoff_table = PayoffTable(
+        payoff,
+        index=[f"Закупить {a}" for a in actions],
+        columns=[f"Спрос {d} (P={p})" for d, p in zip(demand_levels, probabilities)]
+    )
+    echo("--- 1. Платежная матрица (финансовые исходы, тыс. руб.) ---")
+    echo(payoff_table)
+    echo("\n")
+
+    # --- 3. Расчет EMV и других критериев ---
+    with span('criteria'):
+        criteria = evaluate_criteria(actions, demand_levels, probabilities, profit_per_box, cost_of_unsold)
+    emv_results = dict(zip(actions, criteria['emv']))
+    
+    echo("--- 2. Расчет ожидаемой денежной стоимости (EMV) ---")
+    for stock, emv in emv_results.items():
+        echo(f"EMV(Закупить {stock}) = {emv:.2f} тыс. руб.")
+    
+    optimal_action = actions[criteria['best']['emv']]
+    max_emv = emv_results[optimal_action]
+
+    echo("\n--- Критерии в условиях неопределенности ---")
+    for name, title in (('maximin', 'Вальда (максимин)'), ('maximax', 'максимакс'),
+                        ('hurwicz', 'Гурвица (alpha = 0.5)'), ('laplace', 'Лапласа'),
+                        ('max_regret', 'Сэвиджа (минимакс сожалений)')):
+        best = criteria['best'][name]
+        echo(f"Критерий {title}: закупать {actions[best]} (значение {criteria[name][best]:.2f})")
+
+    echo("\n--- 3. Вывод и рекомендация ---")
+    echo(f"✅ Оптимальная стратегия: еженедельно закупать {optimal_action} ящиков.")
+    echo(f"   Максимальная ожидаемая прибыль (EMV) составляет {max_emv:.2f} тыс. рублей.")
+
+    # Проверка по правилу критического отношения и границы решения по убытку
+    with span('fractile'):
+        sweep = fractile_sweep(demand_levels, probabilities, profit_per_box, cost_of_unsold)
+    echo(f"   Критическое отношение p / (p + c) = {sweep['ratio']:.4f} → закупка {sweep['action'][0]:.0f}")
+    for k, threshold in enumerate(cost_boundaries(profit_per_box, sweep['boundaries'])[0]):
+        echo(f"   При убытке ниже {threshold:.2f} тыс. руб. выгоднее закупать {demand_levels[k + 1]} вместо {demand_levels[k]}")
+
+    # --- 4. Визуализация ---
+    if plot:
+        with span('plot', format=fmt):
+            report = decision_report("«Фото КОЛОР»", actions, demand_levels, probabilities,
+                                     profit_per_box, cost_of_unsold)
+            visualize_decision(report, output or f'decision_analysis.{fmt}', dpi=dpi, fmt=fmt)
+
+def visualize_decision(report, path, dpi=100, fmt='png'):
+    """
+    Тепловая карта платежной матрицы и сравнение стратегий по EMV: отчет
+    decision_report рисуется шаблоном DecisionFigure (reports.py, бэкенд Agg,
+    дисплей не нужен). Если входные данные, dpi и формат не изменились с
+    прошлого построения, файл не перерисовывается (.render_cache.json рядом
+    с файлом).
+    """
+    if render_file(report, path, dpi=dpi, fmt=fmt):
+        echo(f"\n📊 Визуализация сохранена в файл '{path}'")
+    else:
+        echo(f"\n📊 Визуализация не изменилась: '{path}'")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Задача о закупках «Фото КОЛОР»")
+    parser.add_argument('--no-plot', action='store_true', help="не строить график (без matplotlib)")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--format', choices=FORMATS, default='png')
+    parser.add_argument('--output', help="файл графика (по умолчанию decision_analysis.<формат>)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    with session_from_args(args, name='task3'):
+        solve_and_visualize_decision_problem(plot=not args.no_plot, dpi=args.dpi, fmt=args.format,
+                                             output=args.output)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import time
+
+import numpy as np
+
+# Допуск при сравнении критического отношения с функцией распределения
+TOL = 1e-12
+
+# Число точек сетки параметров, обрабатываемых за один блок
+BLOCK_SIZE = 1 << 21
+
+def critical_ratio(profit_per_box, cost_of_unsold):
+    """Критическое отношение p / (p + c): оптимальная закупка — наименьший уровень q с F(q) >= p / (p + c)."""
+    profit_per_box = np.asarray(profit_per_box, dtype=float)
+    return profit_per_box / (profit_per_box + np.asarray(cost_of_unsold, dtype=float))
+
+def _distribution_tables(demand_levels, probabilities):
+    """Функции распределения F(d_k) и ожидаемые продажи E[min(d_k, D)] для каждого распределения."""
+    levels = np.asarray(demand_levels, dtype=float)
+    probabilities = np.atleast_2d(np.asarray(probabilities, dtype=float))
+    cdf = np.cumsum(probabilities, axis=1)
+    # E[min(q, D)] = sum_{d_j <= q} d_j P_j + q (1 - F(q))
+    expected_sales = np.cumsum(levels * probabilities, axis=1) + levels * (1.0 - cdf)
+    return levels, cdf, expected_sales
+
+def fractile_sweep(demand_levels, probabilities, profit_per_box, cost_of_unsold):
+    """
+    Оптимальная закупка и EMV по всей сетке параметров без платежной матрицы.
+
+    demand_levels — возрастающие уровни спроса (они же варианты закупки);
+    probabilities — одно распределение (n,) или набор распределений (S, n);
+    profit_per_box и cost_of_unsold — массивы, совместимые по broadcasting
+    (например, столбец цен и строка убытков). Результат имеет форму
+    broadcast(profit, cost) + (S,).
+
+    По правилу критического отношения оптимален наименьший уровень d_k с
+    F(d_k) >= p / (p + c); он находится одним вызовом np.searchsorted по
+    функциям распределения всех S распределений сразу (строки сдвинуты на
+    2s, чтобы оставаться упорядоченными). EMV = (p + c) E[min(d_k, D)] - c d_k
+    берется из заранее посчитанных накопленных сумм.
+
+    Возвращает словарь: ratio (критическое отношение), index (индекс уровня),
+    action (оптимальная закупка), emv; и boundaries (S, n - 1) — значения
+    критического отношения, при переходе через которые решение меняется с
+    d_k на d_{k+1} (см. cost_boundaries).
+    """
+    levels, cdf, expected_sales = _distribution_tables(demand_levels, probabilities)
+    num_dists, num_levels = cdf.shape
+    profit, cost = np.broadcast_arrays(np.asarray(profit_per_box, dtype=float),
+                                       np.asarray(cost_of_unsold, dtype=float))
+    grid_shape = profit.shape
+    profit, cost = profit.ravel(), cost.ravel()
+
+    shifted = (cdf + 2.0 * np.arange(num_dists)[:, None]).ravel()
+    offsets = 2.0 * np.arange(num_dists)
+    index = np.empty((len(profit), num_dists), dtype=np.int64)
+    emv = np.empty((len(profit), num_dists))
+    ratio = critical_ratio(profit, cost)
+
+    block = max(1, BLOCK_SIZE // num_dists)
+    for start in range(0, len(profit), block):
+        rows = slice(start, start + block)
+        queries = ratio[rows, None] - TOL + offsets[None, :]
+        flat = np.searchsorted(shifted, queries, side='left')
+        k = np.minimum(flat - np.arange(num_dists) * num_levels, num_levels - 1)
+        index[rows] = k
+        p, c = profit[rows, None], cost[rows, None]
+        emv[rows] = (p + c) * expected_sales[np.arange(num_dists), k] - c * levels[k]
+
+    shape = grid_shape + (num_dists,)
+    index = index.reshape(shape)
+    return {
+        'ratio': ratio.reshape(grid_shape),
+        'index': index,
+        'action': levels[index],
+        'emv': emv.reshape(shape),
+        'boundaries': cdf[:, :-1],
+    }
+
+def cost_boundaries(profit_per_box, boundaries):
+    """
+    Переводит границы критического отношения F в границы убытка от
+    непроданного ящика при заданной прибыли: p / (p + c) = F <=> c = p (1 - F) / F.
+    Решение d_k сменяется на d_{k+1}, когда убыток опускается ниже границы k.
+    """
+    boundaries = np.asarray(boundaries, dtype=float)
+    with np.errstate(divide='ignore'):
+        return np.asarray(profit_per_box, dtype=float)[..., None] * (1.0 - boundaries) / boundaries
+
+def check_against_matrix(num_instances=200, seed=0):
+    """Сверяет fractile_sweep с полным перебором по платежной матрице. Возвращает число расхождений."""
+    from .decision_engine import evaluate_criteria
+
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for k in range(num_instances):
+        levels = np.unique(rng.integers(0, 100, size=rng.integers(1, 15)))
+        probabilities = rng.dirichlet(np.ones(len(levels)), size=3)
+        profit = rng.uniform(1, 50, size=(4, 1))
+        cost = rng.uniform(0, 80, size=(1, 5))
+        sweep = fractile_sweep(levels, probabilities, profit, cost)
+        for i in range(4):
+            for j in range(5):
+                for s in range(3):
+                    emv = evaluate_criteria(levels, levels, probabilities[s], profit[i, 0], cost[0, j])['emv']
+                    if not np.isclose(sweep['emv'][i, j, s], emv.max()):
+                        mismatches += 1
+    print(f"Проверено задач: {num_instances}, расхождений: {mismatches}")
+    return mismatches
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Оптимальная закупка по сетке параметров (критическое отношение)")
+    parser.add_argument('--profits', type=int, default=1000, help="число значений прибыли с ящика")
+    parser.add_argument('--costs', type=int, default=1000, help="число значений убытка с непроданного ящика")
+    parser.add_argument('--distributions', type=int, default=20, help="число распределений спроса")
+    parser.add_argument('--levels', type=int, default=50, help="число уровней спроса")
+    parser.add_argument('--check', action='store_true', help="сверить с перебором по платежной матрице")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if check_against_matrix() else 0)
+
+    # Задача «Фото КОЛОР»: границы решения по убытку от непроданного ящика
+    levels, probabilities = np.array([11, 12, 13]), np.array([0.45, 0.35, 0.20])
+    base = fractile_sweep(levels, probabilities, 35.0, 56.0)
+    print("--- Задача «Фото КОЛОР» ---")
+    print(f"Критическое отношение: {base['ratio']:.4f}, оптимальная закупка: {base['action'][0]:.0f}, "
+          f"EMV = {base['emv'][0]:.2f}")
+    for k, threshold in enumerate(cost_boundaries(35.0, base['boundaries'])[0]):
+        print(f"  закупка {levels[k]} сменяется на {levels[k + 1]}, когда убыток ниже {threshold:.2f} тыс. руб.")
+
+    rng = np.random.default_rng(0)
+    grid_levels = np.arange(args.levels) + 1
+    probabilities = rng.dirichlet(np.ones(args.levels), size=args.distributions)
+    profit = np.linspace(1, 100, args.profits)[:, None]
+    cost = np.linspace(0, 100, args.costs)[None, :]
+    total = args.profits * args.costs * args.distributions
+
+    started = time.perf_counter()
+    result = fractile_sweep(grid_levels, probabilities, profit, cost)
+    elapsed = time.perf_counter() - started
+    print(f"\n--- Сетка {args.profits} x {args.costs} x {args.distributions} ({total:,} комбинаций) ---")
+    print(f"Время: {elapsed:.2f} с ({total / elapsed:,.0f} комбинаций/с)")
+    changes = np.count_nonzero(np.diff(result['index'], axis=1))
+    print(f"Смен решения вдоль оси убытка: {changes:,}")
@@ -0,0 +1,359 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .decision_engine import evaluate_criteria, payoff_matrix
+
+# Версия оформления шаблонов: при ее изменении все отчеты перерисовываются
+TEMPLATE_VERSION = 1
+
+# Файл с хешами входных данных уже построенных графиков (в каталоге графиков)
+MANIFEST = '.render_cache.json'
+
+FORMATS = ('png', 'svg', 'pdf', 'jpg')
+
+def use_agg():
+    """
+    Включает неинтерактивный бэкенд Agg (дисплей не нужен) и шрифт с
+    кириллицей. Возвращает модуль matplotlib.pyplot.
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    plt.rcParams['font.family'] = 'sans-serif'
+    plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
+    return plt
+
+def _plain(value):
+    """Приводит массивы NumPy и вложенные структуры к виду, пригодному для JSON."""
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def content_hash(*parts):
+    """SHA-256 от канонического JSON входных данных графика."""
+    text = json.dumps(_plain(list(parts)), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class RenderCache:
+    """
+    Хеши входных данных построенных графиков (файл MANIFEST в каталоге).
+    График не перерисовывается, если файл существует и хеш не изменился.
+    """
+
+    def __init__(self, directory='.'):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST
+        try:
+            self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_fresh(self, filename, digest):
+        return self.entries.get(filename) == digest and (self.directory / filename).exists()
+
+    def record(self, filename, digest):
+        self.entries[filename] = digest
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding='utf-8')
+
+class PayoffTable:
+    """
+    Платежная матрица с подписями строк и столбцов. Печатается без pandas;
+    DataFrame (например, для seaborn) создается только по запросу to_frame().
+    """
+
+    def __init__(self, values, index, columns):
+        self.values = np.asarray(values)
+        self.index = list(index)
+        self.columns = list(columns)
+
+    def __str__(self):
+        cells = [[f"{v:.1f}" for v in row] for row in self.values]
+        label_width = max(len(str(label)) for label in self.index)
+        widths = [max(len(str(name)), *(len(row[j]) for row in cells)) for j, name in enumerate(self.columns)]
+        lines = [" " * label_width + "".join(f"  {name:>{w}}" for name, w in zip(self.columns, widths))]
+        for label, row in zip(self.index, cells):
+            lines.append(f"{label:<{label_width}}" + "".join(f"  {v:>{w}}" for v, w in zip(row, widths)))
+        return "\n".join(lines)
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns)
+
+# --- Данные отчетов ---
+
+def decision_report(name, actions, demand_levels, probabilities, profit_per_box, cost_of_unsold):
+    """Данные отчета о закупке (task3): платежная матрица и EMV стратегий."""
+    criteria = evaluate_criteria(actions, demand_levels, probabilities, profit_per_box, cost_of_unsold)
+    return {
+        'kind': 'decision',
+        'name': name,
+        'actions': list(actions),
+        'demand_levels': list(demand_levels),
+        'probabilities': list(probabilities),
+        'payoff': payoff_matrix(actions, demand_levels, profit_per_box, cost_of_unsold),
+        'emv': criteria['emv'],
+    }
+
+def research_report(name, actions, demand_levels, prob_original, prob_research, profit_per_box,
+                    cost_of_unsold, research_cost):
+    """Данные отчета об исследовании рынка (task4): EMV без исследования, с ним и итог."""
+    report = decision_report(name, actions, demand_levels, prob_original, profit_per_box, cost_of_unsold)
+    research = evaluate_criteria(actions, demand_levels, prob_research, profit_per_box, cost_of_unsold)
+    report.update({
+        'kind': 'research',
+        'prob_research': list(prob_research),
+        'emv_research': research['emv'],
+        'research_cost': research_cost,
+    })
+    return report
+
+# --- Шаблоны: фигура строится один раз, для каждого отчета обновляются данные ---
+
+def _bar_panel(ax, num_bars):
+    bars = ax.bar(np.arange(num_bars), np.zeros(num_bars), edgecolor='black', linewidth=1.5)
+    labels = [ax.text(k, 0.0, '', ha='center', va='bottom', fontsize=11, weight='bold') for k in range(num_bars)]
+    ax.set_xticks(np.arange(num_bars))
+    ax.grid(axis='y', alpha=0.3)
+    return bars, labels
+
+def _update_bars(ax, bars, labels, values, colors, tick_labels):
+    values = np.asarray(values, dtype=float)
+    for bar, label, value, color in zip(bars, labels, values, colors):
+        bar.set_height(value)
+        bar.set_color(color)
+        bar.set_edgecolor('black')
+        label.set_position((bar.get_x() + bar.get_width() / 2, value))
+        label.set_text(f"{value:.2f}")
+    low, high = values.min(), values.max()
+    margin = max(0.1 * (high - low), 0.05 * max(abs(high), abs(low), 1.0))
+    ax.set_ylim(min(0.0, low - margin) if low < 0 else low - 3 * margin, high + 2 * margin)
+    ax.set_xticklabels(tick_labels)
+
+class DecisionFigure:
+    """Отчет task3: тепловая карта платежной матрицы и EMV стратегий."""
+
+    def __init__(self, num_actions, num_levels, dpi):
+        from matplotlib.figure import Figure
+        use_agg()
+        self.fig = Figure(figsize=(14, 6), dpi=dpi)
+        self.title = self.fig.suptitle('', fontsize=16, weight='bold')
+        self.ax_heat, self.ax_bar = self.fig.subplots(1, 2)
+        self.image = self.ax_heat.imshow(np.zeros((num_actions, num_levels)), cmap='viridis', aspect='auto')
+        self.fig.colorbar(self.image, ax=self.ax_heat, label='Прибыль (тыс. руб.)')
+        self.cells = [[self.ax_heat.text(j, i, '', ha='center', va='center', fontsize=12)
+                       for j in range(num_levels)] for i in range(num_actions)]
+        self.ax_heat.set_xticks(np.arange(num_levels))
+        self.ax_heat.set_yticks(np.arange(num_actions))
+        self.ax_heat.set_title('Платежная матрица (прибыль, тыс. руб.)', fontsize=13)
+        self.bars, self.bar_labels = _bar_panel(self.ax_bar, num_actions)
+        self.ax_bar.set_title('Сравнение стратегий по ожидаемой прибыли (EMV)', fontsize=13)
+        self.ax_bar.set_ylabel('EMV, тыс. руб.')
+        # Фиксированные поля вместо tight_layout: без движка компоновки savefig рисует фигуру один раз
+        self.fig.subplots_adjust(left=0.09, right=0.98, top=0.86, bottom=0.14, wspace=0.25)
+
+    def _update_heatmap(self, report):
+        payoff = np.asarray(report['payoff'], dtype=float)
+        low, high = payoff.min(), payoff.max()
+        self.image.set_data(payoff)
+        self.image.set_clim(low, high if high > low else low + 1.0)
+        middle = (low + high) / 2
+        for row, texts in zip(payoff, self.cells):
+            for value, text in zip(row, texts):
+                text.set_text(f"{value:.0f}")
+                text.set_color('white' if value < middle else 'black')
+        self.ax_heat.set_xticklabels([f"Спрос {d}\n(P={p:.2f})" for d, p in
+                                      zip(report['demand_levels'], report['probabilities'])])
+        self.ax_heat.set_yticklabels([f"Закупить {a}" for a in report['actions']])
+
+    def update(self, report):
+        self.title.set_text(f"Анализ закупок: {report['name']}")
+        self._update_heatmap(report)
+        emv = np.asarray(report['emv'])
+        colors = ['salmon' if k == emv.argmax() else 'skyblue' for k in range(len(emv))]
+        _update_bars(self.ax_bar, self.bars, self.bar_labels, emv, colors, [f"Закупить {a}" for a in report['actions']])
+
+    def save(self, path, fmt):
+        self.fig.savefig(path, format=fmt)
+
+class ResearchFigure(DecisionFigure):
+    """Отчет task4: платежная матрица, EMV без исследования и с ним, итоговое сравнение."""
+
+    def __init__(self, num_actions, num_levels, dpi):
+        from matplotlib.figure import Figure
+        use_agg()
+        self.fig = Figure(figsize=(16, 11), dpi=dpi)
+        self.title = self.fig.suptitle('', fontsize=16, weight='bold')
+        grid = self.fig.add_gridspec(3, 2, hspace=0.45, wspace=0.2)
+        self.ax_heat = self.fig.add_subplot(grid[0, :])
+        self.image = self.ax_heat.imshow(np.zeros((num_actions, num_levels)), cmap='RdYlGn', aspect='auto')
+        self.fig.colorbar(self.image, ax=self.ax_heat, label='Прибыль (тыс. руб.)')
+        self.cells = [[self.ax_heat.text(j, i, '', ha='center', va='center', fontsize=12, weight='bold')
+                       for j in range(num_levels)] for i in range(num_actions)]
+        self.ax_heat.set_xticks(np.arange(num_levels))
+        self.ax_heat.set_yticks(np.arange(num_actions))
+        self.ax_heat.set_title('Платежная матрица', fontsize=13, weight='bold')
+        self.ax_orig = self.fig.add_subplot(grid[1, 0])
+        self.ax_res = self.fig.add_subplot(grid[1, 1])
+        self.ax_final = self.fig.add_subplot(grid[2, :])
+        self.orig = _bar_panel(self.ax_orig, num_actions)
+        self.res = _bar_panel(self.ax_res, num_actions)
+        self.final = _bar_panel(self.ax_final, 3)
+        self.ax_final.set_title('Итоговое сравнение: проводить ли исследование?', fontsize=13, weight='bold')
+        self.verdict = self.ax_final.text(0.5, 0.95, '', transform=self.ax_final.transAxes, fontsize=14,
+                                          weight='bold', ha='center', va='top',
+                                          bbox=dict(boxstyle='round,pad=0.6', facecolor='lightyellow'))
+        self.fig.subplots_adjust(left=0.07, right=0.97, top=0.91, bottom=0.07)
+
+    def _update_heatmap(self, report):
+        super()._update_heatmap(report)
+        for texts in self.cells:
+            for text in texts:
+                text.set_color('black')
+
+    def update(self, report):
+        self.title.set_text(f"Решение о проведении исследования рынка: {report['name']}")
+        self._update_heatmap(report)
+        strategies = [f"Закупить {a}" for a in report['actions']]
+        emv, emv_research = np.asarray(report['emv']), np.asarray(report['emv_research'])
+        for ax, (bars, labels), values, probabilities, title, color in (
+                (self.ax_orig, self.orig, emv, report['probabilities'], 'БЕЗ исследования', '#4ECDC4'),
+                (self.ax_res, self.res, emv_research, report['prob_research'], 'С исследованием', '#95E1D3')):
+            colors = [color if k == values.argmax() else '#FF6B6B' for k in range(len(values))]
+            _update_bars(ax, bars, labels, values, colors, strategies)
+            ax.set_title(f"{title}\nВероятности: {[round(p, 3) for p in probabilities]}", fontsize=12, weight='bold')
+
+        best, best_research = emv.max(), emv_research.max()
+        net = best_research - report['research_cost']
+        conduct = net > best
+        final = [best, best_research, net]
+        colors = ['#F38181', '#95E1D3', '#4ECDC4'] if conduct else ['#4ECDC4', '#95E1D3', '#F38181']
+        _update_bars(self.ax_final, *self.final, final, colors,
+                     ['БЕЗ исследования', 'С исследованием\n(до вычета стоимости)', 'С исследованием\n(чистая прибыль)'])
+        self.verdict.set_text(f"{'[V]' if conduct else '[X]'} РЕШЕНИЕ: {'Проводить' if conduct else 'НЕ проводить'} исследование")
+        self.verdict.set_color('darkgreen' if conduct else 'darkred')
+
+TEMPLATES = {'decision': DecisionFigure, 'research': ResearchFigure}
+
+# Шаблоны, уже построенные в этом процессе: (вид, форма матрицы, dpi) -> фигура
+_figures = {}
+
+def render_report(report, path, dpi=100, fmt='png'):
+    """Рисует один отчет, переиспользуя фигуру-шаблон того же вида и размера."""
+    shape = np.shape(report['payoff'])
+    key = (report['kind'], shape, dpi)
+    if key not in _figures:
+        _figures[key] = TEMPLATES[report['kind']](*shape, dpi)
+    figure = _figures[key]
+    figure.update(report)
+    figure.save(path, fmt)
+    return path
+
+def render_file(report, path, dpi=100, fmt='png', force=False):
+    """
+    Рисует один отчет в файл path, если его входные данные (вместе с dpi,
+    форматом и версией шаблона) изменились. Хеш хранится в RenderCache
+    каталога файла. Возвращает True, если файл перерисован.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат: {fmt}. Доступны: {', '.join(FORMATS)}")
+    path = Path(path)
+    cache = RenderCache(path.parent)
+    digest = content_hash(TEMPLATE_VERSION, report, dpi, fmt)
+    if not force and cache.is_fresh(path.name, digest):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    render_report(report, str(path), dpi, fmt)
+    cache.record(path.name, digest)
+    cache.save()
+    return True
+
+def _render_chunk(tasks):
+    """Выполняется в процессе-исполнителе: последовательность отчетов на одних шаблонах."""
+    return [render_report(*task) for task in tasks]
+
+def render_reports(reports, directory, dpi=100, fmt='png', workers=None, force=False):
+    """
+    Рисует отчеты (словари decision_report / research_report) в файлы
+    directory/<name>.<fmt>. Отчеты, входные данные которых (вместе с dpi,
+    форматом и версией шаблона) не изменились с прошлого раза, пропускаются
+    по хешу из RenderCache; force=True перерисовывает все. Оставшиеся
+    отчеты делятся на непрерывные части по процессам пула (workers=0 — без
+    пула), и каждый процесс переиспользует свои шаблоны фигур.
+
+    Возвращает словарь: rendered и skipped (пути к файлам), time.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат: {fmt}. Доступны: {', '.join(FORMATS)}")
+    started = time.perf_counter()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    cache = RenderCache(directory)
+
+    pending, digests, skipped = [], [], []
+    for report in reports:
+        filename = f"{report['name']}.{fmt}"
+        digest = content_hash(TEMPLATE_VERSION, report, dpi, fmt)
+        if not force and cache.is_fresh(filename, digest):
+            skipped.append(str(directory / filename))
+            continue
+        pending.append((report, str(directory / filename), dpi, fmt))
+        digests.append((filename, digest))
+
+    num_workers = 0 if workers == 0 else min(workers or os.cpu_count() or 1, len(pending))
+    if num_workers <= 1:
+        rendered = _render_chunk(pending)
+    else:
+        size = -(-len(pending) // num_workers)
+        chunks = [pending[start:start + size] for start in range(0, len(pending), size)]
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            rendered = [path for chunk in pool.map(_render_chunk, chunks) for path in chunk]
+
+    for filename, digest in digests:
+        cache.record(filename, digest)
+    cache.save()
+    return {'rendered': rendered, 'skipped': skipped, 'time': time.perf_counter() - started}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Пакетное построение отчетов о закупках по товарам")
+    parser.add_argument('--skus', type=int, default=200, help="число товаров (отчетов)")
+    parser.add_argument('--kind', choices=TEMPLATES, default='decision')
+    parser.add_argument('--out', default='reports', help="каталог для графиков")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--format', choices=FORMATS, default='png')
+    parser.add_argument('--workers', type=int, default=None, help="число процессов (0 — без пула)")
+    parser.add_argument('--force', action='store_true', help="перерисовать и неизмененные отчеты")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    actions = demand_levels = [11, 12, 13]
+    reports = []
+    for k in range(args.skus):
+        probabilities = rng.dirichlet(np.ones(3))
+        profit, cost = rng.uniform(20, 50), rng.uniform(30, 70)
+        if args.kind == 'decision':
+            reports.append(decision_report(f"sku_{k:05d}", actions, demand_levels, probabilities, profit, cost))
+        else:
+            reports.append(research_report(f"sku_{k:05d}", actions, demand_levels, probabilities,
+                                           rng.dirichlet(np.ones(3)), profit, cost, rng.uniform(5, 30)))
+
+    result = render_reports(reports, args.out, dpi=args.dpi, fmt=args.format, workers=args.workers, force=args.force)
+    count = len(result['rendered'])
+    print(f"📊 Построено отчетов: {count}, пропущено без изменений: {len(result['skipped'])}, "
+          f"время: {result['time']:.2f} с" + (f" ({result['time'] / count * 1e3:.0f} мс на отчет)" if count else ""))
@@ -0,0 +1,245 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from .decision_engine import payoff_matrix
+
+# Модели спроса и их параметры по умолчанию (задача «Фото КОЛОР» и тяжелохвостые варианты)
+DEMAND_MODELS = {
+    'empirical': {'levels': (11, 12, 13), 'probabilities': (0.45, 0.35, 0.20)},
+    'poisson': {'lam': 11.8},
+    'lognormal': {'mean': 11.8, 'sigma': 0.3},
+    'pareto': {'scale': 9.0, 'shape': 4.0},
+}
+
+class DemandModel:
+    """
+    Распределение спроса (ящиков в неделю), из которого выборки берутся
+    большими блоками. kind — ключ DEMAND_MODELS; params переопределяют
+    параметры по умолчанию:
+      empirical — levels, probabilities (эмпирическое распределение);
+      poisson   — lam;
+      lognormal — mean (среднее), sigma (стандартное отклонение логарифма);
+      pareto    — scale (минимальный спрос), shape (индекс хвоста).
+    Непрерывные модели округляются до целого числа ящиков.
+    """
+
+    def __init__(self, kind='empirical', **params):
+        if kind not in DEMAND_MODELS:
+            raise ValueError(f"Неизвестная модель спроса: {kind}. Доступны: {', '.join(DEMAND_MODELS)}")
+        self.kind = kind
+        self.params = {**DEMAND_MODELS[kind], **params}
+
+    def sample(self, rng, size):
+        p = self.params
+        if self.kind == 'empirical':
+            return rng.choice(np.asarray(p['levels'], dtype=float), size=size, p=p['probabilities'])
+        if self.kind == 'poisson':
+            return rng.poisson(p['lam'], size=size).astype(float)
+        if self.kind == 'lognormal':
+            mu = np.log(p['mean']) - 0.5 * p['sigma'] ** 2
+            return np.rint(rng.lognormal(mu, p['sigma'], size=size))
+        return np.rint(p['scale'] * (1.0 + rng.pareto(p['shape'], size=size)))
+
+def _profit_bounds(stock_levels, profit_per_box, cost_of_unsold):
+    """Прибыль политики лежит в [-c·s, p·s]: от нулевого спроса до продажи всей закупки."""
+    low = -cost_of_unsold * stock_levels
+    high = profit_per_box * stock_levels
+    return low, np.maximum(high, low + 1e-9)
+
+def simulate_block(model, stock_levels, profit_per_box, cost_of_unsold, num_samples, seed, bins):
+    """
+    Выполняется в процессе-исполнителе: num_samples выборок спроса из
+    собственного потока seed (SeedSequence), прибыль всех политик на одних
+    и тех же выборках. Возвращает частичные суммы для SimulationStatistics.
+    """
+    rng = np.random.default_rng(seed)
+    stock_levels = np.asarray(stock_levels, dtype=float)
+    demand = model.sample(rng, num_samples)
+    profits = payoff_matrix(stock_levels, demand, profit_per_box, cost_of_unsold)
+
+    low, high = _profit_bounds(stock_levels, profit_per_box, cost_of_unsold)
+    index = ((profits - low[:, None]) / (high - low)[:, None] * bins).astype(np.int64)
+    np.clip(index, 0, bins - 1, out=index)
+    index += np.arange(len(stock_levels))[:, None] * bins
+    cells = len(stock_levels) * bins
+    return {
+        'count': num_samples,
+        'sum': profits.sum(axis=1),
+        'cross': profits @ profits.T,
+        'losses': np.count_nonzero(profits < 0, axis=1),
+        'histogram': np.bincount(index.ravel(), minlength=cells).reshape(-1, bins),
+        'bin_sums': np.bincount(index.ravel(), weights=profits.ravel(), minlength=cells).reshape(-1, bins),
+    }
+
+class SimulationStatistics:
+    """
+    Потоковые оценки по политикам: сумма, матрица сумм попарных произведений
+    (для дисперсий разностей политик на общих выборках), число убыточных
+    исходов и гистограмма прибыли на фиксированной сетке [-c·s, p·s] вместе
+    с суммами прибыли в каждом интервале — по ним оцениваются квантили и CVaR
+    без хранения выборок.
+    """
+
+    def __init__(self, stock_levels, profit_per_box, cost_of_unsold, bins):
+        self.stock_levels = np.asarray(stock_levels, dtype=float)
+        k = len(self.stock_levels)
+        self.bins = bins
+        self.low, self.high = _profit_bounds(self.stock_levels, profit_per_box, cost_of_unsold)
+        self.count = 0
+        self.sum = np.zeros(k)
+        self.cross = np.zeros((k, k))
+        self.losses = np.zeros(k, dtype=np.int64)
+        self.histogram = np.zeros((k, bins), dtype=np.int64)
+        self.bin_sums = np.zeros((k, bins))
+
+    def add(self, block):
+        self.count += block['count']
+        self.sum += block['sum']
+        self.cross += block['cross']
+        self.losses += block['losses']
+        self.histogram += block['histogram']
+        self.bin_sums += block['bin_sums']
+
+    def mean(self):
+        return self.sum / self.count
+
+    def covariance(self):
+        mean = self.mean()
+        return (self.cross - self.count * np.outer(mean, mean)) / max(1, self.count - 1)
+
+    def separation(self, confidence):
+        """
+        Отделена ли лучшая по среднему политика от остальных: для каждой
+        другой политики нижняя граница доверительного интервала разности
+        средних (на общих выборках) положительна. Уровень доверия делится
+        между K - 1 сравнениями (поправка Бонферрони).
+        """
+        mean, cov = self.mean(), self.covariance()
+        best = int(np.argmax(mean))
+        others = np.arange(len(mean)) != best
+        if not others.any():
+            return best, True
+        z = NormalDist().inv_cdf(1 - (1 - confidence) / (2 * others.sum()))
+        diff_var = cov[best, best] + np.diag(cov)[others] - 2 * cov[best, others]
+        margin = z * np.sqrt(np.maximum(diff_var, 0.0) / self.count)
+        return best, bool(np.all(mean[best] - mean[others] > margin))
+
+    def tail(self, alpha):
+        """
+        VaR (alpha-квантиль прибыли) и CVaR (средняя прибыль в худших alpha·n
+        исходах) по гистограмме: интервалы берутся целиком с их точной суммой,
+        последний частично — по среднему значению в нем.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bin_mean = np.where(self.histogram > 0, self.bin_sums / self.histogram, 0.0)
+        need = alpha * self.count
+        before = np.cumsum(self.histogram, axis=1) - self.histogram
+        taken = np.clip(need - before, 0, self.histogram)
+        cvar = (taken * bin_mean).sum(axis=1) / need
+        quantile_bin = np.argmax(before + self.histogram >= need, axis=1)
+        var = bin_mean[np.arange(len(bin_mean)), quantile_bin]
+        return var, cvar
+
+    def summary(self, confidence=0.95, cvar_alpha=0.05):
+        mean = self.mean()
+        std = np.sqrt(np.maximum(np.diag(self.covariance()), 0.0))
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * std / np.sqrt(self.count)
+        var, cvar = self.tail(cvar_alpha)
+        best, separated = self.separation(confidence)
+        return {
+            'samples': self.count,
+            'stock_levels': self.stock_levels,
+            'mean': mean,
+            'ci_low': mean - half_width,
+            'ci_high': mean + half_width,
+            'std': std,
+            'prob_loss': self.losses / self.count,
+            'var': var,
+            'cvar': cvar,
+            'histogram': self.histogram,
+            'histogram_range': (self.low, self.high),
+            'best': best,
+            'separated': separated,
+        }
+
+def simulate_policies(model, stock_levels, profit_per_box, cost_of_unsold, block_size=1 << 16,
+                      max_samples=10_000_000, min_samples=50_000, confidence=0.95, cvar_alpha=0.05,
+                      workers=None, seed=0, bins=4096):
+    """
+    Имитационное сравнение политик закупки (stock_levels) при спросе из model.
+
+    Выборки генерируются блоками по block_size в пуле процессов; каждый блок
+    получает собственный независимый поток SeedSequence(seed).spawn(...),
+    поэтому результат воспроизводим при любом числе процессов. Все политики
+    оцениваются на одних и тех же выборках (общие случайные числа), что
+    сужает интервалы для разностей. После каждого раунда (по блоку на
+    процесс) оценки обновляются; моделирование останавливается, когда
+    доверительные интервалы разностей отделяют лучшую политику от
+    остальных, или по достижении max_samples. workers=0 — без пула.
+
+    Возвращает summary из SimulationStatistics: средняя прибыль и
+    доверительный интервал, стандартное отклонение, вероятность убытка, VaR
+    и CVaR уровня cvar_alpha, гистограммы прибыли; плюс samples, rounds и
+    stopped_early.
+    """
+    stats = SimulationStatistics(stock_levels, profit_per_box, cost_of_unsold, bins)
+    root = np.random.SeedSequence(seed)
+    per_round = 1 if workers == 0 else (workers or os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers=per_round) if workers != 0 else None
+    rounds = 0
+    stopped_early = False
+    try:
+        while stats.count < max_samples:
+            sizes = [min(block_size, max_samples - stats.count - i * block_size) for i in range(per_round)]
+            sizes = [size for size in sizes if size > 0]
+            seeds = root.spawn(len(sizes))
+            args = [(model, stock_levels, profit_per_box, cost_of_unsold, size, s, bins) for size, s in zip(sizes, seeds)]
+            blocks = pool.map(simulate_block, *zip(*args)) if pool else [simulate_block(*a) for a in args]
+            for block in blocks:
+                stats.add(block)
+            rounds += 1
+            if stats.count >= min_samples and stats.separation(confidence)[1]:
+                stopped_early = stats.count < max_samples
+                break
+    finally:
+        if pool:
+            pool.shutdown()
+
+    result = stats.summary(confidence, cvar_alpha)
+    result.update({'rounds': rounds, 'stopped_early': stopped_early})
+    return result
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Имитационное моделирование политик закупки")
+    parser.add_argument('--demand', choices=DEMAND_MODELS, default='empirical', help="модель спроса")
+    parser.add_argument('--stock', type=int, nargs='+', default=[11, 12, 13], help="варианты закупки")
+    parser.add_argument('--profit', type=float, default=35.0)
+    parser.add_argument('--cost', type=float, default=56.0)
+    parser.add_argument('--workers', type=int, default=None, help="число процессов (0 — без пула)")
+    parser.add_argument('--max-samples', type=int, default=10_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    model = DemandModel(args.demand)
+    print(f"--- Имитация спроса: {args.demand} {model.params} ---")
+    started = time.perf_counter()
+    result = simulate_policies(model, args.stock, args.profit, args.cost, max_samples=args.max_samples,
+                               workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"Выборок: {result['samples']:,} за {result['rounds']} раундов, {elapsed:.2f} с"
+          f"{' (остановлено досрочно)' if result['stopped_early'] else ''}\n")
+    print(f"{'Закупка':>8}{'Средняя прибыль':>18}{'95% интервал':>24}{'P(убыток)':>11}{'VaR 5%':>10}{'CVaR 5%':>10}")
+    for k, stock in enumerate(args.stock):
+        interval = f"[{result['ci_low'][k]:.2f}; {result['ci_high'][k]:.2f}]"
+        print(f"{stock:>8}{result['mean'][k]:>18.2f}{interval:>24}{result['prob_loss'][k]:>11.2%}"
+              f"{result['var'][k]:>10.1f}{result['cvar'][k]:>10.1f}")
+    verdict = "отделена от остальных" if result['separated'] else "не отделена (интервалы пересекаются)"
+    print(f"\n✅ Лучшая политика: закупать {args.stock[result['best']]} — {verdict}")
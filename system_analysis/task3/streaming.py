@@ -0,0 +1,215 @@
+import time
+
+import numpy as np
+
+from .decision_engine import payoff_matrix
+
+# Порог масштаба весов: при ленивом затухании новые наблюдения получают вес
+# decay^(-n), и при его превышении суммы потока нормируются заново
+RESCALE_AT = 1e100
+
+class StreamingEMV:
+    """
+    Потоковая оценка EMV для num_streams независимых потоков спроса
+    (товаров, SKU) по еженедельным продажам.
+
+    Для каждого потока хранятся взвешенные суммы выигрышей всех действий
+    S_a = sum_t w_t payoff(a, d_t) и сумма весов W, так что EMV_a = S_a / W.
+    Новое наблюдение добавляет столбец платежной матрицы — O(числа действий),
+    без пересчета матрицы. При decay < 1 старые недели забываются
+    экспоненциально: вместо умножения всех сумм на decay каждое новое
+    наблюдение получает вес decay^(-n) (ленивое затухание), а суммы
+    нормируются, когда вес превышает RESCALE_AT.
+
+    demand_levels (необязательно) — уровни спроса для гистограммы,
+    оценивающей вероятности спроса; наблюдение относится к наименьшему
+    уровню не ниже него. prior и prior_weight задают начальные вероятности
+    с весом prior_weight недель (например, [0.45, 0.35, 0.20]).
+    """
+
+    def __init__(self, actions, profit_per_box, cost_of_unsold, num_streams=1, decay=1.0,
+                 demand_levels=None, prior=None, prior_weight=0.0):
+        if not 0 < decay <= 1:
+            raise ValueError("Коэффициент затухания должен лежать в (0, 1]")
+        self.actions = np.asarray(actions, dtype=float)
+        self.profit, self.cost = profit_per_box, cost_of_unsold
+        self.decay = decay
+        self.scores = np.zeros((num_streams, len(self.actions)))
+        self.weight = np.zeros(num_streams)
+        self.scale = np.ones(num_streams)
+        self.levels = None if demand_levels is None else np.asarray(demand_levels, dtype=float)
+        self.histogram = None if self.levels is None else np.zeros((num_streams, len(self.levels)))
+        if prior is not None and prior_weight > 0:
+            if self.levels is None:
+                raise ValueError("Для начальных вероятностей нужны уровни спроса demand_levels")
+            prior = np.asarray(prior, dtype=float)
+            payoff = payoff_matrix(self.actions, self.levels, profit_per_box, cost_of_unsold)
+            self.scores[:] = prior_weight * (payoff @ prior)
+            self.weight[:] = prior_weight
+            self.histogram[:] = prior_weight * prior
+        # -1 — рекомендации еще нет (нет наблюдений)
+        self.best = np.where(self.weight > 0, self.scores.argmax(axis=1), -1)
+
+    def _observation_weights(self, streams):
+        """
+        Веса наблюдений пакета при ленивом затухании: k-е наблюдение потока в
+        пакете получает scale * decay^(-k). Возвращает веса и затронутые потоки
+        (по возрастанию).
+        """
+        if np.all(streams[1:] > streams[:-1]):
+            # Каждый поток не более одного раза (например, недельный срез всех товаров) — без сортировки
+            if self.decay == 1.0:
+                return np.ones(len(streams)), streams
+            weights = self.scale[streams] / self.decay
+            self.scale[streams] = weights
+            return weights, streams
+        touched, inverse, counts = np.unique(streams, return_inverse=True, return_counts=True)
+        if self.decay == 1.0:
+            return np.ones(len(streams)), touched
+        order = np.argsort(inverse, kind='stable')
+        starts = np.cumsum(counts) - counts
+        rank = np.empty(len(streams), dtype=np.int64)
+        rank[order] = np.arange(len(streams)) - np.repeat(starts, counts)
+        weights = self.scale[streams] * self.decay ** -(rank + 1.0)
+        self.scale[touched] *= self.decay ** -counts.astype(float)
+        return weights, touched
+
+    def _rescale(self, touched):
+        big = touched[self.scale[touched] > RESCALE_AT]
+        if len(big):
+            factor = self.scale[big]
+            self.scores[big] /= factor[:, None]
+            self.weight[big] /= factor
+            if self.histogram is not None:
+                self.histogram[big] /= factor[:, None]
+            self.scale[big] = 1.0
+
+    def update(self, streams, demand):
+        """
+        Добавляет наблюдения спроса demand для потоков streams (скаляры или
+        массивы одинаковой длины; поток может встречаться несколько раз —
+        наблюдения учитываются по порядку).
+
+        Возвращает словарь только по потокам, у которых сменилось лучшее
+        действие: streams, previous (прежняя закупка, NaN — рекомендации не
+        было), action (новая закупка), emv (ее EMV).
+        """
+        streams = np.atleast_1d(np.asarray(streams, dtype=np.int64))
+        demand = np.atleast_1d(np.asarray(demand, dtype=float))
+        weights, touched = self._observation_weights(streams)
+
+        # Столбцы платежной матрицы для наблюдений, взвешенные: (наблюдения x действия)
+        columns = payoff_matrix(self.actions, demand, self.profit, self.cost).T * weights[:, None]
+        if len(touched) == len(streams):
+            # Без повторов; срез всех потоков по порядку (ровно 0..N-1) — без индексации,
+            # перестановку всех потоков раскладываем по строкам streams
+            in_order = len(streams) == len(self.weight) and np.all(streams[1:] > streams[:-1])
+            rows = slice(None) if in_order else streams
+            self.scores[rows] += columns
+            self.weight[rows] += weights
+        else:
+            np.add.at(self.scores, streams, columns)
+            np.add.at(self.weight, streams, weights)
+        if self.histogram is not None:
+            bins = np.minimum(np.searchsorted(self.levels, demand), len(self.levels) - 1)
+            np.add.at(self.histogram, (streams, bins), weights)
+        self._rescale(touched)
+
+        rows = slice(None) if len(touched) == len(self.weight) else touched
+        best = self.scores[rows].argmax(axis=1)
+        changed = best != self.best[rows]
+        flipped, previous, best = touched[changed], self.best[rows][changed], best[changed]
+        self.best[flipped] = best
+        return {
+            'streams': flipped,
+            'previous': np.where(previous >= 0, self.actions[np.maximum(previous, 0)], np.nan),
+            'action': self.actions[best],
+            'emv': self.scores[flipped, best] / self.weight[flipped],
+        }
+
+    def emv(self, streams=None):
+        """Текущие EMV всех действий (потоки x действия)."""
+        rows = slice(None) if streams is None else streams
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.scores[rows] / self.weight[rows, None]
+
+    def probabilities(self, streams=None):
+        """Оценка вероятностей уровней спроса по (затухающей) гистограмме."""
+        if self.histogram is None:
+            raise ValueError("Гистограмма не ведется: не заданы уровни спроса demand_levels")
+        rows = slice(None) if streams is None else streams
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.histogram[rows] / self.weight[rows, None]
+
+    def recommendation(self, streams=None):
+        """Рекомендуемая закупка по каждому потоку (NaN — наблюдений еще нет)."""
+        best = self.best if streams is None else self.best[streams]
+        return np.where(best >= 0, self.actions[np.maximum(best, 0)], np.nan)
+
+def check_against_batch(num_streams=50, num_observations=20000, seed=0):
+    """
+    Сверяет потоковые EMV с прямым пересчетом по всей истории (с весами
+    decay^(n - t)); при decay = 0.3 суммы успевают несколько раз
+    нормироваться. Возвращает число расхождений.
+    """
+    rng = np.random.default_rng(seed)
+    actions = np.arange(5, 20)
+    mismatches = 0
+    for decay in (1.0, 0.97, 0.3):
+        stream = StreamingEMV(actions, 35.0, 56.0, num_streams=num_streams, decay=decay)
+        ids = rng.integers(0, num_streams, size=num_observations)
+        demand = rng.integers(0, 25, size=num_observations)
+        for start in range(0, num_observations, 1000):
+            stream.update(ids[start:start + 1000], demand[start:start + 1000])
+        for s in range(num_streams):
+            history = demand[ids == s]
+            if not len(history):
+                continue
+            weights = decay ** np.arange(len(history) - 1, -1, -1.0)
+            reference = payoff_matrix(actions, history, 35.0, 56.0) @ weights / weights.sum()
+            if not np.allclose(stream.emv()[s], reference):
+                mismatches += 1
+    print(f"Проверено потоков: {3 * num_streams}, расхождений: {mismatches}")
+    return mismatches
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Потоковое обновление EMV по еженедельным продажам")
+    parser.add_argument('--skus', type=int, default=1_000_000, help="число потоков (товаров)")
+    parser.add_argument('--weeks', type=int, default=52)
+    parser.add_argument('--decay', type=float, default=0.95, help="коэффициент затухания (1 — без забывания)")
+    parser.add_argument('--check', action='store_true', help="сверить с пересчетом по всей истории")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if check_against_batch() else 0)
+
+    actions = demand_levels = [11, 12, 13]
+    rng = np.random.default_rng(0)
+
+    print("--- «Фото КОЛОР»: спрос постепенно растет, вероятности оцениваются по продажам ---")
+    stream = StreamingEMV(actions, 35.0, 56.0, decay=args.decay, demand_levels=demand_levels,
+                          prior=[0.45, 0.35, 0.20], prior_weight=10)
+    for week in range(1, args.weeks + 1):
+        shift = week / args.weeks
+        probabilities = np.array([0.45 - 0.4 * shift, 0.35, 0.20 + 0.4 * shift])
+        change = stream.update(0, rng.choice(demand_levels, p=probabilities))
+        if len(change['streams']):
+            estimate = ", ".join(f"{p:.2f}" for p in stream.probabilities()[0])
+            print(f"   Неделя {week:>2}: закупка {change['previous'][0]:.0f} → {change['action'][0]:.0f} "
+                  f"(EMV {change['emv'][0]:.2f}, оценка P = [{estimate}])")
+    print(f"   Итоговая рекомендация: {stream.recommendation()[0]:.0f} ящиков")
+
+    print(f"\n--- {args.skus:,} товаров, {args.weeks} недель ---")
+    bank = StreamingEMV(actions, 35.0, 56.0, num_streams=args.skus, decay=args.decay)
+    means = rng.uniform(10.5, 13.5, size=args.skus)
+    ids = np.arange(args.skus)
+    flips, started = 0, time.perf_counter()
+    for week in range(args.weeks):
+        demand = np.clip(np.rint(means + rng.normal(0, 1, size=args.skus)), 11, 13)
+        flips += len(bank.update(ids, demand)['streams'])
+    elapsed = time.perf_counter() - started
+    total = args.skus * args.weeks
+    print(f"Наблюдений: {total:,} за {elapsed:.2f} с ({total / elapsed:,.0f} в секунду)")
+    print(f"Смен рекомендаций: {flips:,} (включая первые рекомендации)")
@@ -0,0 +1,56 @@
+"""
+Потоковые EMV при пакетных обновлениях совпадают с последовательными:
+полный срез потоков в любом порядке, повторы потоков, затухание.
+
+    python -m pytest system_analysis/task3
+"""
+import numpy as np
+import pytest
+
+from system_analysis.task3 import streaming
+
+ACTIONS = DEMAND_LEVELS = [11, 12, 13]
+
+def make(num_streams, decay):
+    return streaming.StreamingEMV(ACTIONS, 35.0, 56.0, num_streams=num_streams, decay=decay,
+                                  demand_levels=DEMAND_LEVELS)
+
+def sequential(num_streams, decay, batches):
+    stream = make(num_streams, decay)
+    for ids, demand in batches:
+        for s, d in zip(ids, demand):
+            stream.update(s, d)
+    return stream
+
+def assert_same(batched, reference):
+    np.testing.assert_allclose(batched.emv(), reference.emv())
+    np.testing.assert_allclose(batched.probabilities(), reference.probabilities())
+    np.testing.assert_array_equal(batched.recommendation(), reference.recommendation())
+
+@pytest.mark.parametrize('decay', [1.0, 0.9])
+def test_permuted_full_batch(decay):
+    batches = [([2, 0, 1], [11, 12, 13]), ([1, 2, 0], [13, 13, 11])]
+    batched = make(3, decay)
+    for ids, demand in batches:
+        batched.update(ids, demand)
+    assert_same(batched, sequential(3, decay, batches))
+
+def test_permuted_full_batch_rows():
+    # Поток 0 получил спрос 12 — его строка, а не строка потока 2 (спрос 11)
+    stream = make(3, 1.0)
+    stream.update([2, 0, 1], [11, 12, 13])
+    np.testing.assert_allclose(stream.emv(), [[385, 420, 364], [385, 420, 455], [385, 329, 273]])
+
+@pytest.mark.parametrize('decay', [1.0, 0.97, 0.3])
+def test_random_batches(decay):
+    rng = np.random.default_rng(0)
+    num_streams = 7
+    batches = []
+    for size in (num_streams, num_streams, 3, 20, num_streams):
+        ids = rng.permutation(num_streams) if size == num_streams else rng.integers(0, num_streams, size=size)
+        batches.append((ids, rng.choice(DEMAND_LEVELS, size=len(ids))))
+    batches.append((np.arange(num_streams), rng.choice(DEMAND_LEVELS, size=num_streams)))
+    batched = make(num_streams, decay)
+    for ids, demand in batches:
+        batched.update(ids, demand)
+    assert_same(batched, sequential(num_streams, decay, batches))
@@ -0,0 +1 @@
+"""Решение о проведении исследования рынка (EVSI)."""
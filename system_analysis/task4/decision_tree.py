@@ -0,0 +1,253 @@
+import time
+
+import numpy as np
+
+from ..task3.decision_engine import payoff_matrix
+from .preposterior import noisy_study
+
+# Точность округления вероятностей и стоимостей в структурном ключе узла:
+# апостериорные вероятности, посчитанные в разном порядке, отличаются в последних битах
+KEY_DIGITS = 12
+
+class Terminal:
+    """Конечный узел: денежный результат."""
+    __slots__ = ('value', 'key')
+
+    def __init__(self, value, key):
+        self.value = value
+        self.key = key
+
+class ChanceNode:
+    """Случайный узел: исходы с вероятностями; ценность — EMV по исходам."""
+    __slots__ = ('name', 'labels', 'probabilities', 'children', 'key')
+
+    def __init__(self, name, labels, probabilities, children, key):
+        self.name = name
+        self.labels = labels
+        self.probabilities = probabilities
+        self.children = children
+        self.key = key
+
+class DecisionNode:
+    """Узел решения: альтернативы со стоимостью; ценность — лучшая альтернатива за вычетом стоимости."""
+    __slots__ = ('name', 'labels', 'costs', 'children', 'key')
+
+    def __init__(self, name, labels, costs, children, key):
+        self.name = name
+        self.labels = labels
+        self.costs = costs
+        self.children = children
+        self.key = key
+
+class DecisionTree:
+    """
+    Построитель многоэтапного дерева решений. Каждый узел при создании
+    получает структурный ключ — номер его структуры (тип, вероятности или
+    стоимости, ключи потомков) в таблице построителя. Одинаковые поддеревья
+    (с точностью до названий) получают один ключ, поэтому при свертке
+    (rollback) каждое из них вычисляется один раз, сколько бы копий ни было
+    в дереве. Узлы одного дерева нужно создавать одним построителем.
+    """
+
+    def __init__(self):
+        self._structures = {}
+
+    def _intern(self, structure):
+        return self._structures.setdefault(structure, len(self._structures))
+
+    def terminal(self, value):
+        value = float(value)
+        return Terminal(value, self._intern(('T', value)))
+
+    def chance(self, name, outcomes):
+        """outcomes — список (метка, вероятность, узел)."""
+        labels, probabilities, children = zip(*outcomes)
+        probabilities = np.array(probabilities, dtype=float)
+        key = self._intern(('C', tuple(np.round(probabilities, KEY_DIGITS)), tuple(c.key for c in children)))
+        return ChanceNode(name, labels, probabilities, children, key)
+
+    def decision(self, name, branches):
+        """branches — список (метка, узел) или (метка, узел, стоимость альтернативы)."""
+        labels = tuple(branch[0] for branch in branches)
+        children = tuple(branch[1] for branch in branches)
+        costs = np.array([branch[2] if len(branch) > 2 else 0.0 for branch in branches], dtype=float)
+        key = self._intern(('D', tuple(np.round(costs, KEY_DIGITS)), tuple(c.key for c in children)))
+        return DecisionNode(name, labels, costs, children, key)
+
+    def stock_decision(self, actions, demand_levels, probabilities, profit_per_box, cost_of_unsold,
+                       name="Закупка"):
+        """
+        Решение о закупке при заданном распределении спроса: для каждого
+        действия — случайный узел по уровням спроса с результатами из
+        платежной матрицы (payoff_matrix для всех пар).
+        """
+        payoff = payoff_matrix(actions, demand_levels, profit_per_box, cost_of_unsold)
+        branches = []
+        for action, row in zip(actions, payoff):
+            outcomes = [(f"спрос {d}", p, self.terminal(v)) for d, p, v in zip(demand_levels, probabilities, row)]
+            branches.append((f"закупить {action}", self.chance("Спрос", outcomes)))
+        return self.decision(name, branches)
+
+    @property
+    def unique_structures(self):
+        return len(self._structures)
+
+def _combine(node, rolled):
+    """Ценность узла по результатам свертки потомков: (ценность, лучшая альтернатива, размер поддерева)."""
+    values = np.array([r[0] for r in rolled])
+    size = 1 + sum(r[2] for r in rolled)
+    if isinstance(node, ChanceNode):
+        # EMV по исходам
+        return float(np.dot(values, node.probabilities)), None, size
+    net = values - node.costs
+    best = int(np.argmax(net))
+    return float(net[best]), best, size
+
+def _rollback(node, memo, counts):
+    """
+    Свертка дерева справа налево с запоминанием по структурному ключу.
+    memo[key] = (ценность, индекс лучшей альтернативы, размер поддерева).
+    """
+    cached = memo.get(node.key)
+    if cached is not None:
+        counts['reused'] += 1
+        return cached
+    counts['evaluated'] += 1
+    if isinstance(node, Terminal):
+        result = (node.value, None, 1)
+    else:
+        result = _combine(node, [_rollback(child, memo, counts) for child in node.children])
+    memo[node.key] = result
+    return result
+
+def _rollback_subtree(node):
+    """Выполняется в процессе-исполнителе: свертка одной ветви верхнего уровня."""
+    memo, counts = {}, {'evaluated': 0, 'reused': 0}
+    _rollback(node, memo, counts)
+    return memo, counts
+
+def optimal_strategy(node, memo, max_depth=None):
+    """
+    Оптимальная стратегия из узла по результатам свертки: для узла решения —
+    выбранная альтернатива и продолжение, для случайного — продолжения по
+    исходам. Случайные узлы, все исходы которых конечны, не раскрываются.
+    """
+    value, best, _ = memo[node.key]
+    if isinstance(node, Terminal) or max_depth == 0:
+        return {'value': value}
+    depth = None if max_depth is None else max_depth - 1
+    if isinstance(node, DecisionNode):
+        return {'node': node.name, 'choice': node.labels[best], 'value': value,
+                'then': optimal_strategy(node.children[best], memo, depth)}
+    if all(isinstance(child, Terminal) for child in node.children):
+        return {'node': node.name, 'value': value}
+    return {'node': node.name, 'value': value,
+            'outcomes': {label: (p, optimal_strategy(child, memo, depth))
+                         for label, p, child in zip(node.labels, node.probabilities, node.children)}}
+
+def format_strategy(strategy, indent=0):
+    """Оптимальная стратегия в виде строк с отступами."""
+    pad = "   " * indent
+    if 'choice' in strategy:
+        lines = [f"{pad}• {strategy['node']}: {strategy['choice']} (ценность {strategy['value']:.2f})"]
+        return lines + format_strategy(strategy['then'], indent + 1)
+    if 'outcomes' in strategy:
+        lines = [f"{pad}◦ {strategy['node']} (EMV {strategy['value']:.2f}):"]
+        for label, (p, sub) in strategy['outcomes'].items():
+            lines.append(f"{pad}   [{label}, P={p:.3f}]")
+            lines.extend(format_strategy(sub, indent + 2))
+        return lines
+    return []
+
+def rollback(root, workers=None, max_depth=None):
+    """
+    Свертка дерева решений. Одинаковые поддеревья вычисляются один раз
+    (запоминание по структурному ключу). При workers > 0 различные ветви
+    верхнего уровня сворачиваются параллельно в пуле процессов (у каждого
+    процесса своя таблица запоминания, одинаковые ветви отправляются один раз).
+
+    Возвращает словарь: value — ценность корня, strategy — оптимальная
+    стратегия (см. optimal_strategy, глубина ограничивается max_depth),
+    evaluated — число вычисленных узлов, reused — число узлов, взятых из
+    таблицы запоминания, tree_size — число узлов в дереве без учета
+    совпадений, time — время свертки.
+    """
+    started = time.perf_counter()
+    memo, counts = {}, {'evaluated': 0, 'reused': 0}
+    if workers and not isinstance(root, Terminal):
+        unique = list({child.key: child for child in root.children}.values())
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+            for sub_memo, sub_counts in pool.map(_rollback_subtree, unique):
+                memo.update(sub_memo)
+                counts['evaluated'] += sub_counts['evaluated']
+                counts['reused'] += sub_counts['reused']
+        # Корень сворачивается здесь; повторы ветвей верхнего уровня в пул не отправлялись
+        counts['evaluated'] += 1
+        counts['reused'] += len(root.children) - len(unique)
+        memo[root.key] = _combine(root, [memo[child.key] for child in root.children])
+        value, _, tree_size = memo[root.key]
+    else:
+        value, _, tree_size = _rollback(root, memo, counts)
+    return {
+        'value': value,
+        'strategy': optimal_strategy(root, memo, max_depth),
+        'evaluated': counts['evaluated'],
+        'reused': counts['reused'],
+        'tree_size': tree_size,
+        'time': time.perf_counter() - started,
+    }
+
+def sequential_testing_tree(tree, actions, demand_levels, prior, profit_per_box, cost_of_unsold,
+                            accuracy, test_cost, max_tests):
+    """
+    Дерево с последовательными исследованиями: перед каждым из max_tests
+    этапов можно провести еще одно исследование (стоимость test_cost,
+    сигнал верен с вероятностью accuracy) или перейти к закупке. Дерево
+    строится без сокращений — число узлов растет как (число сигналов)^max_tests,
+    а ветви с одинаковым апостериорным распределением (сигналы в разном
+    порядке) при свертке совпадают по структурному ключу.
+    """
+    likelihood = noisy_study(accuracy, len(demand_levels))
+
+    def build(prior, stage):
+        buy = tree.stock_decision(actions, demand_levels, prior, profit_per_box, cost_of_unsold)
+        if stage == max_tests:
+            return buy
+        joint = likelihood * prior[None, :]
+        signal_prob = joint.sum(axis=1)
+        outcomes = [(f"сигнал «спрос {d}»", p, build(joint[s] / p, stage + 1))
+                    for s, (d, p) in enumerate(zip(demand_levels, signal_prob)) if p > 0]
+        test = tree.chance(f"Исследование {stage + 1}", outcomes)
+        return tree.decision(f"Этап {stage + 1}", [("закупать сейчас", buy),
+                                                   (f"провести исследование {stage + 1}", test, test_cost)])
+
+    return build(np.asarray(prior, dtype=float), 0)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Дерево решений с последовательными исследованиями")
+    parser.add_argument('--tests', type=int, default=6, help="максимальное число последовательных исследований")
+    parser.add_argument('--accuracy', type=float, default=0.8, help="точность одного исследования")
+    parser.add_argument('--test-cost', type=float, default=5.0, help="стоимость одного исследования, тыс. руб.")
+    parser.add_argument('--workers', type=int, default=0, help="процессов для ветвей верхнего уровня (0 — без пула)")
+    parser.add_argument('--depth', type=int, default=4, help="глубина вывода стратегии")
+    args = parser.parse_args()
+
+    actions = demand_levels = [11, 12, 13]
+    prior = [0.45, 0.35, 0.20]
+
+    tree = DecisionTree()
+    started = time.perf_counter()
+    root = sequential_testing_tree(tree, actions, demand_levels, prior, 35.0, 56.0,
+                                   args.accuracy, args.test_cost, args.tests)
+    built = time.perf_counter() - started
+    result = rollback(root, workers=args.workers or None, max_depth=args.depth)
+
+    print(f"--- До {args.tests} исследований (точность {args.accuracy}, стоимость {args.test_cost}) ---")
+    print(f"Узлов в дереве: {result['tree_size']:,}, различных структур: {tree.unique_structures:,}")
+    print(f"Вычислено узлов: {result['evaluated']:,}, повторно использовано: {result['reused']:,}")
+    print(f"Построение: {built:.2f} с, свертка: {result['time']:.3f} с")
+    print(f"\n✅ Ожидаемая прибыль оптимальной стратегии: {result['value']:.2f} тыс. руб.")
+    print("\n".join(format_strategy(result['strategy'])))
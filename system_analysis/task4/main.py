@@ -0,0 +1,246 @@
+import numpy as np
+
+from ..cache import ResultCache, stable_hash
+from ..instrument import add_arguments, count, echo, session_from_args, span
+from ..results import ResearchResult, ResultLog, save_result
+from ..task3.decision_engine import evaluate_criteria, payoff_matrix
+from ..task3.reports import FORMATS, PayoffTable, render_file, research_report
+from .decision_tree import DecisionTree, format_strategy, rollback
+from .preposterior import noisy_study, preposterior_analysis
+
+# Версия анализа в ключе кэша результатов: увеличивается при изменении результатов
+ANALYSIS_VERSION = 2
+
+def solve_decision_with_research(plot=True, dpi=300, fmt='png', profit_per_box=35.0, cost_of_unsold=56.0,
+                                 research_cost=15.0, actions=(11, 12, 13), demand_levels=(11, 12, 13),
+                                 prob_original=(0.45, 0.35, 0.20), prob_research=(0.40, 0.35, 0.25),
+                                 study_accuracy=0.8, cache=None, output=None):
+    """
+    Решает задачу принятия решений с возможностью дополнительного исследования.
+    plot=False — без построения графика (matplotlib не загружается).
+
+    По умолчанию — данные задачи «Фото КОЛОР»: prob_original — вероятности
+    спроса без исследования, prob_research — уточненные исследованием,
+    study_accuracy — вероятность, с которой исследование называет истинный
+    уровень спроса (для байесовского анализа). cache — ResultCache: для уже
+    проанализированных данных печатается только итог из кэша, отчет и
+    график не строятся. output — файл графика (по умолчанию
+    decision_analysis_with_research.<fmt>).
+
+    Возвращает ResearchResult (system_analysis/results.py): итоговое решение,
+    EVSI/EVPI, платежную матрицу, вероятности и EMV действий, апостериорные
+    вероятности и действия по сигналам — массивами, без копий.
+    """
+    # --- 1. Исходные данные ---
+    actions, demand_levels = list(actions), list(demand_levels)
+    prob_original, prob_research = list(prob_original), list(prob_research)
+
+    if cache is not None:
+        key = stable_hash('research', ANALYSIS_VERSION, profit_per_box, cost_of_unsold, research_cost,
+                          actions, demand_levels, prob_original, prob_research, study_accuracy)
+        cached = cache.get(key)
+        if cached is not None:
+            cached = ResearchResult(**cached)
+            echo(f"♻️  Результат из кэша: {'проводить' if cached.conduct_research else 'НЕ проводить'} "
+                  f"исследование, закупка {cached.optimal_action} ящиков, "
+                  f"ожидаемая прибыль {cached.expected_profit:.2f} тыс. руб. (EVSI {cached.evsi:.2f})")
+            return cached
+
+    echo("=" * 80)
+    echo("🔬 АНАЛИЗ РЕШЕНИЯ О ПРОВЕДЕНИИ ДОПОЛНИТЕЛЬНОГО ИССЛЕДОВАНИЯ")
+    echo("   Задача «Фото КОЛОР»")
+    echo("=" * 80)
+    echo(f"\n📌 Экономические параметры:")
+    echo(f"   • Прибыль с проданного ящика: {profit_per_box} тыс. руб.")
+    echo(f"   • Убыток с непроданного ящика: {cost_of_unsold} тыс. руб.")
+    echo(f"   • Стоимость исследования: {research_cost} тыс. руб.")
+
+    # --- 2. Построение платежной матрицы ---
+    with span('payoff'):
+        payoff = payoff_matrix(actions, demand_levels, profit_per_box, cost_of_unsold)
+    count('payoff_cells', payoff.size)
+    
+    payoff_table = PayoffTable(
+        payoff,
+        index=[f"Закупить {a}" for a in actions],
+        columns=[f"Спрос {d}" for d in demand_levels]
+    )
+    
+    echo("\n" + "─" * 80)
+    echo("📊 ШАГ 1: Платежная матрица (одинакова для обоих сценариев)")
+    echo("─" * 80)
+    echo(payoff_table)
+
+    # --- 3. Расчет EMV БЕЗ исследования ---
+    echo("\n" + "─" * 80)
+    echo("📈 ШАГ 2: Анализ ИСХОДНОЙ ситуации (БЕЗ исследования)")
+    echo("─" * 80)
+    echo("Вероятности спроса: " + ", ".join(f"P({d})={p}" for d, p in zip(demand_levels, prob_original)))
+    echo()
+    
+    with span('criteria', scenario='original'):
+        criteria_original = evaluate_criteria(actions, demand_levels, prob_original, profit_per_box, cost_of_unsold)
+    emv_original = dict(zip(actions, criteria_original['emv']))
+    for stock, emv in emv_original.items():
+        echo(f"   EMV(Закупить {stock}) = {emv:.2f} тыс. руб.")
+    
+    optimal_original = actions[criteria_original['best']['emv']]
+    max_emv_original = emv_original[optimal_original]
+    
+    echo(f"\n   ✅ Оптимально БЕЗ исследования: закупать {optimal_original} ящиков")
+    echo(f"   💰 Ожидаемая прибыль: {max_emv_original:.2f} тыс. руб.")
+
+    # --- 4. Расчет EMV С исследованием ---
+    echo("\n" + "─" * 80)
+    echo("🔬 ШАГ 3: Анализ ситуации С исследованием")
+    echo("─" * 80)
+    echo("Уточненные вероятности: " + ", ".join(f"P({d})={p}" for d, p in zip(demand_levels, prob_research)))
+    echo()
+    
+    with span('criteria', scenario='research'):
+        criteria_research = evaluate_criteria(actions, demand_levels, prob_research, profit_per_box, cost_of_unsold)
+    emv_research = dict(zip(actions, criteria_research['emv']))
+    for stock, emv in emv_research.items():
+        echo(f"   EMV(Закупить {stock}) = {emv:.2f} тыс. руб.")
+    
+    optimal_research = actions[criteria_research['best']['emv']]
+    max_emv_research = emv_research[optimal_research]
+    
+    echo(f"\n   ✅ Оптимально С исследованием: закупать {optimal_research} ящиков")
+    echo(f"   💰 Ожидаемая прибыль ДО вычета стоимости: {max_emv_research:.2f} тыс. руб.")
+    echo(f"   💸 Стоимость исследования: -{research_cost:.2f} тыс. руб.")
+    
+    net_emv_research = max_emv_research - research_cost
+    echo(f"   💵 Чистая ожидаемая прибыль: {net_emv_research:.2f} тыс. руб.")
+
+    # --- 4.1. Байесовский (предапостериорный) анализ ---
+    echo("\n" + "─" * 80)
+    echo(f"🧮 ШАГ 4: Байесовский анализ (исследование верно называет спрос с вероятностью {study_accuracy})")
+    echo("─" * 80)
+    with span('preposterior'):
+        study = preposterior_analysis(payoff, prob_original, noisy_study(study_accuracy, len(demand_levels)))
+    for s, demand in enumerate(demand_levels):
+        posterior = ", ".join(f"{p:.3f}" for p in study['posterior'][s])
+        echo(f"   Сигнал «спрос {demand}» (P={study['signal_prob'][s]:.3f}): апостериорные P = [{posterior}] "
+              f"→ закупать {actions[study['action'][s]]}, EMV {study['signal_emv'][s]:.2f}")
+    echo(f"\n   EVPI (ценность совершенной информации): {study['evpi']:.2f} тыс. руб.")
+    echo(f"   EVSI (ценность исследования): {study['evsi']:.2f} тыс. руб.")
+    echo(f"   💡 Исследование оправдано, если стоит не больше {study['evsi']:.2f} тыс. руб. "
+          f"(стоимость {research_cost:.2f} — {'оправдана' if study['evsi'] > research_cost else 'не оправдана'})")
+
+    # --- 4.2. Дерево решений ---
+    echo("\n" + "─" * 80)
+    echo("🌳 ШАГ 5: Дерево решений (свертка справа налево)")
+    echo("─" * 80)
+    with span('tree'):
+        tree = DecisionTree()
+        root = tree.decision("Исследование", [
+            ("не проводить", tree.stock_decision(actions, demand_levels, prob_original, profit_per_box, cost_of_unsold)),
+            ("проводить", tree.stock_decision(actions, demand_levels, prob_research, profit_per_box, cost_of_unsold),
+             research_cost),
+        ])
+        tree_result = rollback(root)
+    count('tree_nodes_evaluated', tree_result['evaluated'])
+    count('tree_nodes_reused', tree_result['reused'])
+    echo("\n".join(format_strategy(tree_result['strategy'])))
+    echo(f"   Вычислено узлов: {tree_result['evaluated']}, повторно использовано: {tree_result['reused']}")
+
+    # --- 5. Итоговое сравнение ---
+    echo("\n" + "=" * 80)
+    echo("🎯 ИТОГОВОЕ РЕШЕНИЕ")
+    echo("=" * 80)
+    
+    if tree_result['strategy']['choice'] == "проводить":
+        advantage = net_emv_research - max_emv_original
+        echo(f"\n✅ РЕКОМЕНДАЦИЯ: Проводить исследование")
+        echo(f"   • Чистая выгода от исследования: +{advantage:.2f} тыс. руб.")
+        echo(f"   • Оптимальная закупка: {optimal_research} ящиков в неделю")
+        echo(f"   • Ожидаемая прибыль: {net_emv_research:.2f} тыс. руб./неделю")
+        final_decision = "Проводить"
+        final_action = optimal_research
+        final_profit = net_emv_research
+    else:
+        loss = max_emv_original - net_emv_research
+        echo(f"\n❌ РЕКОМЕНДАЦИЯ: НЕ проводить исследование")
+        echo(f"   • Исследование снизит прибыль на: -{loss:.2f} тыс. руб.")
+        echo(f"   • Оптимальная закупка: {optimal_original} ящиков в неделю")
+        echo(f"   • Ожидаемая прибыль: {max_emv_original:.2f} тыс. руб./неделю")
+        final_decision = "НЕ проводить"
+        final_action = optimal_original
+        final_profit = max_emv_original
+    
+    echo("\n" + "=" * 80)
+
+    # --- 6. Визуализация ---
+    if plot:
+        with span('plot', format=fmt):
+            report = research_report("«Фото КОЛОР»", actions, demand_levels, prob_original, prob_research,
+                                     profit_per_box, cost_of_unsold, research_cost)
+            visualize_research_decision(report, output or f'decision_analysis_with_research.{fmt}',
+                                        dpi=dpi, fmt=fmt)
+
+    result = ResearchResult(
+        conduct_research=final_decision == "Проводить",
+        optimal_action=final_action,
+        expected_profit=final_profit,
+        evsi=study['evsi'],
+        evpi=study['evpi'],
+        research_cost=research_cost,
+        optimal_original=optimal_original,
+        optimal_research=optimal_research,
+        actions=actions,
+        demand_levels=demand_levels,
+        payoff=payoff,
+        prob_original=prob_original,
+        prob_research=prob_research,
+        emv_original=criteria_original['emv'],
+        emv_research=criteria_research['emv'],
+        signal_prob=study['signal_prob'],
+        posterior=study['posterior'],
+        signal_action=np.asarray(actions)[study['action']],
+    )
+    if cache is not None:
+        cache.put(key, result.fields())
+    return result
+
+def visualize_research_decision(report, path, dpi=300, fmt='png'):
+    """
+    Создает комплексную визуализацию решения о проведении исследования:
+    отчет research_report рисуется шаблоном ResearchFigure (task3/reports.py,
+    бэкенд Agg, дисплей не нужен). Если входные данные, dpi и формат не
+    изменились с прошлого построения, файл не перерисовывается
+    (.render_cache.json рядом с файлом).
+    """
+    if render_file(report, path, dpi=dpi, fmt=fmt):
+        echo(f"\n📊 Визуализация сохранена в файл '{path}'")
+    else:
+        echo(f"\n📊 Визуализация не изменилась: '{path}'")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Решение о проведении дополнительного исследования рынка")
+    parser.add_argument('--no-plot', action='store_true', help="не строить график (без matplotlib)")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--format', choices=FORMATS, default='png')
+    parser.add_argument('--output', help="файл графика (по умолчанию decision_analysis_with_research.<формат>)")
+    parser.add_argument('--cache', help="каталог кэша результатов (.npz)")
+    parser.add_argument('--cache-size', type=float, default=256, help="предельный размер кэша на диске, МБ")
+    parser.add_argument('--result', help="сохранить объект результата в .npz или .arrow")
+    parser.add_argument('--log', help="дописать результат в журнал результатов (ResultLog)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    cache = ResultCache(args.cache, max_bytes=args.cache_size * 2**20) if args.cache else None
+
+    with session_from_args(args, name='task4'):
+        result = solve_decision_with_research(plot=not args.no_plot, dpi=args.dpi, fmt=args.format, cache=cache,
+                                              output=args.output)
+        with span('save'):
+            if args.result:
+                save_result(args.result, result)
+            if args.log:
+                ResultLog(args.log).append(result)
+        if cache is not None:
+            for name, value in cache.stats().items():
+                count(f"cache_{name}", value)
+            echo(cache.summary())
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Сравнение отчетов бенчмарка: база без времени (память и показатели степени),
+время — только против отчета той же машины.
+
+    python -m pytest system_analysis
+"""
+from system_analysis.benchmark import baseline_of, compare, compare_times, exponent_changes
+
+def report(scale=1.0, exponent=1.0, peak=2**20, quick=True):
+    """Синтетический отчет: одна фаза, time = scale * (size / 1000)^exponent."""
+    return {
+        'python': '3.11', 'numpy': '2.0', 'machine': 'x86_64', 'quick': quick,
+        'results': [{'task': 'task1', 'phase': 'seidel', 'size': size, 'time': scale * (size / 1000) ** exponent,
+                     'peak_bytes': peak, 'rss_mb': None} for size in (1_000, 10_000, 100_000)],
+    }
+
+def test_baseline_has_no_times():
+    baseline = baseline_of(report(quick=False))
+    baseline = baseline_of(report(), baseline)
+    assert 'results' not in baseline
+    assert baseline['peak_bytes'] == {f'task1/seidel@{size}': 2**20 for size in (1_000, 10_000, 100_000)}
+    assert baseline['exponents']['quick']['task1/seidel'] == baseline['exponents']['full']['task1/seidel'] == 1.0
+
+def test_slower_machine_passes():
+    baseline = baseline_of(report())
+    assert compare(report(scale=5.0), baseline) == []
+    assert exponent_changes(report(scale=5.0), baseline) == []
+
+def test_memory_and_exponent_regressions():
+    baseline = baseline_of(report())
+    assert len(compare(report(peak=2**22), baseline)) == 3
+    assert exponent_changes(report(exponent=2.0), baseline) == ['task1/seidel: показатель степени 1.00 → 2.00']
+
+def test_times_against_local_report():
+    assert len(compare_times(report(scale=2.0), report())) == 3
+    assert compare_times(report(scale=1.1), report()) == []
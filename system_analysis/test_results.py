@@ -0,0 +1,89 @@
+"""
+Вывод объектов результатов: Arrow IPC для нескольких результатов разных
+решателей и журнал ResultLog.
+
+    python -m pytest system_analysis
+"""
+import numpy as np
+import pytest
+
+from system_analysis import load
+from system_analysis.instrument import session
+from system_analysis.results import ResultLog, TransportResult, write_arrow
+
+def transport_results():
+    """Задача из условия task2, решенная всеми решателями (HiGHS, потенциалы, Синкхорн в float32)."""
+    main = load('task2', 'main')
+    with session(quiet=True):
+        return [main.solve_transportation_problem(solver='highs'),
+                main.solve_transportation_problem(solver='potentials'),
+                main.solve_transportation_problem(solver='sinkhorn', float32=True)]
+
+def test_write_arrow_mixed_solvers(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    results = transport_results()
+    path = tmp_path / 'results.arrow'
+    write_arrow(path, results)
+    table = pa.ipc.open_file(str(path)).read_all()
+    assert table.num_rows == len(results)
+    assert table['solver'].to_pylist() == ['highs', 'potentials', 'sinkhorn']
+    assert table['iterations'].to_pylist()[0] is None
+    for row, result in enumerate(results):
+        assert table['fun'][row].as_py() == pytest.approx(result.fun)
+        np.testing.assert_allclose(table['values'][row].values.to_numpy(), result.values)
+        np.testing.assert_array_equal(table['rows'][row].values.to_numpy(), result.rows)
+
+def test_write_arrow_failed_result(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    failed = TransportResult(success=False, message="нет решения", solver='highs')
+    path = tmp_path / 'results.arrow'
+    write_arrow(path, [transport_results()[1], failed])
+    table = pa.ipc.open_file(str(path)).read_all()
+    assert table['success'].to_pylist() == [True, False]
+    assert table['rows'][1].as_py() is None
+
+def test_log_roundtrip(tmp_path):
+    results = transport_results()
+    log = ResultLog(tmp_path / 'runs.salog')
+    log.extend(results)
+    log.append(results[0])
+    assert len(log) == 4
+    assert [r.solver for r in log] == ['highs', 'potentials', 'sinkhorn', 'highs']
+    np.testing.assert_array_equal(log[2].values, results[2].values)
+    np.testing.assert_allclose(log.columns('fun')['fun'], [r.fun for r in results + results[:1]])
+
+def _append_to_fresh_logs(directory, barrier, rounds):
+    result = TransportResult(success=True, message="ok", fun=1.0, solver='potentials',
+                             rows=np.arange(5), cols=np.arange(5), values=np.ones(5))
+    for k in range(rounds):
+        # Все процессы одновременно дописывают в еще не созданный журнал
+        barrier.wait()
+        ResultLog(directory / f"runs{k}.salog").append(result)
+
+def test_log_concurrent_first_writers(tmp_path):
+    import multiprocessing
+
+    processes, rounds = 8, 30
+    barrier = multiprocessing.Barrier(processes)
+    workers = [multiprocessing.Process(target=_append_to_fresh_logs, args=(tmp_path, barrier, rounds))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+    for k in range(rounds):
+        log = ResultLog(tmp_path / f"runs{k}.salog")
+        assert len(log) == processes
+        assert all(record.values.sum() == 5 for record in log)
+    assert len(list(tmp_path.iterdir())) == rounds  # временные файлы удалены
+
+def test_log_create_race(tmp_path):
+    # Оба процесса увидели, что журнала нет, и оба создают его: заголовок один
+    path = tmp_path / 'runs.salog'
+    first, second = ResultLog(path), ResultLog(path)
+    first._create()
+    first.append(TransportResult(success=True, fun=1.0, values=np.ones(3)))
+    second._create()
+    second.append(TransportResult(success=True, fun=2.0, values=np.ones(3)))
+    np.testing.assert_array_equal(ResultLog(path).columns('fun')['fun'], [1.0, 2.0])